@@ -0,0 +1,128 @@
+"""JSON 직렬화 경로 벤치마크.
+
+2000일 백테스트 응답 렌더링과 고빈도 티커 스트림 파싱을 기존 경로(pydantic 행 검증 +
+표준 json)와 현재 경로(계산 결과 직접 렌더링 + orjson)로 비교한다.
+
+    cd backend && python -m benchmarks.bench_json
+"""
+
+import json
+import time
+from typing import Callable
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+DAYS = 2000
+TICKS = 100_000
+
+
+def _tick_message(seq: int) -> bytes:
+    payload = {
+        "type": "ticker",
+        "code": "KRW-BTC",
+        "opening_price": 50_000_000.0,
+        "high_price": 51_000_000.0,
+        "low_price": 49_000_000.0,
+        "trade_price": 50_000_000.0 + seq,
+        "prev_closing_price": 49_500_000.0,
+        "change": "RISE",
+        "change_price": 500_000.0,
+        "signed_change_price": 500_000.0,
+        "change_rate": 0.0101,
+        "signed_change_rate": 0.0101,
+        "trade_volume": 0.0123,
+        "acc_trade_volume": 1234.5678,
+        "acc_trade_volume_24h": 2345.6789,
+        "acc_trade_price": 61_728_390_000.0,
+        "acc_trade_price_24h": 117_283_945_000.0,
+        "trade_date": "20240101",
+        "trade_time": "090000",
+        "trade_timestamp": 1704067200000 + seq,
+        "ask_bid": "BID",
+        "acc_ask_volume": 600.1,
+        "acc_bid_volume": 634.4,
+        "highest_52_week_price": 60_000_000.0,
+        "highest_52_week_date": "2023-12-01",
+        "lowest_52_week_price": 30_000_000.0,
+        "lowest_52_week_date": "2023-01-01",
+        "market_state": "ACTIVE",
+        "is_trading_suspended": False,
+        "market_warning": "NONE",
+        "timestamp": 1704067200000 + seq,
+        "stream_type": "REALTIME",
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_backtest_response() -> None:
+    data = synthetic_ohlcv(DAYS + 5)
+    outcome = main.evaluate_backtest(data, 0.5, 0.0005, 0.0, True)
+    results, trades = outcome.results, outcome.trades
+    trade_summary, metrics = outcome.trade_summary, outcome.metrics
+
+    def legacy() -> bytes:
+        content = {
+            "results": [main.BacktestResult(**row) for row in results],
+            "trades": trades,
+            "tradeSummary": trade_summary,
+            "metrics": metrics,
+            "ticker": None,
+        }
+        encoded = main.BacktestResponse.model_validate(content).model_dump(mode="json")
+        return json.dumps(encoded, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def current() -> bytes:
+        return main.FastJSONResponse(
+            {
+                "results": results,
+                "trades": [trade.model_dump() for trade in trades],
+                "tradeSummary": trade_summary.model_dump(),
+                "metrics": metrics.model_dump(),
+                "ticker": None,
+                "confidence": None,
+            }
+        ).body
+
+    assert json.loads(legacy()) == json.loads(current())
+    legacy_s = _time(legacy, 10)
+    current_s = _time(current, 10)
+    print(
+        f"backtest response ({DAYS} days): legacy {legacy_s * 1000:.2f} ms, "
+        f"current {current_s * 1000:.2f} ms, speedup x{legacy_s / current_s:.1f}"
+    )
+
+
+def bench_tick_ingest() -> None:
+    messages = [_tick_message(seq) for seq in range(TICKS)]
+
+    def legacy() -> None:
+        for message in messages:
+            main._extract_ws_ticker(json.loads(message.decode("utf-8")))
+
+    def current() -> None:
+        for message in messages:
+            main._extract_ws_ticker(main._json_loads(message))
+
+    legacy_s = _time(legacy, 3)
+    current_s = _time(current, 3)
+    print(
+        f"tick ingest ({TICKS} msgs): legacy {TICKS / legacy_s:,.0f} msg/s, "
+        f"current {TICKS / current_s:,.0f} msg/s, speedup x{legacy_s / current_s:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    if main.orjson is None:
+        print("orjson이 설치되지 않아 표준 json 경로로 측정합니다.")
+    bench_backtest_response()
+    bench_tick_ingest()
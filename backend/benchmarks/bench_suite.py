@@ -0,0 +1,221 @@
+"""백엔드 핵심 경로 벤치마크 스위트.
+
+합성 일봉(추세/횡보/갭)으로 백테스트 단계별 함수와 응답 직렬화, 분봉 스트리밍 누적기를, 가짜
+소켓으로 티커 팬아웃을 측정한다. 네트워크를 쓰지 않으며, 결과는 케이스별 최소 시간(초)으로 baselines.json에 저장한다.
+
+    cd backend && python -m benchmarks.bench_suite              # 기준선과 비교
+    cd backend && python -m benchmarks.bench_suite --save       # 기준선 갱신
+    cd backend && python -m benchmarks.bench_suite --output out.json
+
+기준선보다 tolerance배 이상 느려진 케이스가 있으면 종료 코드 1을 돌려준다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+import main
+from benchmarks.synthetic import REGIMES, synthetic_ohlcv
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DAY_COUNTS = (365, 2000)
+FANOUT_SOCKETS = (10, 100, 1000)
+FANOUT_MESSAGES = min(50, main.WS_SEND_QUEUE_SIZE)
+# 60분봉 약 1년치를 INTRADAY_CHUNK_ROWS 단위로 흘려보낸다.
+INTRADAY_ROWS = 24 * 365
+
+
+def _best_of(func: Callable[[], object], samples: int = 5) -> float:
+    """timeit처럼 한 샘플이 20ms를 넘도록 반복 횟수를 맞춘 뒤, 샘플별 1회 평균의 최솟값을 쓴다."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, number // 10)
+    return min(timer.repeat(repeat=samples, number=number)) / number
+
+
+def bench_backtest(days: int, regime: str) -> Dict[str, float]:
+    data = synthetic_ohlcv(days + 5, regime)
+    results = main.run_backtest(data, 0.5, 0.0005, 0.0, True)
+    trades = main.build_trades(results)
+    outcome = main.evaluate_backtest(data, 0.5, 0.0005, 0.0, True)
+    content = {
+        "results": outcome.results,
+        "trades": [trade.model_dump() for trade in outcome.trades],
+        "tradeSummary": outcome.trade_summary.model_dump(),
+        "metrics": outcome.metrics.model_dump(),
+        "ticker": None,
+        "confidence": None,
+    }
+    model = main.BacktestResponse.model_validate(content)
+    prefix = f"backtest.{regime}.{days}d"
+    return {
+        f"{prefix}.run_backtest": _best_of(lambda: main.run_backtest(data, 0.5, 0.0005, 0.0, True)),
+        f"{prefix}.build_trades": _best_of(lambda: main.build_trades(results)),
+        f"{prefix}.build_trade_summary": _best_of(lambda: main.build_trade_summary(trades)),
+        f"{prefix}.build_metrics": _best_of(lambda: main.build_metrics(results, trades)),
+        f"{prefix}.evaluate_backtest": _best_of(
+            lambda: main.evaluate_backtest(data, 0.5, 0.0005, 0.0, True)
+        ),
+        # 엔드포인트가 쓰는 직접 렌더링 경로와 응답 모델 전체 직렬화 경로를 함께 잰다.
+        f"{prefix}.render_response": _best_of(lambda: main.FastJSONResponse(content).body),
+        f"{prefix}.model_dump_json": _best_of(model.model_dump_json),
+    }
+
+
+def bench_intraday(regime: str) -> Dict[str, float]:
+    rows = synthetic_ohlcv(INTRADAY_ROWS, regime)
+    matrix = main.np.array(
+        [
+            (3600 * index, row["open"], row["high"], row["low"], row["close"], row["volume"])
+            for index, row in enumerate(rows)
+        ]
+    )
+    chunk_rows = main.INTRADAY_CHUNK_ROWS
+
+    def run() -> None:
+        accumulator = main.IntradayAccumulator(
+            0.5, 0.0005, 0.0, True, 0, 3600 * INTRADAY_ROWS, 500
+        )
+        for start in range(0, len(matrix), chunk_rows):
+            accumulator.feed(matrix[start : start + chunk_rows])
+
+    return {f"intraday.{regime}.{INTRADAY_ROWS}rows.accumulate": _best_of(run)}
+
+
+class FakeWebSocket:
+    def __init__(self, expected: int, done: asyncio.Event, remaining: List[int]) -> None:
+        self.received = 0
+        self._expected = expected
+        self._done = done
+        self._remaining = remaining
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_text(self, message: str) -> None:
+        self.received += 1
+        if self.received == self._expected:
+            self._remaining[0] -= 1
+            if self._remaining[0] == 0:
+                self._done.set()
+
+    async def close(self, code: int = 1000) -> None:
+        return None
+
+
+async def _fanout_once(sockets: int, messages: int) -> float:
+    broadcaster = main.TickerBroadcaster()
+    done = asyncio.Event()
+    remaining = [sockets]
+    clients = [FakeWebSocket(messages, done, remaining) for _ in range(sockets)]
+    for index, client in enumerate(clients):
+        # 절반은 심볼 구독, 절반은 전체 구독으로 두 인덱스를 모두 거치게 한다.
+        await broadcaster.connect(client, {"KRW-BTC"} if index % 2 else set())
+    payloads = [
+        {"type": "ticker", "symbol": "KRW-BTC", "price": 50_000_000.0 + seq, "changeRate": 0.01}
+        for seq in range(messages)
+    ]
+    start = time.perf_counter()
+    for payload in payloads:
+        await broadcaster.broadcast(payload)
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await broadcaster.disconnect(client)
+    await asyncio.sleep(0)
+    return elapsed
+
+
+def bench_fanout(sockets: int) -> Dict[str, float]:
+    best = min(asyncio.run(_fanout_once(sockets, FANOUT_MESSAGES)) for _ in range(10))
+    return {f"broadcast.fanout.{sockets}sockets.{FANOUT_MESSAGES}msgs": best}
+
+
+def run_suite() -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for regime in REGIMES:
+        for days in DAY_COUNTS:
+            results.update(bench_backtest(days, regime))
+        results.update(bench_intraday(regime))
+    for sockets in FANOUT_SOCKETS:
+        results.update(bench_fanout(sockets))
+    return results
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": main.np.__version__,
+        "orjson": main.orjson is not None,
+    }
+
+
+def _load_baseline(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _write(path: str, results: Dict[str, float]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"environment": _environment(), "results": results}, handle, indent=2)
+        handle.write("\n")
+
+
+def compare(results: Dict[str, float], baseline: dict, tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    previous = baseline.get("results", {})
+    for name, seconds in results.items():
+        before = previous.get(name)
+        if before is None:
+            print(f"{name:60s} {seconds * 1000:10.3f} ms  (new)")
+            continue
+        ratio = seconds / before if before > 0 else float("inf")
+        flag = "REGRESSION" if ratio > tolerance else ""
+        print(f"{name:60s} {seconds * 1000:10.3f} ms  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QuantDash backend benchmark suite")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", help="also write results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    results = run_suite()
+    if args.output:
+        _write(args.output, results)
+    if args.save:
+        _write(args.baseline, results)
+        print(f"baseline saved: {args.baseline} ({len(results)} cases)")
+        return 0
+    baseline = _load_baseline(args.baseline)
+    if baseline is None:
+        for name, seconds in results.items():
+            print(f"{name:60s} {seconds * 1000:10.3f} ms")
+        print("기준선이 없습니다. --save로 저장하세요.")
+        return 0
+    if baseline.get("environment") != _environment():
+        print("주의: 기준선과 측정 환경이 다릅니다.", baseline.get("environment"))
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)}개 케이스가 기준선보다 x{args.tolerance} 이상 느립니다.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
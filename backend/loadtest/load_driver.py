@@ -0,0 +1,204 @@
+"""/api/backtest와 /ws/ticker 부하 드라이버.
+
+    # 동시 요청 32개로 30초 동안 백테스트 호출
+    cd backend && python -m loadtest.load_driver backtest --url http://127.0.0.1:8000 \\
+        --concurrency 32 --duration 30 --symbols KRW-BTC,KRW-ETH --days 365
+
+    # WebSocket 구독자 200개를 30초 동안 유지하며 수신량과 전달 지연 측정
+    python -m loadtest.load_driver ws --url ws://127.0.0.1:8000/ws/ticker --clients 200
+
+한 IP에서 보내므로 백엔드는 RATE_LIMIT_PER_MIN을 충분히 크게 두고 띄워야 한다.
+--json을 주면 결과를 기계가 읽을 수 있는 JSON 한 줄로 출력한다.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import json
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # nearest-rank 방식
+    rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": percentile(latencies_ms, 50),
+        "p90_ms": percentile(latencies_ms, 90),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": max(latencies_ms, default=0.0),
+    }
+
+
+async def run_backtest_load(
+    url: str,
+    concurrency: int,
+    duration: float,
+    symbols: List[str],
+    days: int,
+    seed: int,
+    client: Optional[httpx.AsyncClient] = None,
+) -> dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    owns_client = client is None
+    if client is None:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        client = httpx.AsyncClient(timeout=60, limits=limits)
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            payload = {
+                "symbol": rng.choice(symbols),
+                "k": round(rng.uniform(0.3, 0.7), 2),
+                "fee": 0.0005,
+                "days": days,
+                "useMaFilter": rng.random() < 0.5,
+            }
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/api/backtest", json=payload)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    finally:
+        if owns_client:
+            await client.aclose()
+    elapsed = time.perf_counter() - started
+    total = sum(statuses.values())
+    return {
+        "mode": "backtest",
+        "requests": total,
+        "ok": statuses.get("200", 0),
+        "statuses": dict(statuses),
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        **_latency_summary(latencies),
+    }
+
+
+async def run_ws_load(url: str, clients: int, duration: float) -> dict:
+    import websockets
+
+    received = [0] * clients
+    lags: List[float] = []
+    failures: Counter = Counter()
+
+    def observe(update: dict, index: int) -> None:
+        received[index] += 1
+        # 대역 서버는 송신 시각을 timestamp(ms)에 넣으므로 같은 호스트라면 전달 지연이 된다.
+        timestamp = update.get("timestamp")
+        if update.get("type") is None and timestamp:
+            lags.append(time.time() * 1000 - timestamp)
+
+    async def client(index: int) -> None:
+        try:
+            async with websockets.connect(url, max_queue=None) as websocket:
+                while True:
+                    message = json.loads(await websocket.recv())
+                    if message.get("type") == "batch":
+                        for update in message.get("updates", []):
+                            observe(update, index)
+                    else:
+                        observe(message, index)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            failures[type(exc).__name__] += 1
+
+    tasks = [asyncio.create_task(client(index)) for index in range(clients)]
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    total = sum(received)
+    return {
+        "mode": "ws",
+        "clients": clients,
+        "messages": total,
+        "failures": dict(failures),
+        "elapsed_s": elapsed,
+        "throughput_msgs": total / elapsed if elapsed else 0.0,
+        "per_client_msgs": total / elapsed / clients if elapsed and clients else 0.0,
+        **_latency_summary(lags),
+    }
+
+
+def _print_report(report: dict) -> None:
+    if report["mode"] == "backtest":
+        print(
+            f"requests {report['requests']} ok {report['ok']} statuses {report['statuses']} "
+            f"in {report['elapsed_s']:.1f}s -> {report['throughput_rps']:.1f} req/s"
+        )
+        label = "latency"
+    else:
+        print(
+            f"clients {report['clients']} messages {report['messages']} "
+            f"failures {report['failures']} -> {report['throughput_msgs']:.1f} msg/s "
+            f"({report['per_client_msgs']:.1f} per client)"
+        )
+        label = "delivery lag"
+    print(
+        f"{label} p50 {report['p50_ms']:.1f} ms, p90 {report['p90_ms']:.1f} ms, "
+        f"p99 {report['p99_ms']:.1f} ms, max {report['max_ms']:.1f} ms"
+    )
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="QuantDash load driver")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backtest = commands.add_parser("backtest", help="POST /api/backtest in a closed loop")
+    backtest.add_argument("--url", default="http://127.0.0.1:8000")
+    backtest.add_argument("--concurrency", type=int, default=16)
+    backtest.add_argument("--duration", type=float, default=30.0)
+    backtest.add_argument("--symbols", default="KRW-BTC,KRW-ETH,KRW-SOL")
+    backtest.add_argument("--days", type=int, default=365)
+    backtest.add_argument("--seed", type=int, default=7)
+    backtest.add_argument("--json", action="store_true")
+
+    ws = commands.add_parser("ws", help="hold /ws/ticker subscribers open")
+    ws.add_argument("--url", default="ws://127.0.0.1:8000/ws/ticker")
+    ws.add_argument("--clients", type=int, default=100)
+    ws.add_argument("--duration", type=float, default=30.0)
+    ws.add_argument("--json", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "backtest":
+        symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+        report = asyncio.run(
+            run_backtest_load(
+                args.url.rstrip("/"), args.concurrency, args.duration, symbols, args.days, args.seed
+            )
+        )
+    else:
+        report = asyncio.run(run_ws_load(args.url, args.clients, args.duration))
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    cli()
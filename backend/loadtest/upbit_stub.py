@@ -0,0 +1,488 @@
+"""부하 테스트용 Upbit REST/WebSocket 로컬 대역 서버.
+
+/v1/candles/days, /v1/candles/minutes/{unit}, /v1/ticker와 /websocket/v1 티커 스트림을
+흉내 낸다. 일봉은 시장별 시드로 만든 합성 데이터이고 분봉은 그 일봉을 잘게 나눈 값이며, 실시간 티커는 합성 랜덤워크나 녹화해 둔 스트림을 N배속으로 재생한다.
+응답 지연, 429, 5xx를 확률로 주입해 백엔드의 재시도/서킷/속도 조절 경로를 시험할 수 있다.
+
+    cd backend && python -m loadtest.upbit_stub serve --port 9000 --latency-ms 30 --rate-5xx 0.01
+    UPBIT_BASE_URL=http://127.0.0.1:9000/v1 UPBIT_WS_URL=ws://127.0.0.1:9000/websocket/v1 \\
+        uvicorn main:app --port 8000
+
+    # 실제 Upbit 티커 스트림을 녹화했다가 10배속으로 재생
+    python -m loadtest.upbit_stub record --markets KRW-BTC,KRW-ETH --seconds 600 --out ticks.ndjson
+    python -m loadtest.upbit_stub serve --replay ticks.ndjson --speed 10
+
+녹화 파일은 한 줄에 {"t": 수신 시각(초), "payload": 원본 메시지} 하나인 NDJSON이다.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import json
+import random
+import time
+from typing import Dict, List, Optional, Set
+import zlib
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from benchmarks.synthetic import synthetic_ohlcv
+
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+HISTORY_START = date(2017, 10, 1)
+FEED_QUEUE_SIZE = 1000
+MINUTE_UNITS = (1, 3, 5, 10, 15, 30, 60, 240)
+KST = timezone(timedelta(hours=9))
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    # 초당 허용 요청 수. 넘으면 실제 Upbit처럼 429를 돌려준다. 0이면 제한하지 않는다.
+    requests_per_sec: int = 10
+    tick_hz: float = 5.0
+    replay_path: Optional[str] = None
+    speed: float = 1.0
+    seed: int = 7
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    injected_429: int = 0
+    throttled_429: int = 0
+    injected_5xx: int = 0
+    ws_clients: int = 0
+    ticks_sent: int = 0
+
+
+@dataclass
+class LiveMarket:
+    opening_price: float
+    high_price: float
+    low_price: float
+    trade_price: float
+    prev_closing_price: float
+    volume: float = 0.0
+
+
+def _trading_day() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _parse_to(to: str) -> datetime:
+    """Upbit의 to 파라미터를 UTC naive datetime으로 바꾼다. 시간대가 없으면 UTC로 본다."""
+    cutoff = datetime.fromisoformat(to.replace("Z", "+00:00").replace(" ", "T"))
+    if cutoff.tzinfo is not None:
+        cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None)
+    return cutoff
+
+
+def _market_scale(market: str) -> float:
+    # 시장마다 가격대가 다르도록 합성 가격을 10의 거듭제곱으로 줄인다.
+    return 1 / 10 ** (zlib.crc32(market.encode()) % 5)
+
+
+def _to_upbit_candle(market: str, row: dict, prev_close: float, scale: float) -> dict:
+    day = row["timestamp"][:10]
+    close = row["close"] * scale
+    return {
+        "market": market,
+        "candle_date_time_utc": f"{day}T00:00:00",
+        "candle_date_time_kst": f"{day}T09:00:00",
+        "opening_price": row["open"] * scale,
+        "high_price": row["high"] * scale,
+        "low_price": row["low"] * scale,
+        "trade_price": close,
+        "timestamp": int(datetime.fromisoformat(f"{day}T00:00:00+00:00").timestamp() * 1000),
+        "candle_acc_trade_price": close * row["volume"],
+        "candle_acc_trade_volume": row["volume"],
+        "prev_closing_price": prev_close,
+        "change_price": close - prev_close,
+        "change_rate": (close - prev_close) / prev_close if prev_close else 0.0,
+    }
+
+
+class UpbitStub:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.stats = StubStats()
+        self._rng = random.Random(config.seed)
+        self._history: Dict[str, List[dict]] = {}
+        self._history_day: Optional[date] = None
+        self._live: Dict[str, LiveMarket] = {}
+        self._window_second = 0
+        self._window_count = 0
+        self._subscribers: Dict[asyncio.Queue, Set[str]] = {}
+        self._feed_task: Optional[asyncio.Task] = None
+
+    def history(self, market: str) -> List[dict]:
+        """HISTORY_START부터 오늘(UTC 거래일)까지의 일봉. 오늘 일봉은 진행 중인 값이다."""
+        today = _trading_day()
+        if self._history_day != today:
+            self._history.clear()
+            self._live.clear()
+            self._history_day = today
+        candles = self._history.get(market)
+        if candles is None:
+            days = (today - HISTORY_START).days + 1
+            seed = zlib.crc32(market.encode()) ^ self.config.seed
+            rows = synthetic_ohlcv(days, "ranging", seed=seed, start=HISTORY_START)
+            scale = _market_scale(market)
+            candles = []
+            prev_close = rows[0]["open"] * scale
+            for row in rows:
+                candles.append(_to_upbit_candle(market, row, prev_close, scale))
+                prev_close = candles[-1]["trade_price"]
+            self._history[market] = candles
+        return candles
+
+    def live(self, market: str) -> LiveMarket:
+        state = self._live.get(market)
+        if state is None:
+            today = self.history(market)[-1]
+            state = LiveMarket(
+                opening_price=today["opening_price"],
+                high_price=today["high_price"],
+                low_price=today["low_price"],
+                trade_price=today["trade_price"],
+                prev_closing_price=today["prev_closing_price"],
+                volume=today["candle_acc_trade_volume"],
+            )
+            self._live[market] = state
+        return state
+
+    def candles(self, market: str, count: int, to: Optional[str]) -> List[dict]:
+        candles = self.history(market)
+        end = len(candles)
+        if to:
+            cutoff = _parse_to(to)
+            # to는 미포함 경계라서 candle_date_time_utc < to 인 일봉만 돌려준다.
+            end = (cutoff.date() - HISTORY_START).days
+            if cutoff.time() != datetime.min.time():
+                end += 1
+            end = max(0, min(end, len(candles)))
+        page = candles[max(0, end - count) : end]
+        if end == len(candles) and page:
+            page[-1] = self._with_live(market, page[-1])
+        return page[::-1]
+
+    def minute_candles(self, market: str, unit: int, count: int, to: Optional[str]) -> List[dict]:
+        """그날 일봉의 시가→종가 경로에 시각별 시드 잡음을 얹은 분봉. 최신 봉부터 돌려준다."""
+        step = unit * 60
+        if to:
+            end = int(_parse_to(to).replace(tzinfo=timezone.utc).timestamp())
+        else:
+            end = int(time.time()) + 1
+        first = int(datetime.combine(HISTORY_START, datetime.min.time(), timezone.utc).timestamp())
+        history = self.history(market)
+        page = []
+        start = (end - 1) // step * step
+        while len(page) < count and start >= first:
+            page.append(self._minute_candle(market, unit, start, history[(start - first) // 86400]))
+            start -= step
+        return page
+
+    def _minute_candle(self, market: str, unit: int, start: int, day: dict) -> dict:
+        rng = random.Random(f"{market}:{unit}:{start}:{self.config.seed}")
+        progress = (start % 86400) / 86400
+        base = day["opening_price"] + (day["trade_price"] - day["opening_price"]) * progress
+        open_ = base * (1 + rng.gauss(0, 0.002))
+        close = base * (1 + rng.gauss(0, 0.002))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, 0.001)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, 0.001)))
+        moment = datetime.fromtimestamp(start, timezone.utc)
+        volume = rng.uniform(0.1, 5.0) * unit
+        return {
+            "market": market,
+            "candle_date_time_utc": moment.strftime("%Y-%m-%dT%H:%M:%S"),
+            "candle_date_time_kst": moment.astimezone(KST).strftime("%Y-%m-%dT%H:%M:%S"),
+            "opening_price": open_,
+            "high_price": high,
+            "low_price": low,
+            "trade_price": close,
+            "timestamp": start * 1000,
+            "candle_acc_trade_price": close * volume,
+            "candle_acc_trade_volume": volume,
+            "unit": unit,
+        }
+
+    def _with_live(self, market: str, candle: dict) -> dict:
+        state = self.live(market)
+        merged = dict(candle)
+        merged.update(
+            opening_price=state.opening_price,
+            high_price=state.high_price,
+            low_price=state.low_price,
+            trade_price=state.trade_price,
+            candle_acc_trade_volume=state.volume,
+        )
+        return merged
+
+    def ticker(self, market: str) -> dict:
+        state = self.live(market)
+        now = datetime.now(timezone.utc)
+        change = state.trade_price - state.prev_closing_price
+        rate = change / state.prev_closing_price if state.prev_closing_price else 0.0
+        return {
+            "type": "ticker",
+            "market": market,
+            "code": market,
+            "trade_date": now.strftime("%Y%m%d"),
+            "trade_time": now.strftime("%H%M%S"),
+            "opening_price": state.opening_price,
+            "high_price": state.high_price,
+            "low_price": state.low_price,
+            "trade_price": state.trade_price,
+            "prev_closing_price": state.prev_closing_price,
+            "change": "RISE" if change > 0 else "FALL" if change < 0 else "EVEN",
+            "change_price": abs(change),
+            "change_rate": abs(rate),
+            "signed_change_price": change,
+            "signed_change_rate": rate,
+            "acc_trade_volume_24h": state.volume,
+            "timestamp": int(time.time() * 1000),
+            "stream_type": "REALTIME",
+        }
+
+    def step(self, market: str) -> dict:
+        state = self.live(market)
+        state.trade_price *= 1 + self._rng.gauss(0, 0.0005)
+        state.high_price = max(state.high_price, state.trade_price)
+        state.low_price = min(state.low_price, state.trade_price)
+        state.volume += self._rng.uniform(0, 0.5)
+        return self.ticker(market)
+
+    def fault(self) -> Optional[JSONResponse]:
+        """주입할 오류 응답. 정상 처리할 요청이면 None."""
+        config = self.config
+        self.stats.requests += 1
+        second = int(time.time())
+        if second != self._window_second:
+            self._window_second = second
+            self._window_count = 0
+        self._window_count += 1
+        if config.requests_per_sec and self._window_count > config.requests_per_sec:
+            self.stats.throttled_429 += 1
+            return self._too_many()
+        roll = self._rng.random()
+        if roll < config.rate_429:
+            self.stats.injected_429 += 1
+            return self._too_many()
+        if roll < config.rate_429 + config.rate_5xx:
+            self.stats.injected_5xx += 1
+            status = self._rng.choice((500, 502, 503))
+            return JSONResponse(
+                status_code=status,
+                content={"error": {"name": "server_error", "message": "injected"}},
+            )
+        return None
+
+    def remaining_req(self) -> str:
+        limit = self.config.requests_per_sec or 10
+        return f"group=default; min=1800; sec={max(0, limit - self._window_count)}"
+
+    @staticmethod
+    def _too_many() -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"name": "too_many_requests", "message": "Too many requests"}},
+            headers={"Remaining-Req": "group=default; min=0; sec=0"},
+        )
+
+    def subscribe(self, codes: Set[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=FEED_QUEUE_SIZE)
+        self._subscribers[queue] = codes
+        self.stats.ws_clients = len(self._subscribers)
+        if self._feed_task is None or self._feed_task.done():
+            self._feed_task = asyncio.create_task(self._run_feed())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.pop(queue, None)
+        self.stats.ws_clients = len(self._subscribers)
+        if not self._subscribers and self._feed_task:
+            self._feed_task.cancel()
+            self._feed_task = None
+
+    def _publish(self, payload: dict) -> None:
+        code = payload.get("code") or payload.get("market")
+        message = json.dumps(payload).encode("utf-8")
+        for queue, codes in self._subscribers.items():
+            if code not in codes:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+            self.stats.ticks_sent += 1
+
+    async def _run_feed(self) -> None:
+        if self.config.replay_path:
+            await self._replay()
+            return
+        interval = 1 / self.config.tick_hz
+        while True:
+            await asyncio.sleep(interval)
+            codes = set().union(*self._subscribers.values()) if self._subscribers else set()
+            for code in sorted(codes):
+                self._publish(self.step(code))
+
+    async def _replay(self) -> None:
+        with open(self.config.replay_path, "r", encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        if not records:
+            return
+        while True:
+            previous = records[0]["t"]
+            for record in records:
+                delay = (record["t"] - previous) / self.config.speed
+                previous = record["t"]
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # 수신 측에서 전달 지연을 잴 수 있도록 송신 시각으로 timestamp를 바꾼다.
+                payload = dict(record["payload"], timestamp=int(time.time() * 1000))
+                self._publish(payload)
+
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    stub = UpbitStub(config or StubConfig())
+    app = FastAPI(title="Upbit stub")
+    app.state.stub = stub
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith("/v1/"):
+            return await call_next(request)
+        config = stub.config
+        delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        failure = stub.fault()
+        if failure is not None:
+            return failure
+        response = await call_next(request)
+        response.headers["Remaining-Req"] = stub.remaining_req()
+        return response
+
+    @app.get("/v1/candles/days")
+    async def candles_days(market: str, count: int = 1, to: Optional[str] = None):
+        if not 1 <= count <= 200:
+            return JSONResponse(
+                status_code=400,
+                content={"error": {"name": "invalid_parameter", "message": "count"}},
+            )
+        return stub.candles(market, count, to)
+
+    @app.get("/v1/candles/minutes/{unit}")
+    async def candles_minutes(unit: int, market: str, count: int = 1, to: Optional[str] = None):
+        if unit not in MINUTE_UNITS or not 1 <= count <= 200:
+            return JSONResponse(
+                status_code=400,
+                content={"error": {"name": "invalid_parameter", "message": "unit or count"}},
+            )
+        return stub.minute_candles(market, unit, count, to)
+
+    @app.get("/v1/ticker")
+    async def ticker(markets: str):
+        return [stub.ticker(market.strip()) for market in markets.split(",") if market.strip()]
+
+    @app.get("/stats")
+    async def stats():
+        return stub.stats
+
+    @app.websocket("/websocket/v1")
+    async def websocket_ticker(websocket: WebSocket):
+        await websocket.accept()
+        message = await websocket.receive()
+        raw = message.get("text") or message.get("bytes") or b"[]"
+        codes: Set[str] = set()
+        for item in json.loads(raw):
+            if isinstance(item, dict) and item.get("type") == "ticker":
+                codes.update(item.get("codes", []))
+        queue = stub.subscribe(codes)
+        try:
+            for code in sorted(codes):
+                await websocket.send_bytes(json.dumps(stub.ticker(code)).encode("utf-8"))
+            while True:
+                await websocket.send_bytes(await queue.get())
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            stub.unsubscribe(queue)
+
+    return app
+
+
+async def record(url: str, markets: List[str], seconds: float, out: str) -> int:
+    import websockets
+
+    written = 0
+    deadline = time.time() + seconds
+    async with websockets.connect(url, ping_interval=20) as websocket:
+        await websocket.send(
+            json.dumps([{"ticket": "quantdash-record"}, {"type": "ticker", "codes": markets}])
+        )
+        with open(out, "w", encoding="utf-8") as handle:
+            while time.time() < deadline:
+                try:
+                    message = await asyncio.wait_for(websocket.recv(), deadline - time.time())
+                except asyncio.TimeoutError:
+                    break
+                handle.write(json.dumps({"t": time.time(), "payload": json.loads(message)}) + "\n")
+                written += 1
+    return written
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Upbit stand-in for load testing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the stand-in server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--rate-429", type=float, default=0.0, help="probability of a 429")
+    serve.add_argument("--rate-5xx", type=float, default=0.0, help="probability of a 5xx")
+    serve.add_argument("--requests-per-sec", type=int, default=10, help="0 disables throttling")
+    serve.add_argument("--tick-hz", type=float, default=5.0)
+    serve.add_argument("--replay", help="NDJSON tick recording to replay")
+    serve.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    serve.add_argument("--seed", type=int, default=7)
+
+    rec = commands.add_parser("record", help="record a live Upbit ticker stream")
+    rec.add_argument("--url", default=UPBIT_WS_URL)
+    rec.add_argument("--markets", default="KRW-BTC,KRW-ETH")
+    rec.add_argument("--seconds", type=float, default=60.0)
+    rec.add_argument("--out", required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        markets = [m.strip() for m in args.markets.split(",") if m.strip()]
+        written = asyncio.run(record(args.url, markets, args.seconds, args.out))
+        print(f"recorded {written} messages to {args.out}")
+        return
+
+    import uvicorn
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        requests_per_sec=args.requests_per_sec,
+        tick_hz=args.tick_hz,
+        replay_path=args.replay,
+        speed=args.speed,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,37 +1,150 @@
 import asyncio
+import base64
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import copy
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 import hashlib
 import json
 import logging
+import math
+import multiprocessing
+from multiprocessing import shared_memory
 import os
 import random
+import sqlite3
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import httpx
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from zoneinfo import ZoneInfo
 
-UPBIT_BASE_URL = "https://api.upbit.com/v1"
-UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 부하 테스트 때는 loadtest.upbit_stub 같은 로컬 대역 서버를 가리키도록 바꿀 수 있다.
+UPBIT_BASE_URL = os.getenv("UPBIT_BASE_URL", "https://api.upbit.com/v1").rstrip("/")
+UPBIT_WS_URL = os.getenv("UPBIT_WS_URL", "wss://api.upbit.com/websocket/v1")
 
 DEFAULT_MARKETS = ["KRW-BTC", "KRW-ETH", "KRW-SOL", "KRW-XRP", "KRW-DOGE"]
 
-CACHE_TTL_OHLCV = int(os.getenv("CACHE_TTL_OHLCV", "60"))
 CACHE_TTL_TICKER = int(os.getenv("CACHE_TTL_TICKER", "5"))
 CACHE_TTL_AI = int(os.getenv("CACHE_TTL_AI", "86400"))
-
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1000"))
+# startDate 백테스트의 누적 상태. 이틀 넘게 다시 오지 않은 파라미터 조합은 버린다.
+# 하루에 한 번 새 일봉만 이어 붙이는 사용 패턴에서 상태가 살아남도록 하루보다 넉넉히 둔다.
+BACKTEST_STATE_TTL = int(os.getenv("BACKTEST_STATE_TTL", str(2 * 86400)))
+BACKTEST_STATE_MAX_ENTRIES = int(os.getenv("BACKTEST_STATE_MAX_ENTRIES", "500"))
+BACKTEST_STATE_MAX_BYTES = int(os.getenv("BACKTEST_STATE_MAX_BYTES", str(64 * 1024 * 1024)))
+# fetch_ohlcv가 심볼별로 들고 있는 일봉 구간. 거래일이 바뀌면 다시 채우므로 이틀이면 충분하다.
+CANDLE_CACHE_TTL = int(os.getenv("CANDLE_CACHE_TTL", str(2 * 86400)))
+CANDLE_CACHE_MAX_ENTRIES = int(os.getenv("CANDLE_CACHE_MAX_ENTRIES", "500"))
+CANDLE_CACHE_MAX_BYTES = int(os.getenv("CANDLE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+# /api/backtest 직렬화 응답 캐시. 키에 마지막 일봉 날짜가 들어가므로 새 일봉이 생기면 자연히 바뀐다.
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+# /api/backtest/stream이 결과 행을 묶어 한 줄(레코드)로 보내는 단위
+BACKTEST_STREAM_CHUNK_ROWS = int(os.getenv("BACKTEST_STREAM_CHUNK_ROWS", "250"))
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "30"))
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "100"))
+# drop_oldest: 밀린 메시지 중 가장 오래된 것을 버린다. disconnect: 느린 클라이언트 연결을 끊는다.
+WS_SLOW_CLIENT_POLICY = os.getenv("WS_SLOW_CLIENT_POLICY", "drop_oldest")
+WS_MAX_HZ = float(os.getenv("WS_MAX_HZ", "20"))
+
+# 실시간 돌파 이벤트에 쓰는 K. 티커 조회는 요청마다 받은 K로 목표가를 다시 계산한다.
+SIGNAL_K = float(os.getenv("SIGNAL_K", "0.5"))
+SIGNAL_MAX_TICK_AGE = float(os.getenv("SIGNAL_MAX_TICK_AGE", "30"))
+# 전일 지표 채우기가 실패한 심볼은 틱마다 다시 시도하지 않고 지수적으로 늘어나는 간격을 둔다.
+SIGNAL_SEED_RETRY_BASE = float(os.getenv("SIGNAL_SEED_RETRY_BASE", "5"))
+SIGNAL_SEED_RETRY_MAX = float(os.getenv("SIGNAL_SEED_RETRY_MAX", "300"))
+
+ROLLOVER_DELAY = float(os.getenv("ROLLOVER_DELAY", "5"))
+ROLLOVER_RETRIES = int(os.getenv("ROLLOVER_RETRIES", "5"))
+ROLLOVER_RETRY_BASE = float(os.getenv("ROLLOVER_RETRY_BASE", "10"))
+
+SWEEP_MAX_COMBINATIONS = int(os.getenv("SWEEP_MAX_COMBINATIONS", "200"))
+WALKFORWARD_WORKERS = int(os.getenv("WALKFORWARD_WORKERS", "0"))
+PORTFOLIO_MAX_SYMBOLS = int(os.getenv("PORTFOLIO_MAX_SYMBOLS", "20"))
+BOOTSTRAP_CHUNK_PATHS = int(os.getenv("BOOTSTRAP_CHUNK_PATHS", "1000"))
+
+# IP별로 RATE_LIMIT_WINDOW초 동안 쓸 수 있는 요청 비용 합계. 기본 백테스트 한 번의 비용이 1이다.
 RATE_LIMIT_PER_MIN = int(os.getenv("RATE_LIMIT_PER_MIN", "30"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+RATE_LIMIT_SHARDS = int(os.getenv("RATE_LIMIT_SHARDS", "16"))
+# 요청 기간(days)이 이 값을 넘으면 경로별 기본 비용에 days / RATE_LIMIT_COST_DAYS를 곱한다.
+RATE_LIMIT_COST_DAYS = int(os.getenv("RATE_LIMIT_COST_DAYS", "365"))
+RATE_LIMIT_COSTS = {
+    "/api/backtest": 1.0,
+    "/api/backtest/sweep": 3.0,
+    "/api/backtest/walkforward": 5.0,
+    "/api/backtest/portfolio": 3.0,
+    "/api/backtest/intraday": 5.0,
+    "/api/backtest/stream": 1.0,
+    "/api/ai/report": 2.0,
+}
 
 UPBIT_MAX_RETRIES = int(os.getenv("UPBIT_MAX_RETRIES", "3"))
 UPBIT_RETRY_BASE = float(os.getenv("UPBIT_RETRY_BASE", "0.5"))
 UPBIT_CIRCUIT_FAILURES = int(os.getenv("UPBIT_CIRCUIT_FAILURES", "5"))
 UPBIT_CIRCUIT_COOLDOWN = int(os.getenv("UPBIT_CIRCUIT_COOLDOWN", "30"))
+# Upbit 시세 조회 API는 요청 그룹(candles, ticker 등)별로 초당 10회까지 허용한다.
+UPBIT_REQUESTS_PER_SEC = float(os.getenv("UPBIT_REQUESTS_PER_SEC", "10"))
+UPBIT_RATE_LIMIT_PENALTY = float(os.getenv("UPBIT_RATE_LIMIT_PENALTY", "1.0"))
+
+# 비워 두면 SHARED_STATE_DIR이 있을 때는 그 안의 candles.db, 없으면 현재 디렉터리의 candles.db를 쓴다.
+CANDLE_DB_PATH = os.getenv("CANDLE_DB_PATH", "")
+
+# 분봉 백테스트: 요청 가능한 최대 기간과 저장소에서 한 번에 읽어 계산하는 행 수
+INTRADAY_MAX_DAYS = int(os.getenv("INTRADAY_MAX_DAYS", "180"))
+INTRADAY_CHUNK_ROWS = int(os.getenv("INTRADAY_CHUNK_ROWS", "50000"))
+# 분봉을 받을 때 동시에 띄우는 페이지 요청 수. 한 묶음이 끝날 때마다 저장하고 보관 구간을 넓힌다.
+INTRADAY_FETCH_BATCH = int(os.getenv("INTRADAY_FETCH_BATCH", "50"))
+
+# 여러 uvicorn 워커가 상태(인제스트 리더 락, 티커 중계 소켓, 레이트 리밋 카운터)를 나눠 쓰는 디렉터리.
+# 비어 있으면 워커마다 독립된 상태로 동작한다.
+SHARED_STATE_DIR = os.getenv("SHARED_STATE_DIR", "")
+# uvicorn 워커 수. 워커마다 워크포워드 프로세스 풀을 따로 두므로 풀 크기를 이 값으로 나눈다.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+RELAY_MAX_BUFFER = int(os.getenv("RELAY_MAX_BUFFER", str(1024 * 1024)))
+LEADER_RETRY_INTERVAL = float(os.getenv("LEADER_RETRY_INTERVAL", "2"))
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
@@ -41,10 +154,69 @@ logger = logging.getLogger("quantdash")
 logging.basicConfig(level=logging.INFO)
 
 
+def _json_loads(data: "str | bytes") -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _format_float(value: float) -> str:
+    """orjson과 같은 표기로 실수를 쓴다. 유한하지 않은 값은 null이다."""
+    if not math.isfinite(value):
+        return "null"
+    text = repr(float(value))
+    mantissa, separator, exponent = text.partition("e")
+    if not separator:
+        return text
+    power = int(exponent)
+    # repr은 1e-05부터 지수 표기지만 orjson은 소수점 아래 다섯째 자리까지 고정 소수점으로 쓴다.
+    if power == -5:
+        sign = "-" if value < 0 else ""
+        return sign + "0.0000" + mantissa.lstrip("-").replace(".", "")
+    return f"{mantissa}e{power}"
+
+
+def _dumps_fallback(data: object) -> str:
+    if data is None:
+        return "null"
+    if isinstance(data, (bool, np.bool_)):
+        return "true" if data else "false"
+    if isinstance(data, (int, np.integer)):
+        return str(int(data))
+    if isinstance(data, (float, np.floating)):
+        return _format_float(float(data))
+    if isinstance(data, str):
+        return json.dumps(data, ensure_ascii=False)
+    if isinstance(data, dict):
+        return "{" + ",".join(
+            json.dumps(key, ensure_ascii=False) + ":" + _dumps_fallback(value)
+            for key, value in data.items()
+        ) + "}"
+    if isinstance(data, (list, tuple)):
+        return "[" + ",".join(_dumps_fallback(value) for value in data) + "]"
+    if isinstance(data, np.ndarray):
+        return _dumps_fallback(data.tolist())
+    raise TypeError(f"Type is not JSON serializable: {type(data).__name__}")
+
+
+def _json_dumps(data: object) -> bytes:
+    # orjson은 유한하지 않은 실수를 null로 쓴다. orjson이 없을 때도 같은 바이트를 만들어야
+    # 렌더링 경로와 관계없이 응답 본문과 ETag가 같다.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return _dumps_fallback(data).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: object) -> bytes:
+        return _json_dumps(content)
+
+
 @dataclass
 class CacheEntry:
     expires_at: float
     data: object
+    size: int = 0
 
 
 @dataclass
@@ -53,10 +225,338 @@ class CircuitState:
     opened_until: float = 0.0
 
 
+@dataclass
+class FetchStats:
+    upstream_calls: int = 0
+    coalesced_calls: int = 0
+
+
 @dataclass
 class RateLimitState:
-    window_start: float
-    count: int
+    window: int
+    current: float
+    previous: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+def _estimate_size(value: object) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(key) + _estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+
+class TtlLruCache:
+    """항목 수와 바이트 예산을 넘으면 가장 오래 쓰지 않은 항목부터 내보내는 TTL 캐시.
+
+    이벤트 루프 스레드에서만 접근하고 연산 중에 await가 없으므로 락 없이 일관성이 유지된다.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int = 0) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at < time.time():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.data
+
+    def set(self, key: str, data: object, ttl: float, size: Optional[int] = None) -> None:
+        if ttl <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry_size = _estimate_size(data) if size is None else size
+        self._entries[key] = CacheEntry(expires_at=time.time() + ttl, data=data, size=entry_size)
+        self.total_bytes += entry_size
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def pop(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def sweep(self) -> int:
+        now = time.time()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at < now]
+        for key in expired:
+            self._remove(key)
+        self.stats.expirations += len(expired)
+        return len(expired)
+
+    def snapshot(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+
+def _slide_window(
+    state: Optional[RateLimitState], now: float, cost: float, limit: float, window: int
+) -> Tuple[RateLimitState, bool, int]:
+    """직전 윈도 비용을 지난 비율만큼 줄여 더하는 슬라이딩 윈도 근사로 요청 허용 여부를 정한다.
+
+    (새 상태, 허용 여부, 재시도까지 남은 초)를 돌려주며, 거절된 요청은 비용에 넣지 않는다.
+    """
+    index = int(now // window)
+    if state is None or state.window < index - 1:
+        current, previous = 0.0, 0.0
+    elif state.window == index - 1:
+        current, previous = 0.0, state.current
+    else:
+        current, previous = state.current, state.previous
+    # 한도보다 비싼 요청도 윈도가 비어 있으면 한 번은 통과시킨다.
+    cost = min(cost, limit)
+    elapsed = now / window - index
+    # 부동소수 오차로 정확히 한도에 닿는 요청이 거절되지 않도록 작은 여유를 둔다.
+    if previous * (1 - elapsed) + current + cost <= limit + 1e-9:
+        return RateLimitState(index, current + cost, previous), True, 0
+    if current + cost <= limit and previous > 0:
+        # 직전 윈도 몫이 충분히 줄어드는 시점까지 기다린다.
+        wait = (1 - (limit - current - cost) / previous - elapsed) * window
+    else:
+        # 이번 윈도로는 부족하므로 다음 윈도에서 이번 윈도 몫이 줄어들 때까지 기다린다.
+        wait = (index + 1) * window - now
+        if current > 0:
+            wait += max(0.0, 1 - (limit - cost) / current) * window
+    return RateLimitState(index, current, previous), False, max(1, int(wait + 0.999))
+
+
+def _refund_window(
+    state: Optional[RateLimitState], now: float, amount: float, window: int
+) -> Optional[RateLimitState]:
+    """이미 더한 비용 중 amount만큼을 그 비용이 들어간 윈도에서 되돌린다."""
+    if state is None:
+        return None
+    # 요청 처리 중에 윈도가 넘어갔어도 비용은 저장된 상태의 current에 남아 있다.
+    if state.window < int(now // window) - 1:
+        return state
+    return RateLimitState(state.window, max(0.0, state.current - amount), state.previous)
+
+
+class SlidingWindowLimiter:
+    """IP 해시로 나눈 샤드마다 TtlLruCache에 윈도 상태를 두는 슬라이딩 윈도 레이트 리미터.
+
+    두 윈도 동안 요청이 없던 IP는 만료되어 정리되고, 샤드 단위로 정리해 한 번에 멈추는 시간이 짧다.
+    """
+
+    def __init__(self, limit: float, window: int, shards: int, max_clients: int) -> None:
+        self.limit = limit
+        self.window = window
+        self.shards = [
+            TtlLruCache(max_entries=max(1, max_clients // shards)) for _ in range(shards)
+        ]
+
+    def _shard(self, ip: str) -> TtlLruCache:
+        return self.shards[hash(ip) % len(self.shards)]
+
+    def check(self, ip: str, cost: float, now: float) -> Tuple[bool, int]:
+        shard = self._shard(ip)
+        state, allowed, retry_after = _slide_window(
+            shard.get(ip), now, cost, self.limit, self.window
+        )
+        shard.set(ip, state, 2 * self.window, size=0)
+        return allowed, retry_after
+
+    def refund(self, ip: str, amount: float, now: float) -> None:
+        shard = self._shard(ip)
+        state = _refund_window(shard.get(ip), now, amount, self.window)
+        if state is not None:
+            shard.set(ip, state, 2 * self.window, size=0)
+
+    @property
+    def stats(self) -> CacheStats:
+        total = CacheStats()
+        for shard in self.shards:
+            total.hits += shard.stats.hits
+            total.misses += shard.stats.misses
+            total.evictions += shard.stats.evictions
+            total.expirations += shard.stats.expirations
+        return total
+
+    @property
+    def total_bytes(self) -> int:
+        return 0
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def sweep(self) -> int:
+        return sum(shard.sweep() for shard in self.shards)
+
+    def snapshot(self) -> dict:
+        stats = self.stats
+        return {
+            "entries": len(self),
+            "shards": len(self.shards),
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "expirations": stats.expirations,
+        }
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷. 대기자는 락 순서대로(FIFO) 토큰을 받는다."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def limit_to(self, tokens: float) -> None:
+        self._refill()
+        self._tokens = min(self._tokens, tokens)
+
+    def penalize(self, seconds: float) -> None:
+        # 동시에 429를 받은 요청들이 벌점을 겹쳐 쌓지 않도록 빚은 합이 아니라 최댓값으로 둔다.
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # 시리즈마다 [버킷별 개수..., +Inf 개수, 합계]를 보관한다.
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = [0.0] * (len(self.buckets) + 2)
+            self._series[labels] = series
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in self._series.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.label_names, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {int(cumulative)}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-1]}")
+            lines.append(f"{self.name}_count{label_text} {int(cumulative)}")
+        return lines
+
+
+class RateMeter:
+    """최근 window초 동안의 초당 이벤트 수를 초 단위 버킷으로 계산한다."""
+
+    def __init__(self, window: int = 10) -> None:
+        self.window = window
+        self._buckets: "OrderedDict[int, int]" = OrderedDict()
+
+    def mark(self) -> None:
+        second = int(time.time())
+        self._buckets[second] = self._buckets.get(second, 0) + 1
+        while len(self._buckets) > self.window + 1:
+            self._buckets.popitem(last=False)
+
+    def rate(self) -> float:
+        current = int(time.time())
+        total = sum(
+            count
+            for second, count in self._buckets.items()
+            if current - self.window <= second < current
+        )
+        return total / self.window
 
 
 class ApiException(Exception):
@@ -68,15 +568,76 @@ class ApiException(Exception):
         self.retryable = retryable
 
 
+class BootstrapOptions(BaseModel):
+    paths: int = Field(ge=100, le=10000, default=1000)
+    blockSize: int = Field(ge=1, le=250, default=10)
+    seed: Optional[int] = None
+    percentiles: List[Annotated[float, Field(ge=0, le=100)]] = Field(
+        default_factory=lambda: [5.0, 50.0, 95.0], min_length=1, max_length=20
+    )
+
+
 class BacktestRequest(BaseModel):
     symbol: str
     k: float = Field(ge=0)
     fee: float = Field(ge=0)
     slippage: float = Field(ge=0, default=0.0)
+    # days(최근 N일) 또는 startDate(그날부터 최근 완료 일봉까지) 중 하나를 준다.
+    days: Optional[int] = Field(ge=10, le=2000, default=None)
+    startDate: Optional[date] = None
+    useMaFilter: bool
+    bootstrap: Optional[BootstrapOptions] = None
+
+
+class BacktestSweepRequest(BaseModel):
+    symbol: str
+    kMin: float = Field(ge=0, default=0.1)
+    kMax: float = Field(ge=0, default=1.0)
+    kStep: float = Field(gt=0, default=0.05)
+    fee: float = Field(ge=0)
+    slippage: float = Field(ge=0, default=0.0)
+    days: int = Field(ge=10, le=2000)
+
+
+class WalkForwardRequest(BaseModel):
+    symbol: str
+    days: int = Field(ge=60, le=2000)
+    inSampleDays: int = Field(ge=20, le=1000, default=180)
+    outSampleDays: int = Field(ge=5, le=365, default=30)
+    kMin: float = Field(ge=0, default=0.1)
+    kMax: float = Field(ge=0, default=1.0)
+    kStep: float = Field(gt=0, default=0.05)
+    fee: float = Field(ge=0)
+    slippage: float = Field(ge=0, default=0.0)
+    # None이면 MA 필터 사용/미사용을 모두 탐색한다.
+    useMaFilter: Optional[bool] = None
+
+
+class PortfolioRequest(BaseModel):
+    symbols: List[str] = Field(default_factory=lambda: list(DEFAULT_MARKETS), min_length=1)
+    # 생략하면 동일 비중. 합이 1이 아니면 합으로 나눠 정규화한다.
+    weights: Optional[List[float]] = None
+    k: float = Field(ge=0)
+    fee: float = Field(ge=0)
+    slippage: float = Field(ge=0, default=0.0)
     days: int = Field(ge=10, le=2000)
     useMaFilter: bool
 
 
+class IntradayBacktestRequest(BaseModel):
+    symbol: str
+    # Upbit 분봉 단위(분)
+    unit: Literal[1, 3, 5, 10, 15, 30, 60, 240] = 60
+    k: float = Field(ge=0)
+    fee: float = Field(ge=0)
+    slippage: float = Field(ge=0, default=0.0)
+    # 상한은 INTRADAY_MAX_DAYS로 한 번 더 제한한다.
+    days: int = Field(ge=1, le=365)
+    useMaFilter: bool
+    # 자산 곡선은 기간을 이만큼의 구간으로 나눠 구간마다 마지막 값만 돌려준다.
+    points: int = Field(ge=10, le=5000, default=500)
+
+
 class BacktestResult(BaseModel):
     date: str
     price: float
@@ -122,12 +683,104 @@ class MetricSummary(BaseModel):
     totalDays: int
 
 
+class BacktestColumnarResults(BaseModel):
+    startDate: Optional[str]
+    dateOffsets: List[int]
+    price: List[float]
+    target: List[float]
+    ma5: List[float]
+    # 행 i의 매수 여부는 base64 디코딩한 바이트 i // 8의 (i % 8)번째 비트(LSB 우선)다.
+    isBought: str
+    ror: List[float]
+    hpr: List[float]
+    totalRows: int
+
+
+class PercentileBand(BaseModel):
+    percentile: float
+    totalReturn: float
+    mdd: float
+    cagr: float
+
+
+class MetricConfidence(BaseModel):
+    paths: int
+    blockSize: int
+    seed: Optional[int]
+    bands: List[PercentileBand]
+
+
 class BacktestResponse(BaseModel):
-    results: List[BacktestResult]
+    results: Union[List[BacktestResult], BacktestColumnarResults]
     trades: List[Trade]
     tradeSummary: TradeSummary
     metrics: MetricSummary
     ticker: Optional[MarketTicker]
+    confidence: Optional[MetricConfidence] = None
+
+
+class SweepResult(BaseModel):
+    k: float
+    useMaFilter: bool
+    metrics: MetricSummary
+
+
+class BacktestSweepResponse(BaseModel):
+    results: List[SweepResult]
+    best: Optional[SweepResult]
+
+
+class WalkForwardWindow(BaseModel):
+    inSampleStart: str
+    inSampleEnd: str
+    outSampleStart: str
+    outSampleEnd: str
+    k: float
+    useMaFilter: bool
+    inSampleMetrics: MetricSummary
+    outSampleMetrics: MetricSummary
+
+
+class EquityPoint(BaseModel):
+    date: str
+    hpr: float
+
+
+class WalkForwardResponse(BaseModel):
+    windows: List[WalkForwardWindow]
+    equity: List[EquityPoint]
+    metrics: MetricSummary
+
+
+class PortfolioSymbolResult(BaseModel):
+    symbol: str
+    weight: float
+    metrics: MetricSummary
+
+
+class PortfolioResponse(BaseModel):
+    symbols: List[PortfolioSymbolResult]
+    equity: List[EquityPoint]
+    metrics: MetricSummary
+
+
+class IntradayPerformance(BaseModel):
+    rows: int
+    chunks: int
+    elapsedMs: float
+    rowsPerSec: float
+    # 청크 하나를 계산하는 동안 잡은 배열 크기의 최댓값
+    peakChunkBytes: int
+    # 프로세스 전체 최대 RSS(resource 모듈이 없으면 0)
+    maxRssBytes: int
+
+
+class IntradayBacktestResponse(BaseModel):
+    unit: int
+    metrics: MetricSummary
+    tradeSummary: TradeSummary
+    equity: List[EquityPoint]
+    performance: IntradayPerformance
 
 
 class AiReport(BaseModel):
@@ -152,7 +805,7 @@ class AiReportResponse(BaseModel):
     cached: bool
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 raw_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000")
 if raw_origins.strip() == "*":
@@ -168,77 +821,621 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 http_client: Optional[httpx.AsyncClient] = None
-cache: Dict[str, CacheEntry] = {}
-cache_lock = asyncio.Lock()
-rate_limits: Dict[str, RateLimitState] = {}
-rate_lock = asyncio.Lock()
+cache = TtlLruCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+rate_limits = SlidingWindowLimiter(
+    RATE_LIMIT_PER_MIN, RATE_LIMIT_WINDOW, RATE_LIMIT_SHARDS, RATE_LIMIT_MAX_CLIENTS
+)
 circuit_states: Dict[str, CircuitState] = {}
+inflight_requests: Dict[str, "asyncio.Task[list]"] = {}
 
-ai_cache: Dict[str, CacheEntry] = {}
-ai_cache_lock = asyncio.Lock()
+upstream_latency = Histogram(
+    "upbit_request_duration_seconds",
+    "Upbit REST request latency per attempt, including retries.",
+    ("path", "status"),
+)
+rate_limited_requests = Counter(
+    "http_rate_limited_total", "Requests rejected by the per-IP rate limiter.", ("path",)
+)
+backtest_phase_latency = Histogram(
+    "backtest_phase_duration_seconds", "Time spent per backtest phase.", ("phase",)
+)
+ws_messages = Counter("upbit_ws_messages_total", "Messages received from the Upbit WebSocket.")
+ws_message_rate = RateMeter()
+upbit_buckets: Dict[str, TokenBucket] = {}
+fetch_stats = FetchStats()
+
+ai_cache = TtlLruCache(max_entries=AI_CACHE_MAX_ENTRIES)
+backtest_states = TtlLruCache(
+    max_entries=BACKTEST_STATE_MAX_ENTRIES, max_bytes=BACKTEST_STATE_MAX_BYTES
+)
+response_cache = TtlLruCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES
+)
 
 live_tickers: Dict[str, dict] = {}
 live_lock = asyncio.Lock()
 
 
+class CandleStore:
+    """완료된 일봉을 마켓별로 보관하는 SQLite 저장소."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS candles (
+                    market TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    timestamp_utc TEXT NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (market, date)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS daily_coverage (
+                    market TEXT PRIMARY KEY,
+                    first_date TEXT NOT NULL,
+                    last_date TEXT NOT NULL,
+                    history_complete INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS minute_candles (
+                    market TEXT NOT NULL,
+                    unit INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (market, unit, ts)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS minute_coverage (
+                    market TEXT NOT NULL,
+                    unit INTEGER NOT NULL,
+                    start_ts INTEGER NOT NULL,
+                    end_ts INTEGER NOT NULL,
+                    PRIMARY KEY (market, unit)
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def bounds(self, market: str) -> Tuple[Optional[str], Optional[str], int, bool]:
+        """(첫 날짜, 마지막 날짜, 개수, 상장 시점까지 채웠는지).
+
+        날짜는 빈틈없이 받아 둔 구간 [first_date, last_date]이고 개수도 그 안의 일봉만 센다.
+        구간 밖에 남은 일봉은 중간이 비어 있을 수 있으므로 없는 것으로 본다.
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT first_date, last_date, history_complete FROM daily_coverage "
+                "WHERE market = ?",
+                (market,),
+            ).fetchone()
+            if row is None:
+                return None, None, 0, False
+            first_date, last_date, complete = row
+            (stored,) = conn.execute(
+                "SELECT COUNT(*) FROM candles WHERE market = ? AND date BETWEEN ? AND ?",
+                (market, first_date, last_date),
+            ).fetchone()
+        return first_date, last_date, stored, bool(complete)
+
+    def upsert(
+        self, market: str, candles: List[dict], coverage: Tuple[str, str], complete: bool
+    ) -> None:
+        """일봉을 저장하고 보관 구간을 coverage(첫 날짜, 마지막 날짜)로 바꾼다.
+
+        complete가 True면 상장 시점까지 받았다고 표시한다. 한 번 표시하면 유지한다.
+        """
+        rows = [
+            (
+                market,
+                _format_date(item["candle_date_time_kst"]),
+                item["candle_date_time_kst"],
+                item["candle_date_time_utc"],
+                item["opening_price"],
+                item["high_price"],
+                item["low_price"],
+                item["trade_price"],
+                item["candle_acc_trade_volume"],
+            )
+            for item in candles
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.execute(
+                    "INSERT INTO daily_coverage VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (market) DO UPDATE SET first_date = excluded.first_date, "
+                    "last_date = excluded.last_date, "
+                    "history_complete = MAX(history_complete, excluded.history_complete)",
+                    (market, *coverage, int(complete)),
+                )
+
+    def load(self, market: str, count: int, before: str) -> List[dict]:
+        with self._lock:
+            # 보관 구간 밖의 일봉은 앞뒤가 비어 있을 수 있으므로 돌려주지 않는다.
+            rows = self._connect().execute(
+                "SELECT timestamp, open, high, low, close, volume FROM candles "
+                "WHERE market = ? AND date < ? AND date >= "
+                "(SELECT first_date FROM daily_coverage WHERE market = ?) "
+                "ORDER BY date DESC LIMIT ?",
+                (market, before, market, count),
+            ).fetchall()
+        rows.reverse()
+        return [
+            {
+                "timestamp": timestamp,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            }
+            for timestamp, open_, high, low, close, volume in rows
+        ]
+
+    def minute_coverage(self, market: str, unit: int) -> Optional[Tuple[int, int]]:
+        """빈틈없이 받아 둔 분봉 구간 [start_ts, end_ts). 시각은 UTC epoch 초."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT start_ts, end_ts FROM minute_coverage WHERE market = ? AND unit = ?",
+                (market, unit),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def upsert_minutes(
+        self, market: str, unit: int, candles: List[dict], coverage: Tuple[int, int]
+    ) -> None:
+        """분봉을 저장하고 보관 구간을 coverage로 바꾼다. 둘을 한 트랜잭션으로 묶는다."""
+        rows = [
+            (
+                market,
+                unit,
+                _epoch_seconds(item["candle_date_time_utc"]),
+                item["opening_price"],
+                item["high_price"],
+                item["low_price"],
+                item["trade_price"],
+                item["candle_acc_trade_volume"],
+            )
+            for item in candles
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO minute_candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO minute_coverage VALUES (?, ?, ?, ?)",
+                    (market, unit, *coverage),
+                )
+
+    def minute_warmup(self, market: str, unit: int, before: int, count: int) -> np.ndarray:
+        """before 직전 분봉 count개를 (ts, open, high, low, close, volume) 행렬로 돌려준다."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT ts, open, high, low, close, volume FROM minute_candles "
+                "WHERE market = ? AND unit = ? AND ts < ? ORDER BY ts DESC LIMIT ?",
+                (market, unit, before, count),
+            ).fetchall()
+        rows.reverse()
+        return np.array(rows, dtype=np.float64).reshape(-1, 6)
+
+    def iter_minutes(
+        self, market: str, unit: int, start: int, end: int, chunk_rows: int
+    ) -> Iterator[np.ndarray]:
+        """[start, end) 분봉을 chunk_rows행씩 시간순 행렬로 내보낸다.
+
+        청크마다 마지막 시각 다음부터 기본 키로 이어 읽으므로, 락은 청크를 읽는 동안만 잡고
+        메모리에는 청크 하나만 올라간다.
+        """
+        cursor = start
+        while cursor < end:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT ts, open, high, low, close, volume FROM minute_candles "
+                    "WHERE market = ? AND unit = ? AND ts >= ? AND ts < ? ORDER BY ts LIMIT ?",
+                    (market, unit, cursor, end, chunk_rows),
+                ).fetchall()
+            if not rows:
+                return
+            chunk = np.array(rows, dtype=np.float64)
+            del rows
+            yield chunk
+            if len(chunk) < chunk_rows:
+                return
+            cursor = int(chunk[-1, 0]) + 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class FileLock:
+    """flock 기반 프로세스 간 락. 프로세스가 죽으면 OS가 풀어 준다."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedRateLimitStore:
+    """워커들이 함께 쓰는 IP별 슬라이딩 윈도 상태(SQLite)."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_windows ("
+                "ip TEXT PRIMARY KEY, window INTEGER NOT NULL, "
+                "current REAL NOT NULL, previous REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._conn = conn
+        return self._conn
+
+    def check(
+        self, ip: str, cost: float, now: float, limit: float, window: int
+    ) -> Tuple[bool, int]:
+        # BEGIN IMMEDIATE로 쓰기 락을 먼저 잡아 여러 프로세스의 읽기-갱신이 섞이지 않게 한다.
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window, current, previous FROM rate_windows WHERE ip = ?", (ip,)
+                ).fetchone()
+                state, allowed, retry_after = _slide_window(
+                    RateLimitState(*row) if row else None, now, cost, limit, window
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_windows VALUES (?, ?, ?, ?)",
+                    (ip, state.window, state.current, state.previous),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def refund(self, ip: str, amount: float, now: float, window: int) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window, current, previous FROM rate_windows WHERE ip = ?", (ip,)
+                ).fetchone()
+                state = _refund_window(RateLimitState(*row) if row else None, now, amount, window)
+                if state is not None:
+                    conn.execute(
+                        "UPDATE rate_windows SET current = ? WHERE ip = ?", (state.current, ip)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def sweep(self, now: float, window: int) -> None:
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM rate_windows WHERE window < ?", (int(now // window) - 1,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@dataclass
+class SymbolCandles:
+    as_of: date
+    candles: List[dict]
+    complete: bool
+
+
+process_pool: Optional[ProcessPoolExecutor] = None
+candle_store: Optional[CandleStore] = None
+# 키(심볼 등)별 동기화 락과 그 락을 잡았거나 기다리는 코루틴 수. 0이 되면 항목을 지운다.
+candle_sync_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+# 심볼 수가 늘어도 다른 전역 캐시처럼 항목 수·바이트 한도와 정리 작업의 대상이 된다.
+candle_cache = TtlLruCache(
+    max_entries=CANDLE_CACHE_MAX_ENTRIES, max_bytes=CANDLE_CACHE_MAX_BYTES
+)
+shared_rate_limits: Optional[SharedRateLimitStore] = None
+# standalone: 단일 프로세스 모드, leader: Upbit WS에 직접 붙은 워커, follower: 리더의 중계를 받는 워커
+ingest_role = "standalone"
+ingest_lock: Optional[FileLock] = None
+tick_relay: Optional["TickRelay"] = None
+
+
+def _dump_ws_payload(payload: dict) -> str:
+    return _json_dumps(payload).decode("utf-8")
+
+
+class ClientConnection:
+    def __init__(self, websocket: WebSocket, symbols: Set[str], max_hz: Optional[float]) -> None:
+        self.websocket = websocket
+        self.symbols = symbols
+        self.max_hz = max_hz
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        # 콘플레이션 모드에서는 심볼별 최신 메시지만 남겨 두었다가 주기적으로 한 프레임에 모아 보낸다.
+        self.pending: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        # pending이 비어 있지 않으면 set. 보낼 것이 없는 연결은 깨어나지 않는다.
+        self.pending_ready = asyncio.Event()
+        self.dropped = 0
+        self.writer: Optional[asyncio.Task] = None
+
+
 class TickerBroadcaster:
+    """심볼별 구독자 인덱스와 연결별 송신 큐로 느린 클라이언트가 다른 클라이언트를 막지 않게 한다.
+
+    모든 상태 변경은 이벤트 루프 스레드에서 await 없이 일어나므로 락이 필요 없다.
+    """
+
     def __init__(self) -> None:
-        self._connections: Dict[WebSocket, Set[str]] = {}
-        self._lock = asyncio.Lock()
+        self._connections: Dict[WebSocket, ClientConnection] = {}
+        self._by_symbol: Dict[str, Set[ClientConnection]] = {}
+        self._all_symbols: Set[ClientConnection] = set()
+        self.dropped_messages = 0
+        self.conflated_messages = 0
+        self.slow_disconnects = 0
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def queue_depth(self) -> int:
+        return sum(
+            conn.queue.qsize() + len(conn.pending) for conn in self._connections.values()
+        )
 
-    async def connect(self, websocket: WebSocket, symbols: Set[str]) -> None:
+    async def connect(
+        self, websocket: WebSocket, symbols: Set[str], max_hz: Optional[float] = None
+    ) -> None:
         await websocket.accept()
-        async with self._lock:
-            self._connections[websocket] = symbols
+        conn = ClientConnection(websocket, symbols, max_hz)
+        self._connections[websocket] = conn
+        if symbols:
+            for symbol in symbols:
+                self._by_symbol.setdefault(symbol, set()).add(conn)
+        else:
+            self._all_symbols.add(conn)
+        if max_hz:
+            conn.writer = asyncio.create_task(self._drain_conflated(conn))
+        else:
+            conn.writer = asyncio.create_task(self._drain(conn))
 
     async def disconnect(self, websocket: WebSocket) -> None:
-        async with self._lock:
-            self._connections.pop(websocket, None)
+        conn = self._connections.get(websocket)
+        if conn:
+            self._remove(conn)
+
+    def send(self, websocket: WebSocket, payload: dict) -> None:
+        conn = self._connections.get(websocket)
+        if conn:
+            key = (payload.get("type"), payload.get("symbol"))
+            self._enqueue(conn, key, _dump_ws_payload(payload))
 
     async def broadcast(self, payload: dict) -> None:
-        async with self._lock:
-            targets = list(self._connections.items())
-        for websocket, symbols in targets:
-            if symbols and payload.get("symbol") not in symbols:
-                continue
-            try:
-                await websocket.send_json(payload)
-            except Exception:
-                await self.disconnect(websocket)
+        symbol = payload.get("symbol")
+        subscribers = self._by_symbol.get(symbol)
+        if not subscribers and not self._all_symbols:
+            return
+        # 콘플레이션은 (메시지 종류, 심볼) 단위라서 돌파 이벤트가 시세 갱신에 덮이지 않는다.
+        key = (payload.get("type"), symbol)
+        message = _dump_ws_payload(payload)
+        for conn in list(subscribers or ()):
+            self._enqueue(conn, key, message)
+        for conn in list(self._all_symbols):
+            self._enqueue(conn, key, message)
+
+    def _enqueue(
+        self, conn: ClientConnection, key: Tuple[Optional[str], Optional[str]], message: str
+    ) -> None:
+        if conn.max_hz:
+            if key in conn.pending:
+                self.conflated_messages += 1
+            conn.pending[key] = message
+            conn.pending_ready.set()
+            return
+        if conn.queue.full():
+            if WS_SLOW_CLIENT_POLICY == "disconnect":
+                self.slow_disconnects += 1
+                self._remove(conn)
+                asyncio.create_task(self._close(conn.websocket))
+                return
+            conn.queue.get_nowait()
+            conn.dropped += 1
+            self.dropped_messages += 1
+        conn.queue.put_nowait(message)
+
+    async def _drain(self, conn: ClientConnection) -> None:
+        try:
+            while True:
+                message = await conn.queue.get()
+                await conn.websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._remove(conn)
+
+    async def _drain_conflated(self, conn: ClientConnection) -> None:
+        interval = 1 / conn.max_hz
+        try:
+            while True:
+                await conn.pending_ready.wait()
+                conn.pending_ready.clear()
+                messages = list(conn.pending.values())
+                conn.pending.clear()
+                # 개별 메시지는 이미 직렬화되어 있으므로 배치 프레임은 문자열로 이어 붙인다.
+                await conn.websocket.send_text(
+                    '{"type":"batch","updates":[' + ",".join(messages) + "]}"
+                )
+                # 보낸 뒤에만 간격을 둔다. 그동안 들어온 메시지는 pending에서 최신 값으로 합쳐진다.
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._remove(conn)
+
+    def _remove(self, conn: ClientConnection) -> None:
+        if self._connections.get(conn.websocket) is not conn:
+            return
+        del self._connections[conn.websocket]
+        self._all_symbols.discard(conn)
+        for symbol in conn.symbols:
+            subscribers = self._by_symbol.get(symbol)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del self._by_symbol[symbol]
+        if conn.writer and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
 
 
 broadcaster = TickerBroadcaster()
 
 
+def _candle_db_path() -> str:
+    if CANDLE_DB_PATH:
+        return CANDLE_DB_PATH
+    # 메모리 저장소는 워커끼리 공유되지 않으므로 공유 모드에서는 공유 디렉터리에 둔다.
+    if SHARED_STATE_DIR:
+        return os.path.join(SHARED_STATE_DIR, "candles.db")
+    return "candles.db"
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
-    global http_client
+    global http_client, candle_store, shared_rate_limits
     http_client = httpx.AsyncClient(timeout=10)
+    if SHARED_STATE_DIR:
+        if fcntl is None:
+            raise RuntimeError("SHARED_STATE_DIR requires a POSIX platform (fcntl)")
+        os.makedirs(SHARED_STATE_DIR, exist_ok=True)
+        shared_rate_limits = SharedRateLimitStore(os.path.join(SHARED_STATE_DIR, "ratelimits.db"))
+    candle_store = CandleStore(_candle_db_path())
     markets = os.getenv("STREAM_MARKETS")
     if markets:
         market_list = [m.strip() for m in markets.split(",") if m.strip()]
     else:
         market_list = DEFAULT_MARKETS
     if market_list:
-        asyncio.create_task(run_upbit_ws(market_list))
+        if SHARED_STATE_DIR:
+            # 일봉 지표 롤오버는 리더만 돌린다. 팔로워는 첫 틱에서 리더가 채운 공유 캔들 저장소로 계산한다.
+            asyncio.create_task(run_ingest_coordinator(market_list))
+        else:
+            asyncio.create_task(run_upbit_ws(market_list))
+            asyncio.create_task(run_daily_rollover(market_list))
+    # 정리 대상 캐시는 모두 프로세스 메모리에 있으므로 스위퍼는 워커마다 돈다.
+    asyncio.create_task(run_cache_sweeper())
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     if http_client:
         await http_client.aclose()
+    if candle_store:
+        candle_store.close()
+    if shared_rate_limits:
+        shared_rate_limits.close()
+    if tick_relay:
+        await tick_relay.close()
+    if ingest_lock:
+        ingest_lock.release()
+    if process_pool:
+        process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cache_sweeper() -> None:
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        stores = (
+            cache,
+            ai_cache,
+            candle_cache,
+            backtest_states,
+            response_cache,
+            *rate_limits.shards,
+        )
+        for store in stores:
+            store.sweep()
+            # 샤드 사이에 이벤트 루프를 양보해 정리 작업이 요청 처리를 오래 막지 않게 한다.
+            await asyncio.sleep(0)
+        if shared_rate_limits:
+            await asyncio.to_thread(shared_rate_limits.sweep, time.time(), RATE_LIMIT_WINDOW)
 
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     path = request.url.path
-    if path in {"/api/backtest", "/api/ai/report"}:
+    if path in RATE_LIMIT_COSTS:
         ip = request.client.host if request.client else "unknown"
-        allowed, retry_after = await check_rate_limit(ip)
+        # 본문은 미들웨어가 읽어도 캐시되어 엔드포인트에 그대로 전달된다.
+        cost = _request_cost(path, await request.body())
+        allowed, retry_after = await check_rate_limit(ip, cost)
         if not allowed:
+            rate_limited_requests.inc(path)
             return JSONResponse(
                 status_code=429,
                 content={
@@ -250,6 +1447,12 @@ async def rate_limit_middleware(request: Request, call_next):
                 },
                 headers={"Retry-After": str(retry_after)},
             )
+        response = await call_next(request)
+        # 304는 캐시된 결과를 확인만 했으므로 기간에 비례해 더한 비용은 돌려준다.
+        base_cost = RATE_LIMIT_COSTS[path]
+        if response.status_code == 304 and cost > base_cost:
+            await refund_rate_limit(ip, cost - base_cost)
+        return response
     return await call_next(request)
 
 
@@ -297,6 +1500,10 @@ def _format_date(timestamp: str) -> str:
         return timestamp.split("T")[0] if "T" in timestamp else timestamp
 
 
+def _epoch_seconds(timestamp_utc: str) -> int:
+    return int(datetime.fromisoformat(timestamp_utc).replace(tzinfo=timezone.utc).timestamp())
+
+
 def _cache_key(path: str, params: dict) -> str:
     params_key = json.dumps(params, sort_keys=True, separators=(",", ":"))
     return f"{path}:{params_key}"
@@ -331,29 +1538,9 @@ def _record_failure(path: str) -> None:
 def _get_ttl(path: str) -> int:
     if path == "/ticker":
         return CACHE_TTL_TICKER
-    if path == "/candles/days":
-        return CACHE_TTL_OHLCV
     return 0
 
 
-async def _get_cache(key: str) -> Optional[list]:
-    async with cache_lock:
-        entry = cache.get(key)
-        if not entry:
-            return None
-        if entry.expires_at < time.time():
-            cache.pop(key, None)
-            return None
-        return entry.data
-
-
-async def _set_cache(key: str, data: list, ttl: int) -> None:
-    if ttl <= 0:
-        return
-    async with cache_lock:
-        cache[key] = CacheEntry(expires_at=time.time() + ttl, data=data)
-
-
 async def _fetch_json(path: str, params: dict) -> list:
     if not http_client:
         raise ApiException(500, "CLIENT_NOT_READY", "HTTP 클라이언트가 준비되지 않았습니다.", True)
@@ -363,28 +1550,82 @@ async def _fetch_json(path: str, params: dict) -> list:
 
     cache_key = _cache_key(path, params)
     ttl = _get_ttl(path)
-    cached = await _get_cache(cache_key)
+    cached = cache.get(cache_key)
     if cached is not None:
         return cached
 
+    # 같은 키로 진행 중인 요청이 있으면 새로 보내지 않고 그 결과(또는 오류)를 함께 기다린다.
+    task = inflight_requests.get(cache_key)
+    if task is not None:
+        fetch_stats.coalesced_calls += 1
+    else:
+        fetch_stats.upstream_calls += 1
+        task = asyncio.create_task(_request_upstream(path, params, cache_key, ttl))
+        inflight_requests[cache_key] = task
+        task.add_done_callback(lambda done: _finish_inflight(cache_key, done))
+    # 한 호출자가 취소되어도 다른 대기자를 위해 업스트림 요청은 계속 진행한다.
+    return await asyncio.shield(task)
+
+
+def _finish_inflight(cache_key: str, task: "asyncio.Task[list]") -> None:
+    if inflight_requests.get(cache_key) is task:
+        inflight_requests.pop(cache_key, None)
+    if not task.cancelled():
+        task.exception()
+
+
+def _get_bucket(path: str) -> TokenBucket:
+    group = "candles" if path.startswith("/candles") else path.strip("/")
+    bucket = upbit_buckets.get(group)
+    if not bucket:
+        bucket = TokenBucket(UPBIT_REQUESTS_PER_SEC, UPBIT_REQUESTS_PER_SEC)
+        upbit_buckets[group] = bucket
+    return bucket
+
+
+def _sync_bucket(bucket: TokenBucket, response: httpx.Response) -> None:
+    # 예: "group=candles; min=599; sec=9" — 서버가 알려준 남은 초당 횟수보다 많이 보내지 않는다.
+    header = response.headers.get("Remaining-Req")
+    if not header:
+        return
+    for part in header.split(";"):
+        name, _, value = part.strip().partition("=")
+        if name == "sec" and value.isdigit():
+            bucket.limit_to(float(value))
+
+
+async def _request_upstream(path: str, params: dict, cache_key: str, ttl: int) -> list:
     url = f"{UPBIT_BASE_URL}{path}"
+    bucket = _get_bucket(path)
     for attempt in range(UPBIT_MAX_RETRIES):
+        await bucket.acquire()
         try:
+            started = time.perf_counter()
             response = await http_client.get(url, params=params)
         except httpx.RequestError:
+            upstream_latency.observe(time.perf_counter() - started, path, "error")
             _record_failure(path)
             logger.warning("Upbit network error path=%s attempt=%s", path, attempt + 1)
             if attempt == UPBIT_MAX_RETRIES - 1:
                 raise ApiException(502, "UPBIT_NETWORK", "Upbit 네트워크 오류", True)
         else:
+            upstream_latency.observe(time.perf_counter() - started, path, str(response.status_code))
+            _sync_bucket(bucket, response)
             if response.status_code == 200:
                 data = response.json()
                 if not isinstance(data, list):
                     raise ApiException(502, "UPBIT_BAD_RESPONSE", "Upbit 응답 포맷 오류", True)
-                await _set_cache(cache_key, data, ttl)
+                cache.set(cache_key, data, ttl)
                 _record_success(path)
                 return data
-            if response.status_code == 429 or response.status_code >= 500:
+            if response.status_code == 429:
+                # 요청 속도는 버킷이 조절하므로 429는 장애가 아니다. 서킷을 열지 않고 버킷만 비운다.
+                bucket.penalize(UPBIT_RATE_LIMIT_PENALTY)
+                logger.warning("Upbit API throttled path=%s attempt=%s", path, attempt + 1)
+                if attempt == UPBIT_MAX_RETRIES - 1:
+                    raise ApiException(502, "UPBIT_RATE_LIMIT", "Upbit API 응답 실패: 429", True)
+                continue
+            if response.status_code >= 500:
                 _record_failure(path)
                 logger.warning(
                     "Upbit API retry path=%s status=%s attempt=%s",
@@ -395,7 +1636,7 @@ async def _fetch_json(path: str, params: dict) -> list:
                 if attempt == UPBIT_MAX_RETRIES - 1:
                     raise ApiException(
                         502,
-                        "UPBIT_RATE_LIMIT",
+                        "UPBIT_SERVER_ERROR",
                         f"Upbit API 응답 실패: {response.status_code}",
                         True,
                     )
@@ -420,167 +1661,577 @@ async def _fetch_json(path: str, params: dict) -> list:
     raise ApiException(502, "UPBIT_UNKNOWN", "Upbit 응답 실패", True)
 
 
-async def check_rate_limit(ip: str) -> Tuple[bool, int]:
+def _request_cost(path: str, body: bytes) -> float:
+    cost = RATE_LIMIT_COSTS.get(path, 1.0)
+    try:
+        params = _json_loads(body) if body else {}
+        if not isinstance(params, dict):
+            return cost
+        days = params.get("days")
+        if days is None and isinstance(params.get("startDate"), str):
+            days = (_trading_day() - date.fromisoformat(params["startDate"])).days
+    except (ValueError, TypeError):
+        # 잘못된 본문은 엔드포인트 검증이 422로 거절하므로 기본 비용만 받는다.
+        return cost
+    if isinstance(days, int) and days > RATE_LIMIT_COST_DAYS:
+        cost *= days / RATE_LIMIT_COST_DAYS
+    return cost
+
+
+async def check_rate_limit(ip: str, cost: float = 1.0) -> Tuple[bool, int]:
     now = time.time()
-    async with rate_lock:
-        state = rate_limits.get(ip)
-        if not state or now - state.window_start >= RATE_LIMIT_WINDOW:
-            state = RateLimitState(window_start=now, count=1)
-            rate_limits[ip] = state
-            return True, 0
-        state.count += 1
-        if state.count > RATE_LIMIT_PER_MIN:
-            retry_after = int(state.window_start + RATE_LIMIT_WINDOW - now)
-            return False, max(1, retry_after)
-        return True, 0
+    if shared_rate_limits:
+        return await asyncio.to_thread(
+            shared_rate_limits.check, ip, cost, now, RATE_LIMIT_PER_MIN, RATE_LIMIT_WINDOW
+        )
+    return rate_limits.check(ip, cost, now)
 
 
-async def fetch_ohlcv(symbol: str, count: int) -> List[dict]:
-    raw: List[dict] = []
-    target_count = count + 1
-    remaining = target_count
-    to_param = None
-
-    while remaining > 0:
-        batch_count = min(200, remaining)
-        params = {"market": symbol, "count": batch_count}
-        if to_param:
-            params["to"] = to_param
-        batch = await _fetch_json("/candles/days", params)
-        if not batch:
-            break
-        raw.extend(batch)
-        remaining -= len(batch)
-        to_param = batch[-1].get("candle_date_time_utc")
-        if len(batch) < batch_count:
+async def refund_rate_limit(ip: str, amount: float) -> None:
+    now = time.time()
+    if shared_rate_limits:
+        await asyncio.to_thread(shared_rate_limits.refund, ip, amount, now, RATE_LIMIT_WINDOW)
+    else:
+        rate_limits.refund(ip, amount, now)
+
+
+def _trading_day() -> date:
+    # Upbit 일봉은 KST 09:00(UTC 00:00)에 시작하므로 KST 자정~09:00 사이는 아직 전날 거래일이다.
+    return (datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(hours=9)).date()
+
+
+def _candle_pages(end: date, total: int) -> List[Tuple[str, int]]:
+    """end(미포함) 이전 total개 일봉을 200개 단위 (to, count) 페이지로 미리 나눈다."""
+    pages: List[Tuple[str, int]] = []
+    offset = 0
+    while offset < total:
+        batch_count = min(200, total - offset)
+        # KST D일 일봉의 UTC 시각은 D일 00:00이므로 날짜만으로 페이지 경계를 정할 수 있다.
+        to_param = f"{(end - timedelta(days=offset)).isoformat()}T00:00:00"
+        pages.append((to_param, batch_count))
+        offset += batch_count
+    return pages
+
+
+async def _fetch_candle_range(
+    symbol: str, end: date, total: int, covered: Optional[Tuple[str, str]]
+) -> None:
+    """end 이전 total개 일봉을 동시에 받아 저장하고 보관 구간 covered를 넓힌다.
+
+    받은 구간은 covered와 맞닿아 있어야 한다. 페이지 하나가 실패하면 covered에 붙은 쪽부터
+    첫 실패 직전 페이지까지만 저장하고 오류를 올려, 보관 구간 안에 구멍이 생기지 않게 한다.
+    """
+    pages = _candle_pages(end, total)
+    batches = await asyncio.gather(
+        *[
+            _fetch_json("/candles/days", {"market": symbol, "count": batch_count, "to": to_param})
+            for to_param, batch_count in pages
+        ],
+        return_exceptions=True,
+    )
+    # 페이지는 최신 구간부터다. 기존 구간보다 최신 쪽을 받을 때는 오래된 페이지부터 잇는다.
+    ordered = list(zip(pages, batches))
+    if covered is not None and end > date.fromisoformat(covered[1]):
+        ordered.reverse()
+    kept: List[Tuple[Tuple[str, int], list]] = []
+    failure: Optional[BaseException] = None
+    for page, batch in ordered:
+        if isinstance(batch, BaseException):
+            failure = batch
             break
+        kept.append((page, batch))
+    if kept:
+        firsts = []
+        lasts = []
+        for (to_param, batch_count), _ in kept:
+            # to(미포함)의 날짜 D 이전 batch_count일, 즉 [D - batch_count, D - 1]을 덮는다.
+            page_end = date.fromisoformat(to_param[:10])
+            firsts.append((page_end - timedelta(days=batch_count)).isoformat())
+            lasts.append((page_end - timedelta(days=1)).isoformat())
+        first_date, last_date = min(firsts), max(lasts)
+        if covered is not None:
+            first_date, last_date = min(first_date, covered[0]), max(last_date, covered[1])
+        # 요청보다 적게 온 페이지가 있으면 상장 시점까지 내려간 것이다.
+        complete = any(len(batch) < batch_count for (_, batch_count), batch in kept)
+        fetched = [item for _, batch in kept for item in batch]
+        await asyncio.to_thread(
+            candle_store.upsert, symbol, fetched, (first_date, last_date), complete
+        )
+    if failure is not None:
+        raise failure
 
-    if not raw:
-        return []
-
-    raw = raw[:target_count]
-    raw.reverse()
-    today_kst = datetime.now(ZoneInfo("Asia/Seoul")).date()
-    raw = [
-        item
-        for item in raw
-        if datetime.fromisoformat(item["candle_date_time_kst"]).date() != today_kst
-    ]
-    if len(raw) > count:
-        raw = raw[-count:]
-    return [
-        {
-            "timestamp": item["candle_date_time_kst"],
-            "open": item["opening_price"],
-            "high": item["high_price"],
-            "low": item["low_price"],
-            "close": item["trade_price"],
-            "volume": item["candle_acc_trade_volume"],
-        }
-        for item in raw
-    ]
 
+async def _sync_candle_store(symbol: str, count: int, today: date) -> None:
+    first_date, last_date, stored, complete = await asyncio.to_thread(
+        candle_store.bounds, symbol
+    )
+    if not last_date:
+        await _fetch_candle_range(symbol, today, count, None)
+        return
 
-def run_backtest(
-    data: List[dict], k: float, fee: float, slippage: float, use_ma_filter: bool
-) -> List[BacktestResult]:
-    cumulative_return = 1.0
-    results: List[BacktestResult] = []
-    effective_fee = min(1.0, fee + slippage)
-    fee_multiplier = max(0.0, 1 - effective_fee)
-    fee_factor = fee_multiplier * fee_multiplier
-
-    for i in range(5, len(data)):
-        prev = data[i - 1]
-        curr = data[i]
-        ma5 = sum(day["close"] for day in data[i - 5:i]) / 5
-
-        price_range = prev["high"] - prev["low"]
-        target = curr["open"] + price_range * k
-        is_bought = curr["high"] > target
-        if use_ma_filter:
-            is_bought = is_bought and (curr["open"] > ma5)
-
-        ror = (curr["close"] / target) * fee_factor if is_bought else 1
-        cumulative_return *= ror
-
-        results.append(
-            BacktestResult(
-                date=_format_date(curr["timestamp"]),
-                price=curr["close"],
-                target=target,
-                ma5=ma5,
-                isBought=is_bought,
-                ror=(ror - 1) * 100,
-                hpr=cumulative_return,
-            )
+    missing = (today - date.fromisoformat(last_date)).days - 1
+    if missing > 0:
+        await _fetch_candle_range(symbol, today, missing, (first_date, last_date))
+        first_date, last_date, stored, complete = await asyncio.to_thread(
+            candle_store.bounds, symbol
+        )
+    if stored < count and not complete:
+        await _fetch_candle_range(
+            symbol, date.fromisoformat(first_date), count - stored, (first_date, last_date)
         )
-
-    return results
 
 
-def build_trades(results: List[BacktestResult]) -> List[Trade]:
-    trades: List[Trade] = []
-    for result in results:
-        if result.isBought:
-            trades.append(
-                Trade(
-                    date=result.date,
-                    entryPrice=result.target,
-                    exitPrice=result.price,
-                    ror=result.ror,
-                )
-            )
-    return trades
+@asynccontextmanager
+async def _candle_sync_lock(key: str):
+    """같은 키의 저장소 동기화를 한 번에 하나만 돌린다.
 
+    키는 요청에서 온 심볼이므로, 아무도 잡거나 기다리지 않는 락은 바로 지워 없는 심볼로
+    요청을 보내도 dict가 계속 커지지 않게 한다.
+    """
+    lock, users = candle_sync_locks.get(key, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    candle_sync_locks[key] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = candle_sync_locks[key]
+        if users <= 1:
+            del candle_sync_locks[key]
+        else:
+            candle_sync_locks[key] = (lock, users - 1)
 
-def build_trade_summary(trades: List[Trade]) -> TradeSummary:
-    if not trades:
-        return TradeSummary(
-            tradeCount=0,
-            winRate=0.0,
-            avgReturn=0.0,
-            bestReturn=0.0,
-            worstReturn=0.0,
-        )
-    returns = [trade.ror for trade in trades]
-    trade_count = len(trades)
-    wins = sum(1 for value in returns if value > 0)
-    return TradeSummary(
-        tradeCount=trade_count,
-        winRate=(wins / trade_count) * 100,
-        avgReturn=sum(returns) / trade_count,
-        bestReturn=max(returns),
-        worstReturn=min(returns),
-    )
 
+@asynccontextmanager
+async def _candle_file_lock(name: str):
+    """공유 모드에서는 다른 워커가 같은 구간을 받는 중이면 끝날 때까지 기다린다."""
+    if not SHARED_STATE_DIR:
+        yield
+        return
+    # FileLock은 잡은 동안에만 fd를 가지므로 매번 새로 만들고 보관하지 않는다.
+    file_lock = FileLock(os.path.join(SHARED_STATE_DIR, f"{name}.lock"))
+    await asyncio.to_thread(file_lock.acquire)
+    try:
+        yield
+    finally:
+        file_lock.release()
 
-def build_metrics(results: List[BacktestResult], trades: List[Trade]) -> MetricSummary:
-    if not results:
-        return MetricSummary(
-            totalReturn=0.0,
-            winRate=0.0,
-            mdd=0.0,
-            cagr=0.0,
-            tradeCount=0,
-            totalDays=0,
-        )
 
-    final_hpr = results[-1].hpr
-    max_hpr = results[0].hpr
-    max_drawdown = 0.0
-    for result in results:
-        if result.hpr > max_hpr:
-            max_hpr = result.hpr
-        drawdown = (max_hpr - result.hpr) / max_hpr if max_hpr else 0.0
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
+def _cached_window(symbol: str, count: int, today: date) -> Optional[List[dict]]:
+    entry = candle_cache.get(symbol)
+    if not entry or entry.as_of != today:
+        return None
+    if len(entry.candles) < count and not entry.complete:
+        return None
+    return entry.candles[-count:]
 
-    trade_count = len(trades)
-    wins = sum(1 for trade in trades if trade.ror > 0)
-    win_rate = (wins / trade_count) * 100 if trade_count else 0.0
 
-    total_days = len(results)
+async def fetch_ohlcv(symbol: str, count: int) -> List[dict]:
+    # 완료된 일봉은 하루 동안 바뀌지 않으므로 KST 날짜가 같으면 보관 중인 구간을 잘라서 돌려준다.
+    today = _trading_day()
+    window = _cached_window(symbol, count, today)
+    if window is not None:
+        return window
+
+    async with _candle_sync_lock(symbol):
+        window = _cached_window(symbol, count, today)
+        if window is not None:
+            return window
+        async with _candle_file_lock(f"candles-{symbol}"):
+            await _sync_candle_store(symbol, count, today)
+
+        entry = candle_cache.get(symbol)
+        if entry and entry.as_of == today and entry.candles:
+            # 같은 날 더 긴 구간을 요청하면 부족한 과거 구간만 읽어서 앞에 붙인다.
+            missing = count - len(entry.candles)
+            before = _format_date(entry.candles[0]["timestamp"])
+            older = await asyncio.to_thread(candle_store.load, symbol, missing, before)
+            candles = older + entry.candles
+            complete = len(older) < missing
+        else:
+            candles = await asyncio.to_thread(
+                candle_store.load, symbol, count, today.isoformat()
+            )
+            complete = len(candles) < count
+        candle_cache.set(
+            symbol,
+            SymbolCandles(as_of=today, candles=candles, complete=complete),
+            CANDLE_CACHE_TTL,
+            size=_estimate_size(candles),
+        )
+    return candles[-count:]
+
+
+def _minute_pages(unit: int, start: int, end: int) -> List[Tuple[int, int]]:
+    """[start, end) 분봉을 최신 구간부터 200개 단위 (to, count) 페이지로 나눈다."""
+    step = unit * 60
+    pages: List[Tuple[int, int]] = []
+    to = end
+    while to > start:
+        batch_count = min(200, -(-(to - start) // step))
+        pages.append((to, batch_count))
+        to -= batch_count * step
+    return pages
+
+
+async def _fetch_minute_pages(
+    symbol: str, unit: int, pages: List[Tuple[int, int]]
+) -> List[dict]:
+    path = f"/candles/minutes/{unit}"
+    batches = await asyncio.gather(
+        *[
+            _fetch_json(
+                path,
+                {
+                    "market": symbol,
+                    "count": batch_count,
+                    "to": datetime.fromtimestamp(to, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+            )
+            for to, batch_count in pages
+        ],
+        return_exceptions=True,
+    )
+    for batch in batches:
+        if isinstance(batch, BaseException):
+            raise batch
+    return [item for batch in batches for item in batch]
+
+
+async def _sync_minute_store(symbol: str, unit: int, start: int, end: int) -> None:
+    """[start, end) 중 보관 구간 밖의 분봉만 받는다.
+
+    보관 구간이 늘 한 덩어리로 유지되도록 최신 쪽 빈 구간은 오래된 페이지부터, 과거 쪽은
+    최신 페이지부터 INTRADAY_FETCH_BATCH개씩 받아 저장한다. 중간에 실패해도 저장한 만큼은 남는다.
+    """
+    coverage = await asyncio.to_thread(candle_store.minute_coverage, symbol, unit)
+    if coverage is None or start > coverage[1]:
+        # 처음이거나 기존 구간과 이어지지 않으면 새 구간으로 다시 시작한다.
+        coverage = (end, end)
+    covered_start, covered_end = coverage
+    if end > covered_end:
+        pages = _minute_pages(unit, covered_end, end)[::-1]
+        for offset in range(0, len(pages), INTRADAY_FETCH_BATCH):
+            batch = pages[offset : offset + INTRADAY_FETCH_BATCH]
+            candles = await _fetch_minute_pages(symbol, unit, batch)
+            covered_end = batch[-1][0]
+            await asyncio.to_thread(
+                candle_store.upsert_minutes, symbol, unit, candles, (covered_start, covered_end)
+            )
+    if start < covered_start:
+        pages = _minute_pages(unit, start, covered_start)
+        for offset in range(0, len(pages), INTRADAY_FETCH_BATCH):
+            batch = pages[offset : offset + INTRADAY_FETCH_BATCH]
+            candles = await _fetch_minute_pages(symbol, unit, batch)
+            to, batch_count = batch[-1]
+            covered_start = max(start, to - batch_count * unit * 60)
+            await asyncio.to_thread(
+                candle_store.upsert_minutes, symbol, unit, candles, (covered_start, covered_end)
+            )
+
+
+async def sync_minute_candles(symbol: str, unit: int, start: int, end: int) -> None:
+    async with _candle_sync_lock(f"{symbol}:{unit}m"):
+        async with _candle_file_lock(f"minutes-{symbol}-{unit}"):
+            await _sync_minute_store(symbol, unit, start, end)
+
+
+@dataclass
+class OhlcvArrays:
+    dates: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+
+@dataclass
+class BacktestColumns:
+    dates: List[str]
+    price: np.ndarray
+    target: np.ndarray
+    ma5: np.ndarray
+    is_bought: np.ndarray
+    ror: np.ndarray
+    hpr: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_records(self) -> List[dict]:
+        keys = ("date", "price", "target", "ma5", "isBought", "ror", "hpr")
+        return [
+            dict(zip(keys, row))
+            for row in zip(
+                self.dates,
+                self.price.tolist(),
+                self.target.tolist(),
+                self.ma5.tolist(),
+                self.is_bought.tolist(),
+                self.ror.tolist(),
+                self.hpr.tolist(),
+            )
+        ]
+
+    def to_columnar(self, total_rows: Optional[int] = None) -> dict:
+        if self.dates:
+            days = np.array(self.dates, dtype="datetime64[D]")
+            offsets = (days - days[0]).astype(np.int64).tolist()
+        else:
+            offsets = []
+        packed = np.packbits(self.is_bought, bitorder="little").tobytes()
+        return {
+            "startDate": self.dates[0] if self.dates else None,
+            "dateOffsets": offsets,
+            "price": self.price.tolist(),
+            "target": self.target.tolist(),
+            "ma5": self.ma5.tolist(),
+            "isBought": base64.b64encode(packed).decode("ascii"),
+            "ror": self.ror.tolist(),
+            "hpr": self.hpr.tolist(),
+            "totalRows": len(self.dates) if total_rows is None else total_rows,
+        }
+
+    def select(self, indices: np.ndarray) -> "BacktestColumns":
+        return BacktestColumns(
+            dates=[self.dates[index] for index in indices.tolist()],
+            price=self.price[indices],
+            target=self.target[indices],
+            ma5=self.ma5[indices],
+            is_bought=self.is_bought[indices],
+            ror=self.ror[indices],
+            hpr=self.hpr[indices],
+        )
+
+    def to_results(self) -> List[BacktestResult]:
+        return [BacktestResult(**record) for record in self.to_records()]
+
+    def to_trades(self) -> List[Trade]:
+        indices = np.flatnonzero(self.is_bought).tolist()
+        entry = self.target[self.is_bought].tolist()
+        exit_ = self.price[self.is_bought].tolist()
+        ror = self.ror[self.is_bought].tolist()
+        return [
+            Trade(
+                date=self.dates[index],
+                entryPrice=entry[pos],
+                exitPrice=exit_[pos],
+                ror=ror[pos],
+            )
+            for pos, index in enumerate(indices)
+        ]
+
+
+def to_ohlcv_arrays(data: List[dict]) -> OhlcvArrays:
+    size = len(data)
+    return OhlcvArrays(
+        dates=[_format_date(day["timestamp"]) for day in data],
+        open=np.fromiter((day["open"] for day in data), dtype=np.float64, count=size),
+        high=np.fromiter((day["high"] for day in data), dtype=np.float64, count=size),
+        low=np.fromiter((day["low"] for day in data), dtype=np.float64, count=size),
+        close=np.fromiter((day["close"] for day in data), dtype=np.float64, count=size),
+    )
+
+
+def _rolling_ma5(close: np.ndarray) -> np.ndarray:
+    # 기존 루프의 sum() 순서(왼쪽부터 누적)와 동일하게 더해 부동소수 결과를 맞춘다.
+    size = len(close)
+    return (
+        close[0 : size - 5]
+        + close[1 : size - 4]
+        + close[2 : size - 3]
+        + close[3 : size - 2]
+        + close[4 : size - 1]
+    ) / 5
+
+
+def _fee_factor(fee: float, slippage: float) -> float:
+    effective_fee = min(1.0, fee + slippage)
+    fee_multiplier = max(0.0, 1 - effective_fee)
+    return fee_multiplier * fee_multiplier
+
+
+def _backtest_rows(
+    arrays: OhlcvArrays, k: float, fee: float, slippage: float, use_ma_filter: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """앞 5행을 준비 구간으로 써서 6번째 행부터 (ma5, 목표가, 매수 여부, 수익 배수)를 계산한다.
+
+    각 행은 직전 5개 일봉에만 의존하므로 준비 구간만 있으면 뒤에 이어 붙여 계산해도 값이 같다.
+    """
+    fee_factor = _fee_factor(fee, slippage)
+    ma5 = _rolling_ma5(arrays.close)
+    price_range = arrays.high[4:-1] - arrays.low[4:-1]
+    opens = arrays.open[5:]
+    closes = arrays.close[5:]
+    target = opens + price_range * k
+    is_bought = arrays.high[5:] > target
+    if use_ma_filter:
+        is_bought &= opens > ma5
+    ror = np.where(is_bought, (closes / target) * fee_factor, 1.0)
+    return ma5, target, is_bought, ror
+
+
+def compute_backtest(
+    arrays: OhlcvArrays, k: float, fee: float, slippage: float, use_ma_filter: bool
+) -> BacktestColumns:
+    if len(arrays.close) <= 5:
+        empty = np.empty(0, dtype=np.float64)
+        return BacktestColumns(
+            dates=[],
+            price=empty,
+            target=empty,
+            ma5=empty,
+            is_bought=np.empty(0, dtype=bool),
+            ror=empty,
+            hpr=empty,
+        )
+
+    ma5, target, is_bought, ror = _backtest_rows(arrays, k, fee, slippage, use_ma_filter)
+    hpr = np.cumprod(ror)
+
+    return BacktestColumns(
+        dates=arrays.dates[5:],
+        price=arrays.close[5:],
+        target=target,
+        ma5=ma5,
+        is_bought=is_bought,
+        ror=(ror - 1) * 100,
+        hpr=hpr,
+    )
+
+
+def compute_backtest_grid(
+    arrays: OhlcvArrays, ks: np.ndarray, fee: float, slippage: float, use_ma_filter: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """K 값마다 한 행씩 (hpr, ror(%), is_bought) 행렬을 한 번에 계산한다."""
+    if len(arrays.close) <= 5:
+        empty = np.empty((len(ks), 0), dtype=np.float64)
+        return empty, empty, np.empty((len(ks), 0), dtype=bool)
+
+    fee_factor = _fee_factor(fee, slippage)
+    ma5 = _rolling_ma5(arrays.close)
+    price_range = arrays.high[4:-1] - arrays.low[4:-1]
+    opens = arrays.open[5:]
+    closes = arrays.close[5:]
+    target = opens[np.newaxis, :] + price_range[np.newaxis, :] * ks[:, np.newaxis]
+    is_bought = arrays.high[5:][np.newaxis, :] > target
+    if use_ma_filter:
+        is_bought &= (opens > ma5)[np.newaxis, :]
+
+    ror = np.where(is_bought, (closes[np.newaxis, :] / target) * fee_factor, 1.0)
+    hpr = np.cumprod(ror, axis=1)
+    return hpr, (ror - 1) * 100, is_bought
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets로 차트 모양을 유지하는 threshold개 인덱스를 고른다."""
+    size = len(y)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    bucket_size = (size - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def render_results(
+    columns: BacktestColumns, response_format: str, points: Optional[int]
+) -> Union[List[dict], dict]:
+    total_rows = len(columns)
+    if points and points < total_rows:
+        x = np.arange(total_rows, dtype=np.float64)
+        columns = columns.select(_lttb_indices(x, columns.hpr, points))
+    if response_format == "columnar":
+        return columns.to_columnar(total_rows)
+    return columns.to_records()
+
+
+def run_backtest(
+    data: List[dict], k: float, fee: float, slippage: float, use_ma_filter: bool
+) -> List[BacktestResult]:
+    return compute_backtest(to_ohlcv_arrays(data), k, fee, slippage, use_ma_filter).to_results()
+
+
+def build_trades(results: List[BacktestResult]) -> List[Trade]:
+    trades: List[Trade] = []
+    for result in results:
+        if result.isBought:
+            trades.append(
+                Trade(
+                    date=result.date,
+                    entryPrice=result.target,
+                    exitPrice=result.price,
+                    ror=result.ror,
+                )
+            )
+    return trades
+
+
+def build_trade_summary(trades: List[Trade]) -> TradeSummary:
+    if not trades:
+        return TradeSummary(
+            tradeCount=0,
+            winRate=0.0,
+            avgReturn=0.0,
+            bestReturn=0.0,
+            worstReturn=0.0,
+        )
+    returns = [trade.ror for trade in trades]
+    trade_count = len(trades)
+    wins = sum(1 for value in returns if value > 0)
+    return TradeSummary(
+        tradeCount=trade_count,
+        winRate=(wins / trade_count) * 100,
+        avgReturn=sum(returns) / trade_count,
+        bestReturn=max(returns),
+        worstReturn=min(returns),
+    )
+
+
+def _max_drawdown(hpr: np.ndarray) -> float:
+    if hpr.size == 0:
+        return 0.0
+    running_max = np.maximum.accumulate(hpr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(running_max != 0, (running_max - hpr) / running_max, 0.0)
+    return max(0.0, float(drawdown.max()))
+
+
+def _summarize_metrics(hpr: np.ndarray, trade_returns: List[float]) -> MetricSummary:
+    if hpr.size == 0:
+        return MetricSummary(
+            totalReturn=0.0,
+            winRate=0.0,
+            mdd=0.0,
+            cagr=0.0,
+            tradeCount=0,
+            totalDays=0,
+        )
+
+    final_hpr = float(hpr[-1])
+    max_drawdown = _max_drawdown(hpr)
+
+    trade_count = len(trade_returns)
+    wins = sum(1 for value in trade_returns if value > 0)
+    win_rate = (wins / trade_count) * 100 if trade_count else 0.0
+
+    total_days = int(hpr.size)
     years = total_days / 365 if total_days else 0.0
     cagr = (final_hpr ** (1 / years) - 1) * 100 if years > 0 and final_hpr > 0 else 0.0
 
@@ -594,22 +2245,765 @@ def build_metrics(results: List[BacktestResult], trades: List[Trade]) -> MetricS
     )
 
 
+def _summarize_metrics_grid(
+    hpr: np.ndarray, ror: np.ndarray, is_bought: np.ndarray
+) -> List[MetricSummary]:
+    rows, total_days = hpr.shape
+    if total_days == 0:
+        return [_summarize_metrics(hpr[row], []) for row in range(rows)]
+
+    running_max = np.maximum.accumulate(hpr, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(running_max != 0, (running_max - hpr) / running_max, 0.0)
+    max_drawdown = np.maximum(drawdown.max(axis=1), 0.0).tolist()
+    final_hpr = hpr[:, -1].tolist()
+    trade_counts = is_bought.sum(axis=1).tolist()
+    wins = (is_bought & (ror > 0)).sum(axis=1).tolist()
+    years = total_days / 365
+
+    summaries: List[MetricSummary] = []
+    for row in range(rows):
+        trade_count = trade_counts[row]
+        win_rate = (wins[row] / trade_count) * 100 if trade_count else 0.0
+        final = final_hpr[row]
+        cagr = (final ** (1 / years) - 1) * 100 if final > 0 else 0.0
+        summaries.append(
+            MetricSummary(
+                totalReturn=(final - 1) * 100,
+                winRate=win_rate,
+                mdd=max_drawdown[row] * 100,
+                cagr=cagr,
+                tradeCount=trade_count,
+                totalDays=total_days,
+            )
+        )
+    return summaries
+
+
+def build_metrics(results: List[BacktestResult], trades: List[Trade]) -> MetricSummary:
+    hpr = np.fromiter((result.hpr for result in results), dtype=np.float64, count=len(results))
+    return _summarize_metrics(hpr, [trade.ror for trade in trades])
+
+
+def build_metrics_from_columns(columns: BacktestColumns) -> MetricSummary:
+    return _summarize_metrics(columns.hpr, columns.ror[columns.is_bought].tolist())
+
+
+def bootstrap_confidence(columns: BacktestColumns, options: BootstrapOptions) -> MetricConfidence:
+    """일별 수익률을 moving block bootstrap으로 재표본해 지표의 백분위 구간을 구한다.
+
+    블록 단위로 이어 붙여 자기상관을 유지하고, 경로는 BOOTSTRAP_CHUNK_PATHS개씩 행렬로 계산한다.
+    """
+    factors = columns.ror / 100 + 1
+    size = factors.size
+    percentiles = np.asarray(options.percentiles, dtype=np.float64)
+    if size == 0:
+        bands = [
+            PercentileBand(percentile=value, totalReturn=0.0, mdd=0.0, cagr=0.0)
+            for value in options.percentiles
+        ]
+        return MetricConfidence(
+            paths=options.paths, blockSize=options.blockSize, seed=options.seed, bands=bands
+        )
+
+    block = min(options.blockSize, size)
+    blocks_per_path = -(-size // block)
+    offsets = np.arange(block)
+    rng = np.random.default_rng(options.seed)
+    final_hpr = np.empty(options.paths, dtype=np.float64)
+    max_drawdown = np.empty(options.paths, dtype=np.float64)
+    for start in range(0, options.paths, BOOTSTRAP_CHUNK_PATHS):
+        chunk = min(BOOTSTRAP_CHUNK_PATHS, options.paths - start)
+        starts = rng.integers(0, size - block + 1, size=(chunk, blocks_per_path))
+        indices = (starts[:, :, np.newaxis] + offsets).reshape(chunk, -1)[:, :size]
+        hpr = np.cumprod(factors[indices], axis=1)
+        running_max = np.maximum.accumulate(hpr, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(running_max != 0, (running_max - hpr) / running_max, 0.0)
+        final_hpr[start : start + chunk] = hpr[:, -1]
+        max_drawdown[start : start + chunk] = np.maximum(drawdown.max(axis=1), 0.0)
+
+    years = size / 365
+    cagr = np.where(final_hpr > 0, (final_hpr ** (1 / years) - 1) * 100, 0.0)
+    total_return = np.percentile((final_hpr - 1) * 100, percentiles).tolist()
+    mdd = np.percentile(max_drawdown * 100, percentiles).tolist()
+    cagr_bands = np.percentile(cagr, percentiles).tolist()
+    bands = [
+        PercentileBand(
+            percentile=value, totalReturn=total_return[i], mdd=mdd[i], cagr=cagr_bands[i]
+        )
+        for i, value in enumerate(options.percentiles)
+    ]
+    return MetricConfidence(
+        paths=options.paths, blockSize=block, seed=options.seed, bands=bands
+    )
+
+
+@dataclass
+class BacktestOutcome:
+    results: Union[List[dict], dict]
+    trades: List[Trade]
+    trade_summary: TradeSummary
+    metrics: MetricSummary
+    confidence: Optional[MetricConfidence] = None
+
+
+def evaluate_backtest(
+    data: List[dict],
+    k: float,
+    fee: float,
+    slippage: float,
+    use_ma_filter: bool,
+    response_format: str = "rows",
+    points: Optional[int] = None,
+    bootstrap: Optional[BootstrapOptions] = None,
+) -> BacktestOutcome:
+    columns = compute_backtest(to_ohlcv_arrays(data), k, fee, slippage, use_ma_filter)
+    trades = columns.to_trades()
+    return _build_outcome(
+        columns,
+        trades,
+        build_trade_summary(trades),
+        build_metrics_from_columns(columns),
+        response_format,
+        points,
+        bootstrap,
+    )
+
+
+def _build_outcome(
+    columns: BacktestColumns,
+    trades: List[Trade],
+    trade_summary: TradeSummary,
+    metrics: MetricSummary,
+    response_format: str,
+    points: Optional[int],
+    bootstrap: Optional[BootstrapOptions],
+) -> BacktestOutcome:
+    # 다운샘플링은 차트용 결과 행에만 적용하고 거래 내역과 지표는 전체 데이터로 계산한다.
+    return BacktestOutcome(
+        results=render_results(columns, response_format, points),
+        trades=trades,
+        trade_summary=trade_summary,
+        metrics=metrics,
+        confidence=bootstrap_confidence(columns, bootstrap) if bootstrap else None,
+    )
+
+
+class RunningMetrics:
+    """청크 단위로 이어 계산하는 백테스트의 hpr, 최대 낙폭, 거래 통계 누적값.
+
+    hpr은 직전 최종값에서 이어 곱하고 나머지는 새 행만 반영하므로, 일봉에 쓰면 한 번에 계산한
+    build_metrics/build_trade_summary 결과와 비트 단위로 같다. 결과 행은 보관하지 않는다.
+    """
+
+    def __init__(self) -> None:
+        self.hpr = 1.0
+        self.running_max = -np.inf
+        self.max_drawdown = 0.0
+        self.rows = 0
+        self.trade_count = 0
+        self.wins = 0
+        self.ror_sum = 0.0
+        self.best_return = -np.inf
+        self.worst_return = np.inf
+
+    def update(self, ror: np.ndarray, is_bought: np.ndarray) -> np.ndarray:
+        """새 행의 수익 배수를 반영하고 그 행들의 hpr을 돌려준다."""
+        hpr = np.cumprod(np.concatenate(([self.hpr], ror)))[1:]
+        running_max = np.maximum.accumulate(np.concatenate(([self.running_max], hpr)))[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(running_max != 0, (running_max - hpr) / running_max, 0.0)
+        trade_returns = ((ror[is_bought] - 1) * 100).tolist()
+
+        self.hpr = float(hpr[-1])
+        self.running_max = float(running_max[-1])
+        self.max_drawdown = max(self.max_drawdown, float(drawdown.max()))
+        self.rows += len(ror)
+        if trade_returns:
+            self.trade_count += len(trade_returns)
+            self.wins += sum(1 for value in trade_returns if value > 0)
+            # 파이썬 sum과 같은 왼쪽부터의 덧셈 순서를 유지한다.
+            self.ror_sum = sum(trade_returns, self.ror_sum)
+            self.best_return = max(self.best_return, max(trade_returns))
+            self.worst_return = min(self.worst_return, min(trade_returns))
+        return hpr
+
+    def trade_summary(self) -> TradeSummary:
+        if not self.trade_count:
+            return build_trade_summary([])
+        return TradeSummary(
+            tradeCount=self.trade_count,
+            winRate=(self.wins / self.trade_count) * 100,
+            avgReturn=self.ror_sum / self.trade_count,
+            bestReturn=self.best_return,
+            worstReturn=self.worst_return,
+        )
+
+    def metrics(self, total_days: Optional[float] = None) -> MetricSummary:
+        """total_days를 주지 않으면 일봉처럼 행 수를 기간(일)으로 본다."""
+        if not self.rows:
+            return _summarize_metrics(np.empty(0, dtype=np.float64), [])
+        if total_days is None:
+            total_days = self.rows
+        years = total_days / 365
+        cagr = (self.hpr ** (1 / years) - 1) * 100 if years > 0 and self.hpr > 0 else 0.0
+        return MetricSummary(
+            totalReturn=(self.hpr - 1) * 100,
+            winRate=(self.wins / self.trade_count) * 100 if self.trade_count else 0.0,
+            mdd=self.max_drawdown * 100,
+            cagr=cagr,
+            tradeCount=self.trade_count,
+            totalDays=round(total_days),
+        )
+
+
+class ColumnBuffer:
+    """BacktestColumns를 뒤에 이어 쓰는 열 버퍼. 용량이 모자라면 두 배로 늘린다.
+
+    여러 BacktestState가 한 버퍼를 나눠 쓰고 각자 자기 길이까지만 읽는다. 뒤에 이어 쓰는 것은
+    버퍼 끝과 길이가 같은 상태만 할 수 있으므로, 이미 만든 상태가 보는 행은 바뀌지 않는다.
+    """
+
+    _FIELDS = ("days", "price", "target", "ma5", "is_bought", "ror", "hpr")
+
+    def __init__(self, capacity: int) -> None:
+        self.days = np.empty(capacity, dtype="datetime64[D]")
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.target = np.empty(capacity, dtype=np.float64)
+        self.ma5 = np.empty(capacity, dtype=np.float64)
+        self.is_bought = np.empty(capacity, dtype=bool)
+        self.ror = np.empty(capacity, dtype=np.float64)
+        self.hpr = np.empty(capacity, dtype=np.float64)
+        self.length = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return len(self.price)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self._FIELDS)
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, 2 * self.capacity)
+        for name in self._FIELDS:
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[: self.length] = old[: self.length]
+            setattr(self, name, grown)
+
+    def try_append(self, length: int, rows: BacktestColumns) -> bool:
+        """버퍼 끝이 length일 때만 rows를 이어 쓴다. 다른 상태가 먼저 이어 썼으면 False."""
+        with self._lock:
+            if self.length != length:
+                return False
+            end = length + len(rows)
+            if end > self.capacity:
+                self._grow(end)
+            self.days[length:end] = np.array(rows.dates, dtype="datetime64[D]")
+            self.price[length:end] = rows.price
+            self.target[length:end] = rows.target
+            self.ma5[length:end] = rows.ma5
+            self.is_bought[length:end] = rows.is_bought
+            self.ror[length:end] = rows.ror
+            self.hpr[length:end] = rows.hpr
+            self.length = end
+            return True
+
+    def copy_prefix(self, length: int, capacity: int) -> "ColumnBuffer":
+        copied = ColumnBuffer(max(capacity, length))
+        for name in self._FIELDS:
+            getattr(copied, name)[:length] = getattr(self, name)[:length]
+        copied.length = length
+        return copied
+
+    def view(self, length: int) -> BacktestColumns:
+        return BacktestColumns(
+            dates=np.datetime_as_string(self.days[:length]).tolist(),
+            price=self.price[:length],
+            target=self.target[:length],
+            ma5=self.ma5[:length],
+            is_bought=self.is_bought[:length],
+            ror=self.ror[:length],
+            hpr=self.hpr[:length],
+        )
+
+
+@dataclass
+class BacktestState:
+    """startDate 고정 백테스트의 누적 결과와, 새 일봉을 이어 계산하는 데 필요한 요약값.
+
+    hpr은 직전 최종값에서 이어 곱하고, 최대 낙폭·거래 통계는 누적값에 새 행만 반영하므로
+    전체를 다시 계산한 결과와 비트 단위로 같다. 결과 열은 buffer의 앞 length행이다.
+    """
+
+    buffer: ColumnBuffer
+    length: int
+    # 마지막 5개 일봉(MA5와 전일 변동폭 준비 구간)
+    tail: OhlcvArrays
+    running: RunningMetrics
+
+    @property
+    def columns(self) -> BacktestColumns:
+        return self.buffer.view(self.length)
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return self.tail.dates[-1] if self.tail.dates else None
+
+    @property
+    def nbytes(self) -> int:
+        # 버퍼를 나눠 쓰는 상태마다 전체 용량을 센다. 캐시 한도 계산에는 넉넉한 쪽이 낫다.
+        return self.buffer.nbytes
+
+    def trade_summary(self) -> TradeSummary:
+        return self.running.trade_summary()
+
+    def metrics(self) -> MetricSummary:
+        return self.running.metrics()
+
+
+def _slice_arrays(arrays: OhlcvArrays, start: int, end: Optional[int] = None) -> OhlcvArrays:
+    return OhlcvArrays(
+        dates=arrays.dates[start:end],
+        open=arrays.open[start:end],
+        high=arrays.high[start:end],
+        low=arrays.low[start:end],
+        close=arrays.close[start:end],
+    )
+
+
+def _concat_arrays(head: OhlcvArrays, rest: OhlcvArrays) -> OhlcvArrays:
+    return OhlcvArrays(
+        dates=head.dates + rest.dates,
+        open=np.concatenate((head.open, rest.open)),
+        high=np.concatenate((head.high, rest.high)),
+        low=np.concatenate((head.low, rest.low)),
+        close=np.concatenate((head.close, rest.close)),
+    )
+
+
+def extend_backtest_state(
+    state: Optional[BacktestState],
+    arrays: OhlcvArrays,
+    k: float,
+    fee: float,
+    slippage: float,
+    use_ma_filter: bool,
+) -> BacktestState:
+    """state 뒤에 arrays의 일봉을 이어 붙인 새 상태를 만든다. state가 None이면 arrays 앞 5행이 준비 구간이다.
+
+    계산과 복사는 새 행 수에 비례한다(버퍼를 늘릴 때의 복사는 용량을 두 배씩 늘려 행당 상수로
+    나뉜다). 기존 state가 보는 행은 바꾸지 않는다.
+    """
+    if state is not None:
+        arrays = _concat_arrays(state.tail, arrays)
+        buffer, length = state.buffer, state.length
+        running = copy.copy(state.running)
+    else:
+        buffer, length = ColumnBuffer(max(16, len(arrays.close))), 0
+        running = RunningMetrics()
+    if len(arrays.close) <= 5:
+        return BacktestState(buffer=buffer, length=length, tail=arrays, running=running)
+
+    ma5, target, is_bought, ror = _backtest_rows(arrays, k, fee, slippage, use_ma_filter)
+    hpr = running.update(ror, is_bought)
+    new_rows = BacktestColumns(
+        dates=arrays.dates[5:],
+        price=arrays.close[5:],
+        target=target,
+        ma5=ma5,
+        is_bought=is_bought,
+        ror=(ror - 1) * 100,
+        hpr=hpr,
+    )
+    if not buffer.try_append(length, new_rows):
+        # 같은 상태에서 갈라진 다른 확장이 버퍼 끝을 차지했으면 앞부분만 복사해 따로 쓴다.
+        buffer = buffer.copy_prefix(length, 2 * (length + len(new_rows)))
+        buffer.try_append(length, new_rows)
+    return BacktestState(
+        buffer=buffer,
+        length=length + len(new_rows),
+        tail=_slice_arrays(arrays, -5),
+        running=running,
+    )
+
+
+def iter_backtest_chunks(
+    data: List[dict],
+    k: float,
+    fee: float,
+    slippage: float,
+    use_ma_filter: bool,
+    running: RunningMetrics,
+    chunk_rows: int,
+) -> Iterator[BacktestColumns]:
+    """data의 일봉을 chunk_rows행씩 계산해 차례로 내보내고 누적값은 running에 쌓는다.
+
+    청크마다 바로 앞 5개 일봉을 준비 구간으로 다시 읽으므로, 청크를 이어 붙이면
+    compute_backtest 결과와 같다. 한 번에 청크 하나의 배열만 만든다.
+    """
+    for start in range(5, len(data), chunk_rows):
+        arrays = to_ohlcv_arrays(data[start - 5 : start + chunk_rows])
+        ma5, target, is_bought, ror = _backtest_rows(arrays, k, fee, slippage, use_ma_filter)
+        hpr = running.update(ror, is_bought)
+        yield BacktestColumns(
+            dates=arrays.dates[5:],
+            price=arrays.close[5:],
+            target=target,
+            ma5=ma5,
+            is_bought=is_bought,
+            ror=(ror - 1) * 100,
+            hpr=hpr,
+        )
+
+
+class IntradayAccumulator:
+    """분봉 청크를 차례로 받아 결과 행은 버리고 지표와 요약 자산 곡선만 누적한다.
+
+    청크 사이에는 마지막 5개 분봉만 넘기므로 메모리는 기간이 아니라 청크 크기에 비례한다.
+    계산식은 일봉 엔진(_backtest_rows)과 같고 '하루' 대신 분봉 한 개가 한 행이다.
+    """
+
+    def __init__(
+        self,
+        k: float,
+        fee: float,
+        slippage: float,
+        use_ma_filter: bool,
+        start: int,
+        end: int,
+        points: int,
+    ) -> None:
+        self.k = k
+        self.fee = fee
+        self.slippage = slippage
+        self.use_ma_filter = use_ma_filter
+        self.start = start
+        self.end = end
+        self.bucket_seconds = max(1, -(-(end - start) // points))
+        self.tail = np.empty((0, 6), dtype=np.float64)
+        self.running = RunningMetrics()
+        self.chunks = 0
+        self.peak_chunk_bytes = 0
+        # 구간 번호 -> (그 구간 마지막 분봉 시각, hpr)
+        self.equity: Dict[int, Tuple[int, float]] = {}
+
+    def feed(self, chunk: np.ndarray) -> None:
+        data = np.concatenate((self.tail, chunk)) if len(self.tail) else chunk
+        self.tail = data[-5:].copy()
+        self.chunks += 1
+        if len(data) <= 5:
+            return
+        arrays = OhlcvArrays(
+            dates=[], open=data[:, 1], high=data[:, 2], low=data[:, 3], close=data[:, 4]
+        )
+        ma5, target, is_bought, ror = _backtest_rows(
+            arrays, self.k, self.fee, self.slippage, self.use_ma_filter
+        )
+        hpr = self.running.update(ror, is_bought)
+
+        timestamps = data[5:, 0].astype(np.int64)
+        buckets = (timestamps - self.start) // self.bucket_seconds
+        last_rows = np.append(np.flatnonzero(np.diff(buckets)), len(buckets) - 1)
+        for index in last_rows.tolist():
+            self.equity[int(buckets[index])] = (int(timestamps[index]), float(hpr[index]))
+
+        buffers = (ma5, target, is_bought, ror, hpr, timestamps, buckets)
+        # update 안의 누적 최댓값·낙폭 배열은 hpr과 같은 크기다.
+        chunk_bytes = chunk.nbytes + data.nbytes + 2 * hpr.nbytes
+        chunk_bytes += sum(array.nbytes for array in buffers)
+        self.peak_chunk_bytes = max(self.peak_chunk_bytes, chunk_bytes)
+
+    def metrics(self) -> MetricSummary:
+        # 행 수가 아니라 달력 기간으로 연환산한다.
+        return self.running.metrics((self.end - self.start) / 86400)
+
+    def equity_points(self) -> List[EquityPoint]:
+        return [
+            EquityPoint(
+                date=datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+                hpr=hpr,
+            )
+            for _, (timestamp, hpr) in sorted(self.equity.items())
+        ]
+
+
+def _max_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, macOS는 바이트 단위다.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_intraday_backtest(
+    payload: IntradayBacktestRequest, start: int, end: int
+) -> IntradayBacktestResponse:
+    """저장소의 분봉을 청크 단위로 읽어 누적기에 흘려보낸다. 스레드에서 실행한다."""
+    started = time.perf_counter()
+    accumulator = IntradayAccumulator(
+        payload.k,
+        payload.fee,
+        payload.slippage,
+        payload.useMaFilter,
+        start,
+        end,
+        payload.points,
+    )
+    accumulator.tail = candle_store.minute_warmup(payload.symbol, payload.unit, start, 5)
+    for chunk in candle_store.iter_minutes(
+        payload.symbol, payload.unit, start, end, INTRADAY_CHUNK_ROWS
+    ):
+        accumulator.feed(chunk)
+    elapsed = time.perf_counter() - started
+    return IntradayBacktestResponse(
+        unit=payload.unit,
+        metrics=accumulator.metrics(),
+        tradeSummary=accumulator.running.trade_summary(),
+        equity=accumulator.equity_points(),
+        performance=IntradayPerformance(
+            rows=accumulator.running.rows,
+            chunks=accumulator.chunks,
+            elapsedMs=elapsed * 1000,
+            rowsPerSec=accumulator.running.rows / elapsed if elapsed > 0 else 0.0,
+            peakChunkBytes=accumulator.peak_chunk_bytes,
+            maxRssBytes=_max_rss_bytes(),
+        ),
+    )
+
+
+def _sweep_k_values(k_min: float, k_max: float, k_step: float) -> np.ndarray:
+    steps = int(np.floor((k_max - k_min) / k_step + 1e-9)) + 1
+    return np.round(k_min + k_step * np.arange(steps), 10)
+
+
+def evaluate_sweep(
+    data: List[dict], ks: np.ndarray, fee: float, slippage: float
+) -> List[SweepResult]:
+    arrays = to_ohlcv_arrays(data)
+    results: List[SweepResult] = []
+    for use_ma_filter in (False, True):
+        grid = compute_backtest_grid(arrays, ks, fee, slippage, use_ma_filter)
+        for k, metrics in zip(ks.tolist(), _summarize_metrics_grid(*grid)):
+            results.append(SweepResult(k=k, useMaFilter=use_ma_filter, metrics=metrics))
+    return results
+
+
+def _walkforward_windows(size: int, in_days: int, out_days: int) -> List[Tuple[int, int, int]]:
+    """(인샘플 시작, 아웃오브샘플 시작, 아웃오브샘플 끝) 행 인덱스. 앞 5행은 MA5 준비 구간이다."""
+    windows: List[Tuple[int, int, int]] = []
+    start = 5
+    while start + in_days < size:
+        split = start + in_days
+        windows.append((start, split, min(split + out_days, size)))
+        start += out_days
+    return windows
+
+
+def _shared_window_arrays(matrix: np.ndarray, start: int, end: int) -> OhlcvArrays:
+    return OhlcvArrays(
+        dates=[],
+        open=matrix[0, start:end].copy(),
+        high=matrix[1, start:end].copy(),
+        low=matrix[2, start:end].copy(),
+        close=matrix[3, start:end].copy(),
+    )
+
+
+def _evaluate_walkforward_window(
+    shm_name: str,
+    shape: Tuple[int, int],
+    start: int,
+    split: int,
+    end: int,
+    ks: np.ndarray,
+    fee: float,
+    slippage: float,
+    ma_options: Tuple[bool, ...],
+) -> dict:
+    """프로세스 풀 워커: 공유 메모리의 OHLC 행렬에서 한 구간을 최적화하고 검증한다."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        in_arrays = _shared_window_arrays(matrix, start - 5, split)
+        out_arrays = _shared_window_arrays(matrix, split - 5, end)
+    finally:
+        shm.close()
+
+    best: Optional[Tuple[float, bool, MetricSummary]] = None
+    for use_ma_filter in ma_options:
+        grid = compute_backtest_grid(in_arrays, ks, fee, slippage, use_ma_filter)
+        for k, metrics in zip(ks.tolist(), _summarize_metrics_grid(*grid)):
+            if best is None or metrics.totalReturn > best[2].totalReturn:
+                best = (k, use_ma_filter, metrics)
+
+    k, use_ma_filter, in_metrics = best
+    hpr, ror, is_bought = compute_backtest_grid(
+        out_arrays, np.array([k]), fee, slippage, use_ma_filter
+    )
+    out_metrics = _summarize_metrics_grid(hpr, ror, is_bought)[0]
+    return {
+        "k": k,
+        "useMaFilter": use_ma_filter,
+        "inSampleMetrics": in_metrics.model_dump(),
+        "outSampleMetrics": out_metrics.model_dump(),
+        "hpr": hpr[0].tolist(),
+        "tradeReturns": ror[0][is_bought[0]].tolist(),
+    }
+
+
+def _walkforward_pool_size() -> int:
+    if WALKFORWARD_WORKERS:
+        return WALKFORWARD_WORKERS
+    return max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global process_pool
+    if process_pool is None:
+        # uvicorn 이벤트 루프와 스레드를 복제하지 않도록 spawn으로 워커를 띄운다.
+        process_pool = ProcessPoolExecutor(
+            max_workers=_walkforward_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return process_pool
+
+
+async def run_walkforward(
+    data: List[dict], payload: WalkForwardRequest, ks: np.ndarray, ma_options: Tuple[bool, ...]
+) -> dict:
+    arrays = to_ohlcv_arrays(data)
+    windows = _walkforward_windows(len(arrays.close), payload.inSampleDays, payload.outSampleDays)
+    matrix = np.stack([arrays.open, arrays.high, arrays.low, arrays.close])
+
+    # OHLC 행렬을 공유 메모리에 한 번만 올리고 워커에는 이름과 구간 인덱스만 넘긴다.
+    shm = shared_memory.SharedMemory(create=True, size=matrix.nbytes)
+    try:
+        np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        outcomes = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    pool,
+                    _evaluate_walkforward_window,
+                    shm.name,
+                    matrix.shape,
+                    start,
+                    split,
+                    end,
+                    ks,
+                    payload.fee,
+                    payload.slippage,
+                    ma_options,
+                )
+                for start, split, end in windows
+            ]
+        )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    window_rows: List[dict] = []
+    equity: List[dict] = []
+    trade_returns: List[float] = []
+    stitched: List[np.ndarray] = []
+    base = 1.0
+    for (start, split, end), outcome in zip(windows, outcomes):
+        window_rows.append(
+            {
+                "inSampleStart": arrays.dates[start],
+                "inSampleEnd": arrays.dates[split - 1],
+                "outSampleStart": arrays.dates[split],
+                "outSampleEnd": arrays.dates[end - 1],
+                "k": outcome["k"],
+                "useMaFilter": outcome["useMaFilter"],
+                "inSampleMetrics": outcome["inSampleMetrics"],
+                "outSampleMetrics": outcome["outSampleMetrics"],
+            }
+        )
+        curve = base * np.asarray(outcome["hpr"])
+        stitched.append(curve)
+        equity.extend(
+            {"date": day, "hpr": value}
+            for day, value in zip(arrays.dates[split:end], curve.tolist())
+        )
+        trade_returns.extend(outcome["tradeReturns"])
+        if curve.size:
+            base = float(curve[-1])
+
+    hpr = np.concatenate(stitched) if stitched else np.empty(0, dtype=np.float64)
+    return {
+        "windows": window_rows,
+        "equity": equity,
+        "metrics": _summarize_metrics(hpr, trade_returns),
+    }
+
+
+def evaluate_portfolio(
+    datasets: Dict[str, List[dict]],
+    weights: Dict[str, float],
+    k: float,
+    fee: float,
+    slippage: float,
+    use_ma_filter: bool,
+) -> dict:
+    """심볼별 결과를 날짜 합집합에 정렬하고 매일 목표 비중으로 재조정한 합산 곡선을 계산한다."""
+    columns = {
+        symbol: compute_backtest(to_ohlcv_arrays(data), k, fee, slippage, use_ma_filter)
+        for symbol, data in datasets.items()
+    }
+    dates = sorted({day for column in columns.values() for day in column.dates})
+    positions = {day: index for index, day in enumerate(dates)}
+    symbols = list(columns)
+
+    # 해당 날짜에 데이터가 없는 심볼의 비중은 현금(수익률 1)으로 둔다.
+    factors = np.ones((len(symbols), len(dates)), dtype=np.float64)
+    for row, symbol in enumerate(symbols):
+        column = columns[symbol]
+        index = np.fromiter(
+            (positions[day] for day in column.dates), dtype=np.int64, count=len(column)
+        )
+        factors[row, index] = column.ror / 100 + 1
+    weight_vector = np.array([weights[symbol] for symbol in symbols], dtype=np.float64)
+    hpr = np.cumprod(weight_vector @ factors)
+
+    trade_returns: List[float] = []
+    symbol_rows: List[dict] = []
+    for symbol in symbols:
+        column = columns[symbol]
+        trade_returns.extend(column.ror[column.is_bought].tolist())
+        symbol_rows.append(
+            {
+                "symbol": symbol,
+                "weight": weights[symbol],
+                "metrics": build_metrics_from_columns(column),
+            }
+        )
+    return {
+        "symbols": symbol_rows,
+        "equity": [{"date": day, "hpr": value} for day, value in zip(dates, hpr.tolist())],
+        "metrics": _summarize_metrics(hpr, trade_returns),
+    }
+
+
 async def fetch_ticker(symbol: str, k: float) -> Optional[MarketTicker]:
+    live = signal_engine.ticker(symbol, k)
+    if live:
+        return live
+
     ticker_data = await _fetch_json("/ticker", {"markets": symbol})
     if not ticker_data:
         return None
     ticker = ticker_data[0]
 
-    candle_data = await fetch_ohlcv(symbol, 6)
-    if len(candle_data) < 6:
+    indicators = await get_daily_indicators(symbol)
+    if not indicators:
         return None
-
-    ma_source = candle_data[-5:]
-    ma5 = sum(item["close"] for item in ma_source) / len(ma_source)
-
-    prev_day = candle_data[-1]
-    price_range = prev_day["high"] - prev_day["low"]
-    target = ticker["opening_price"] + price_range * k
+    target = ticker["opening_price"] + indicators.prev_range * k
 
     return MarketTicker(
         symbol=ticker["market"],
@@ -618,11 +3012,116 @@ async def fetch_ticker(symbol: str, k: float) -> Optional[MarketTicker]:
         highPrice=ticker["high_price"],
         lowPrice=ticker["low_price"],
         targetPrice=target,
-        ma5=ma5,
+        ma5=indicators.ma5,
         changeRate=ticker["signed_change_rate"],
     )
 
 
+@dataclass
+class DailyIndicators:
+    trading_day: date
+    prev_open: float
+    prev_high: float
+    prev_low: float
+    prev_close: float
+    prev_volume: float
+    prev_range: float
+    ma5: float
+    ma20: Optional[float]
+    computed_at: float
+    stale: bool = False
+
+
+# 오늘 목표가 계산(티커 조회, 시그널 엔진)에 쓰는 심볼별 전일 지표.
+# 백테스트는 전 구간의 일별 MA5·전일 범위가 필요하므로 이 표를 읽지 않고 일봉 배열에서 벡터로 계산한다.
+daily_indicators: Dict[str, DailyIndicators] = {}
+
+
+async def _compute_daily_indicators(symbol: str) -> Optional[DailyIndicators]:
+    trading_day = _trading_day()
+    candles = await fetch_ohlcv(symbol, 20)
+    if len(candles) < 5:
+        return None
+    ma_source = candles[-5:]
+    prev_day = candles[-1]
+    indicators = DailyIndicators(
+        trading_day=trading_day,
+        prev_open=prev_day["open"],
+        prev_high=prev_day["high"],
+        prev_low=prev_day["low"],
+        prev_close=prev_day["close"],
+        prev_volume=prev_day["volume"],
+        prev_range=prev_day["high"] - prev_day["low"],
+        ma5=sum(item["close"] for item in ma_source) / len(ma_source),
+        ma20=sum(item["close"] for item in candles) / len(candles) if len(candles) >= 20 else None,
+        computed_at=time.time(),
+    )
+    daily_indicators[symbol] = indicators
+    return indicators
+
+
+async def get_daily_indicators(symbol: str) -> Optional[DailyIndicators]:
+    """현재 거래일의 지표를 돌려준다. 롤오버 때 미리 계산되지 않았으면 지금 계산한다."""
+    indicators = daily_indicators.get(symbol)
+    if indicators and indicators.trading_day == _trading_day():
+        return indicators
+    try:
+        return await _compute_daily_indicators(symbol)
+    except ApiException:
+        if indicators:
+            indicators.stale = True
+        raise
+
+
+async def refresh_daily_indicators(markets: List[str]) -> List[str]:
+    """모든 마켓 지표를 다시 계산하고, 재시도 후에도 실패한 마켓 목록을 돌려준다."""
+    pending = list(markets)
+    for attempt in range(ROLLOVER_RETRIES):
+        results = await asyncio.gather(
+            *[_compute_daily_indicators(symbol) for symbol in pending], return_exceptions=True
+        )
+        pending = [
+            symbol
+            for symbol, result in zip(pending, results)
+            if isinstance(result, BaseException) or result is None
+        ]
+        if not pending:
+            return []
+        logger.warning(
+            "Daily indicator refresh failed markets=%s attempt=%s", ",".join(pending), attempt + 1
+        )
+        await asyncio.sleep(ROLLOVER_RETRY_BASE * (2 ** attempt))
+
+    # 이전 거래일 값은 남겨 두되 stale로 표시해 소비자가 구분할 수 있게 한다.
+    for symbol in pending:
+        if symbol in daily_indicators:
+            daily_indicators[symbol].stale = True
+    return pending
+
+
+def _seconds_until_rollover() -> float:
+    now = datetime.now(timezone.utc)
+    next_rollover = datetime.combine(
+        now.date() + timedelta(days=1), datetime.min.time(), timezone.utc
+    )
+    return (next_rollover - now).total_seconds() + ROLLOVER_DELAY
+
+
+async def run_daily_rollover(markets: List[str]) -> None:
+    await refresh_daily_indicators(markets)
+    while True:
+        await asyncio.sleep(_seconds_until_rollover())
+        started = time.perf_counter()
+        failed = await refresh_daily_indicators(markets)
+        logger.info(
+            "Daily rollover trading_day=%s markets=%s failed=%s duration_ms=%.1f",
+            _trading_day().isoformat(),
+            len(markets),
+            ",".join(failed) or "-",
+            (time.perf_counter() - started) * 1000,
+        )
+
+
 def _extract_ws_ticker(payload: dict) -> Optional[dict]:
     symbol = payload.get("code") or payload.get("market")
     current_price = payload.get("trade_price") or payload.get("tp")
@@ -637,7 +3136,163 @@ def _extract_ws_ticker(payload: dict) -> Optional[dict]:
     }
 
 
-async def run_upbit_ws(markets: List[str]) -> None:
+def _ws_field(payload: dict, name: str, short: str) -> Optional[float]:
+    value = payload.get(name)
+    if value is None:
+        value = payload.get(short)
+    return float(value) if value is not None else None
+
+
+@dataclass
+class SignalState:
+    trading_day: date
+    prev_high: float
+    prev_low: float
+    ma5: float
+    opening_price: float = 0.0
+    high_price: float = 0.0
+    low_price: float = 0.0
+    current_price: float = 0.0
+    change_rate: float = 0.0
+    last_tick: float = 0.0
+    triggered: bool = False
+
+
+class SignalEngine:
+    """스트리밍 틱으로 종목별 목표가/돌파 상태를 갱신하는 인메모리 엔진.
+
+    전일 고저와 MA5는 거래일마다 한 번 daily_indicators에서 채우고, 이후에는 틱마다 O(1)로 갱신한다.
+    """
+
+    def __init__(self, k: float) -> None:
+        self.k = k
+        self._states: Dict[str, SignalState] = {}
+        self._seeding: Set[str] = set()
+        # 심볼별 (마지막 실패 시각, 연속 실패 횟수)
+        self._seed_failures: Dict[str, Tuple[float, int]] = {}
+
+    def _seed_due(self, symbol: str) -> bool:
+        failure = self._seed_failures.get(symbol)
+        if failure is None:
+            return True
+        failed_at, count = failure
+        delay = min(SIGNAL_SEED_RETRY_MAX, SIGNAL_SEED_RETRY_BASE * (2 ** (count - 1)))
+        return time.time() - failed_at >= delay
+
+    def _record_seed_failure(self, symbol: str) -> None:
+        _, count = self._seed_failures.get(symbol, (0.0, 0))
+        self._seed_failures[symbol] = (time.time(), count + 1)
+
+    async def seed(self, symbol: str) -> None:
+        try:
+            indicators = await get_daily_indicators(symbol)
+            if not indicators:
+                self._record_seed_failure(symbol)
+                return
+            state = SignalState(
+                trading_day=indicators.trading_day,
+                prev_high=indicators.prev_high,
+                prev_low=indicators.prev_low,
+                ma5=indicators.ma5,
+            )
+            previous = self._states.get(symbol)
+            if previous and previous.trading_day == indicators.trading_day:
+                state.triggered = previous.triggered
+            self._states[symbol] = state
+            self._seed_failures.pop(symbol, None)
+        except Exception as exc:
+            self._record_seed_failure(symbol)
+            logger.warning("Signal seed failed symbol=%s error=%s", symbol, exc)
+        finally:
+            self._seeding.discard(symbol)
+
+    def on_tick(self, payload: dict) -> Optional[dict]:
+        symbol = payload.get("code") or payload.get("market")
+        current_price = _ws_field(payload, "trade_price", "tp")
+        opening_price = _ws_field(payload, "opening_price", "op")
+        if not symbol or current_price is None or opening_price is None:
+            return None
+
+        state = self._states.get(symbol)
+        if not state or state.trading_day != _trading_day():
+            # 거래일이 바뀌면 전일 지표를 다시 채울 때까지 돌파 판정을 멈춘다.
+            if symbol not in self._seeding and self._seed_due(symbol):
+                self._seeding.add(symbol)
+                asyncio.create_task(self.seed(symbol))
+            if not state:
+                return None
+            state.triggered = False
+            state.last_tick = 0.0
+            return None
+
+        state.opening_price = opening_price
+        state.current_price = current_price
+        # 고가·저가 필드가 빠진 틱은 지금까지의 최댓값·최솟값을 이어 간다.
+        high_price = _ws_field(payload, "high_price", "hp")
+        low_price = _ws_field(payload, "low_price", "lp")
+        first_tick = state.last_tick == 0.0
+        if high_price is None:
+            high_price = current_price if first_tick else max(state.high_price, current_price)
+        if low_price is None:
+            low_price = current_price if first_tick else min(state.low_price, current_price)
+        state.high_price = high_price
+        state.low_price = low_price
+        state.change_rate = _ws_field(payload, "signed_change_rate", "scr") or 0.0
+        state.last_tick = time.time()
+
+        target = opening_price + (state.prev_high - state.prev_low) * self.k
+        if state.triggered or state.high_price <= target:
+            return None
+        state.triggered = True
+        return {
+            "type": "breakout",
+            "symbol": symbol,
+            "k": self.k,
+            "targetPrice": target,
+            "currentPrice": current_price,
+            "openingPrice": opening_price,
+            "ma5": state.ma5,
+            "maFilterPassed": opening_price > state.ma5,
+            "timestamp": payload.get("timestamp") or payload.get("tms"),
+        }
+
+    def ticker(self, symbol: str, k: float) -> Optional[MarketTicker]:
+        state = self._states.get(symbol)
+        if not state or state.trading_day != _trading_day():
+            return None
+        if time.time() - state.last_tick > SIGNAL_MAX_TICK_AGE:
+            return None
+        return MarketTicker(
+            symbol=symbol,
+            currentPrice=state.current_price,
+            openingPrice=state.opening_price,
+            highPrice=state.high_price,
+            lowPrice=state.low_price,
+            targetPrice=state.opening_price + (state.prev_high - state.prev_low) * k,
+            ma5=state.ma5,
+            changeRate=state.change_rate,
+        )
+
+
+signal_engine = SignalEngine(SIGNAL_K)
+
+
+async def handle_upbit_message(message: Union[str, bytes]) -> None:
+    ws_messages.inc()
+    ws_message_rate.mark()
+    payload = _json_loads(message)
+    update = _extract_ws_ticker(payload)
+    if not update:
+        return
+    event = signal_engine.on_tick(payload)
+    async with live_lock:
+        live_tickers[update["symbol"]] = update
+    await broadcaster.broadcast(update)
+    if event:
+        await broadcaster.broadcast(event)
+
+
+async def run_upbit_ws(markets: List[str], relay: Optional["TickRelay"] = None) -> None:
     try:
         import websockets
     except ImportError:
@@ -656,38 +3311,131 @@ async def run_upbit_ws(markets: List[str]) -> None:
                 backoff = 1.0
 
                 async for message in websocket:
-                    if isinstance(message, bytes):
-                        message = message.decode("utf-8")
-                    payload = json.loads(message)
-                    update = _extract_ws_ticker(payload)
-                    if not update:
-                        continue
-                    async with live_lock:
-                        live_tickers[update["symbol"]] = update
-                    await broadcaster.broadcast(update)
+                    if relay:
+                        relay.publish(message)
+                    await handle_upbit_message(message)
         except Exception as exc:
             logger.warning("Upbit WS error: %s", exc)
             await asyncio.sleep(backoff)
             backoff = min(backoff * 2, 30.0)
 
 
+class TickRelay:
+    """인제스트 리더가 받은 Upbit 원본 메시지를 같은 노드의 다른 워커에 Unix 소켓으로 중계한다.
+
+    프레임은 4바이트 길이 + 메시지 본문이다. 송신 버퍼가 RELAY_MAX_BUFFER를 넘은 워커는 끊고,
+    끊긴 워커는 다시 접속한다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.dropped_followers = 0
+
+    @property
+    def follower_count(self) -> int:
+        return len(self._writers)
+
+    async def start(self) -> None:
+        # 죽은 리더가 남긴 소켓 파일은 락을 넘겨받은 새 리더가 정리한다.
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._accept, path=self.path)
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            await reader.read()
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def publish(self, message: Union[str, bytes]) -> None:
+        if isinstance(message, str):
+            message = message.encode("utf-8")
+        frame = len(message).to_bytes(4, "big") + message
+        for writer in list(self._writers):
+            if writer.transport.get_write_buffer_size() > RELAY_MAX_BUFFER:
+                self.dropped_followers += 1
+                self._writers.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+
+
+async def follow_tick_relay(path: str) -> None:
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        while True:
+            header = await reader.readexactly(4)
+            frame = await reader.readexactly(int.from_bytes(header, "big"))
+            # 프레임 하나가 잘못되어도 중계 수신은 계속한다.
+            try:
+                await handle_upbit_message(frame)
+            except Exception as exc:
+                logger.warning("Dropped malformed relayed tick: %s", exc)
+    finally:
+        writer.close()
+
+
+async def run_ingest_coordinator(markets: List[str]) -> None:
+    """공유 모드에서 락을 잡은 워커 하나만 Upbit WS에 붙고, 나머지는 리더의 중계를 받는다.
+
+    리더 프로세스가 죽으면 OS가 락을 풀고 중계가 끊기므로 팔로워 중 하나가 다음 시도에서 리더가 된다.
+    거래일 롤오버도 리더가 맡아 Upbit 일봉을 한 번만 동기화하고, 팔로워는 get_daily_indicators가
+    필요할 때 공유 캔들 저장소에서 지표를 계산한다.
+    """
+    global ingest_role, ingest_lock, tick_relay
+    lock = FileLock(os.path.join(SHARED_STATE_DIR, "ingest.lock"))
+    relay_path = os.path.join(SHARED_STATE_DIR, "ticks.sock")
+    while True:
+        if lock.acquire(blocking=False):
+            ingest_lock = lock
+            ingest_role = "leader"
+            logger.info("Upbit ingest leader elected pid=%s", os.getpid())
+            rollover = asyncio.create_task(run_daily_rollover(markets))
+            try:
+                tick_relay = TickRelay(relay_path)
+                await tick_relay.start()
+                await run_upbit_ws(markets, tick_relay)
+                return
+            except Exception:
+                # 중계를 열지 못하면 락을 내려놓아 다른 워커가 리더를 맡을 수 있게 한다.
+                logger.exception("Upbit ingest leader failed, releasing leadership")
+                rollover.cancel()
+                if tick_relay is not None:
+                    await tick_relay.close()
+                    tick_relay = None
+                ingest_lock = None
+                lock.release()
+        else:
+            ingest_role = "follower"
+            try:
+                await follow_tick_relay(relay_path)
+            except (OSError, asyncio.IncompleteReadError) as exc:
+                logger.info("Tick relay unavailable, retrying: %s", exc)
+            except Exception:
+                logger.exception("Tick relay follower failed, retrying")
+        await asyncio.sleep(LEADER_RETRY_INTERVAL)
+
+
 async def _get_ai_cache(cache_key: str) -> Optional[AiReportResponse]:
-    async with ai_cache_lock:
-        entry = ai_cache.get(cache_key)
-        if not entry:
-            return None
-        if entry.expires_at < time.time():
-            ai_cache.pop(cache_key, None)
-            return None
-        return AiReportResponse(**entry.data)
+    data = ai_cache.get(cache_key)
+    if data is None:
+        return None
+    return AiReportResponse(**data)
 
 
 async def _set_ai_cache(cache_key: str, response: AiReportResponse) -> None:
-    async with ai_cache_lock:
-        ai_cache[cache_key] = CacheEntry(
-            expires_at=time.time() + CACHE_TTL_AI,
-            data=response.model_dump(),
-        )
+    ai_cache.set(cache_key, response.model_dump(), CACHE_TTL_AI)
 
 
 def _build_ai_prompt(payload: AiReportRequest) -> str:
@@ -780,41 +3528,593 @@ async def generate_ai_report(payload: AiReportRequest) -> AiReportResponse:
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "ingest": {
+            "role": ingest_role,
+            "pid": os.getpid(),
+            "followers": tick_relay.follower_count if tick_relay else 0,
+        },
+        "upstream": {
+            "calls": fetch_stats.upstream_calls,
+            "coalesced": fetch_stats.coalesced_calls,
+            "inflight": len(inflight_requests),
+        },
+        "caches": {
+            "upbit": cache.snapshot(),
+            "ai": ai_cache.snapshot(),
+            "candles": candle_cache.snapshot(),
+            "rateLimits": rate_limits.snapshot(),
+            "backtestStates": backtest_states.snapshot(),
+            "responses": response_cache.snapshot(),
+        },
+    }
+
+
+def _gauge(
+    name: str, help_text: str, samples: List[Tuple[Tuple[str, ...], Tuple[str, ...], float]]
+) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for label_names, labels, value in samples:
+        lines.append(f"{name}{_format_labels(label_names, labels)} {value}")
+    return lines
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    lines += upstream_latency.render()
+    lines += backtest_phase_latency.render()
+    lines += rate_limited_requests.render()
+    lines += ws_messages.render()
+
+    caches = (
+        ("upbit", cache),
+        ("ai", ai_cache),
+        ("candles", candle_cache),
+        ("rate_limits", rate_limits),
+        ("backtest_states", backtest_states),
+        ("responses", response_cache),
+    )
+    for field_name, kind, help_text in (
+        ("hits", "counter", "Cache hits."),
+        ("misses", "counter", "Cache misses."),
+        ("evictions", "counter", "Entries evicted by the LRU bounds."),
+        ("expirations", "counter", "Entries dropped after their TTL."),
+    ):
+        name = f"cache_{field_name}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [
+            f'{name}{{cache="{label}"}} {getattr(store.stats, field_name)}'
+            for label, store in caches
+        ]
+    lines += _gauge(
+        "cache_entries",
+        "Entries held per cache.",
+        [(("cache",), (label,), len(store)) for label, store in caches],
+    )
+    lines += _gauge(
+        "cache_bytes",
+        "Estimated bytes held per cache.",
+        [(("cache",), (label,), store.total_bytes) for label, store in caches],
+    )
+
+    now = time.time()
+    lines += _gauge(
+        "upbit_circuit_open",
+        "1 while the circuit breaker for a path is open.",
+        [
+            (("path",), (path,), 1 if state.opened_until > now else 0)
+            for path, state in circuit_states.items()
+        ],
+    )
+    lines += _gauge(
+        "upbit_circuit_failures",
+        "Consecutive failures counted by the circuit breaker.",
+        [(("path",), (path,), state.failure_count) for path, state in circuit_states.items()],
+    )
+    lines += _gauge(
+        "upbit_requests_inflight",
+        "Distinct Upbit requests in flight.",
+        [((), (), len(inflight_requests))],
+    )
+    lines += [
+        "# HELP upbit_requests_total Upbit fetches by outcome (upstream or coalesced).",
+        "# TYPE upbit_requests_total counter",
+        f'upbit_requests_total{{kind="upstream"}} {fetch_stats.upstream_calls}',
+        f'upbit_requests_total{{kind="coalesced"}} {fetch_stats.coalesced_calls}',
+    ]
+
+    lines += _gauge(
+        "ingest_leader",
+        "1 if this worker holds the Upbit WebSocket ingest.",
+        [(("pid",), (str(os.getpid()),), 1 if ingest_role != "follower" else 0)],
+    )
+    lines += _gauge(
+        "tick_relay_followers",
+        "Workers receiving the relayed Upbit stream from this leader.",
+        [((), (), tick_relay.follower_count if tick_relay else 0)],
+    )
+    lines += _gauge(
+        "ws_connections", "Open /ws/ticker connections.", [((), (), broadcaster.connection_count)]
+    )
+    lines += _gauge(
+        "ws_queue_depth",
+        "Messages waiting in per-client send queues.",
+        [((), (), broadcaster.queue_depth())],
+    )
+    lines += [
+        "# HELP ws_dropped_messages_total Messages dropped for slow clients.",
+        "# TYPE ws_dropped_messages_total counter",
+        f"ws_dropped_messages_total {broadcaster.dropped_messages}",
+        "# HELP ws_slow_disconnects_total Clients disconnected for falling behind.",
+        "# TYPE ws_slow_disconnects_total counter",
+        f"ws_slow_disconnects_total {broadcaster.slow_disconnects}",
+    ]
+    lines += _gauge(
+        "upbit_ws_messages_per_second",
+        f"Upbit WebSocket messages per second over the last {ws_message_rate.window}s.",
+        [((), (), ws_message_rate.rate())],
+    )
+    return "\n".join(lines) + "\n"
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/indicators")
+async def indicators():
+    trading_day = _trading_day()
+    return {
+        "tradingDay": trading_day.isoformat(),
+        "markets": {
+            symbol: {
+                "tradingDay": item.trading_day.isoformat(),
+                "prevOpen": item.prev_open,
+                "prevHigh": item.prev_high,
+                "prevLow": item.prev_low,
+                "prevClose": item.prev_close,
+                "prevVolume": item.prev_volume,
+                "prevRange": item.prev_range,
+                "ma5": item.ma5,
+                "ma20": item.ma20,
+                "computedAt": item.computed_at,
+                "stale": item.stale or item.trading_day != trading_day,
+            }
+            for symbol, item in daily_indicators.items()
+        },
+    }
+
+
+def _start_date_span(start: date) -> int:
+    span = (_trading_day() - start).days
+    if span < 10 or span > 2000:
+        raise HTTPException(
+            status_code=400, detail="startDate must be 10 to 2000 days before today"
+        )
+    return span
+
+
+async def evaluate_backtest_since(
+    payload: BacktestRequest,
+    data: List[dict],
+    response_format: str,
+    points: Optional[int],
+) -> BacktestOutcome:
+    """startDate부터의 백테스트를 파라미터별 누적 상태에 새 일봉만 이어 붙여 계산한다."""
+    key = "|".join(
+        str(part)
+        for part in (
+            payload.symbol,
+            payload.k,
+            payload.fee,
+            payload.slippage,
+            payload.useMaFilter,
+            payload.startDate,
+        )
+    )
+    state: Optional[BacktestState] = backtest_states.get(key)
+    fresh: List[dict] = []
+    if state is not None:
+        last_date = state.last_date
+        # 끝에서부터 이미 반영된 날짜를 만날 때까지만 훑어 새 일봉 수에 비례하게 처리한다.
+        index = len(data)
+        while index > 0 and last_date and _format_date(data[index - 1]["timestamp"]) > last_date:
+            index -= 1
+        if not last_date or index == 0:
+            # 저장된 구간이 지금 일봉과 이어지지 않으면 처음부터 다시 계산한다.
+            state = None
+        else:
+            fresh = data[index:]
+    if state is None:
+        arrays = to_ohlcv_arrays(data)
+        first = bisect_left(arrays.dates, payload.startDate.isoformat())
+        arrays = _slice_arrays(arrays, max(0, first - 5))
+    elif fresh:
+        arrays = to_ohlcv_arrays(fresh)
+    else:
+        arrays = None
+    if arrays is not None:
+        state = await asyncio.to_thread(
+            extend_backtest_state,
+            state,
+            arrays,
+            payload.k,
+            payload.fee,
+            payload.slippage,
+            payload.useMaFilter,
+        )
+        backtest_states.set(key, state, BACKTEST_STATE_TTL, size=state.nbytes)
+    return await asyncio.to_thread(
+        _outcome_from_state, state, response_format, points, payload.bootstrap
+    )
+
+
+def _outcome_from_state(
+    state: BacktestState,
+    response_format: str,
+    points: Optional[int],
+    bootstrap: Optional[BootstrapOptions],
+) -> BacktestOutcome:
+    columns = state.columns
+    return _build_outcome(
+        columns,
+        columns.to_trades(),
+        state.trade_summary(),
+        state.metrics(),
+        response_format,
+        points,
+        bootstrap,
+    )
+
+
+def _requested_count(payload: BacktestRequest) -> int:
+    """준비 구간 5개를 포함해 받아야 할 일봉 수."""
+    if payload.startDate is not None:
+        return _start_date_span(payload.startDate) + 5
+    if payload.days is not None:
+        return payload.days + 5
+    raise HTTPException(status_code=400, detail="days or startDate is required")
 
 
 @app.post("/api/backtest", response_model=BacktestResponse)
-async def backtest(payload: BacktestRequest):
+async def backtest(
+    payload: BacktestRequest,
+    request: Request,
+    response_format: Literal["rows", "columnar"] = Query("rows", alias="format"),
+    points: Optional[int] = Query(None, ge=3),
+):
     start_time = time.perf_counter()
-    count = payload.days + 5
-    data = await fetch_ohlcv(payload.symbol, count)
+    data = await fetch_ohlcv(payload.symbol, _requested_count(payload))
+    fetched_at = time.perf_counter()
+    backtest_phase_latency.observe(fetched_at - start_time, "fetch")
     if len(data) < 6:
         raise HTTPException(status_code=400, detail="Not enough OHLCV data")
-    results = await asyncio.to_thread(
-        run_backtest, data, payload.k, payload.fee, payload.slippage, payload.useMaFilter
-    )
-    trades = build_trades(results)
-    trade_summary = build_trade_summary(trades)
-    metrics = build_metrics(results, trades)
+
+    cache_key = _response_cache_key(payload, response_format, points, data[-1]["timestamp"])
+    cached = response_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        etag, body = cached
+        trade_count = None
+    else:
+        if payload.startDate is not None:
+            outcome = await evaluate_backtest_since(payload, data, response_format, points)
+        else:
+            outcome = await asyncio.to_thread(
+                evaluate_backtest,
+                data,
+                payload.k,
+                payload.fee,
+                payload.slippage,
+                payload.useMaFilter,
+                response_format,
+                points,
+                payload.bootstrap,
+            )
+        # 결과 행은 계산된 값 그대로이므로 응답 모델 검증을 건너뛰고 바로 직렬화한다.
+        body = _json_dumps(
+            {
+                "results": outcome.results,
+                "trades": [trade.model_dump() for trade in outcome.trades],
+                "tradeSummary": outcome.trade_summary.model_dump(),
+                "metrics": outcome.metrics.model_dump(),
+                "confidence": outcome.confidence.model_dump() if outcome.confidence else None,
+            }
+        )
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if cache_key:
+            response_cache.set(cache_key, (etag, body), RESPONSE_CACHE_TTL, size=len(body))
+        trade_count = outcome.metrics.tradeCount
+    computed_at = time.perf_counter()
+    backtest_phase_latency.observe(computed_at - fetched_at, "compute")
+
+    # ETag는 시세(ticker)를 뺀 본문 기준이다. 304에는 본문이 없으므로 시세는 /ws/ticker로 받는다.
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
     ticker = await fetch_ticker(payload.symbol, payload.k)
+    backtest_phase_latency.observe(time.perf_counter() - computed_at, "ticker")
     elapsed_ms = (time.perf_counter() - start_time) * 1000
     logger.info(
-        "Backtest symbol=%s k=%.3f days=%s ma=%s slippage=%.4f trades=%s duration_ms=%.1f",
+        "Backtest symbol=%s k=%.3f days=%s ma=%s slippage=%.4f trades=%s cached=%s "
+        "duration_ms=%.1f",
         payload.symbol,
         payload.k,
         payload.days,
         payload.useMaFilter,
         payload.slippage,
+        trade_count,
+        trade_count is None,
+        elapsed_ms,
+    )
+    ticker_json = _json_dumps(ticker.model_dump() if ticker else None)
+    return Response(
+        content=body[:-1] + b',"ticker":' + ticker_json + b"}",
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+def _ndjson(record: dict) -> bytes:
+    return _json_dumps(record) + b"\n"
+
+
+def _next_stream_record(chunks: Iterator[BacktestColumns], trades: List[dict]) -> Optional[bytes]:
+    """다음 청크를 계산해 results 레코드로 직렬화한다. 남은 청크가 없으면 None. 스레드에서 실행한다."""
+    columns = next(chunks, None)
+    if columns is None:
+        return None
+    trades.extend(trade.model_dump() for trade in columns.to_trades())
+    return _ndjson({"type": "results", "rows": columns.to_records()})
+
+
+async def _stream_backtest(
+    payload: BacktestRequest,
+    data: List[dict],
+    ticker: Optional[MarketTicker],
+    start_time: float,
+) -> AsyncIterator[bytes]:
+    running = RunningMetrics()
+    trades: List[dict] = []
+    yield _ndjson({"type": "start", "symbol": payload.symbol, "rows": max(0, len(data) - 5)})
+    chunks = iter_backtest_chunks(
+        data,
+        payload.k,
+        payload.fee,
+        payload.slippage,
+        payload.useMaFilter,
+        running,
+        BACKTEST_STREAM_CHUNK_ROWS,
+    )
+    try:
+        # 청크 계산과 직렬화는 스레드에서 해 긴 구간을 보내는 동안에도 이벤트 루프를 막지 않는다.
+        while True:
+            record = await asyncio.to_thread(_next_stream_record, chunks, trades)
+            if record is None:
+                break
+            yield record
+        rows_sent_at = time.perf_counter()
+        yield _ndjson({"type": "trades", "trades": trades})
+        yield _ndjson(
+            {"type": "tradeSummary", "tradeSummary": running.trade_summary().model_dump()}
+        )
+        metrics = running.metrics()
+        yield _ndjson({"type": "metrics", "metrics": metrics.model_dump()})
+        yield _ndjson({"type": "ticker", "ticker": ticker.model_dump() if ticker else None})
+    except Exception:
+        # 헤더는 이미 200으로 나갔으므로 오류는 마지막 레코드로 알린다.
+        logger.exception("Backtest stream failed symbol=%s", payload.symbol)
+        yield _ndjson(
+            {
+                "type": "error",
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": "서버 오류가 발생했습니다.",
+                    "retryable": True,
+                },
+            }
+        )
+        return
+    yield _ndjson({"type": "end"})
+    backtest_phase_latency.observe(rows_sent_at - start_time, "stream")
+    logger.info(
+        "Backtest stream symbol=%s k=%.3f days=%s ma=%s rows=%s trades=%s duration_ms=%.1f",
+        payload.symbol,
+        payload.k,
+        payload.days,
+        payload.useMaFilter,
+        running.rows,
         metrics.tradeCount,
+        (time.perf_counter() - start_time) * 1000,
+    )
+
+
+@app.post("/api/backtest/stream")
+async def backtest_stream(payload: BacktestRequest):
+    """/api/backtest와 같은 계산을 NDJSON으로 흘려보낸다.
+
+    한 줄에 레코드 하나이며 type 순서는 start, results(BACKTEST_STREAM_CHUNK_ROWS행씩 여러 줄),
+    trades, tradeSummary, metrics, ticker, end다. 도중에 실패하면 end 대신 error 레코드로 끝나므로
+    end를 받지 못한 응답은 불완전한 것이다. 결과 행은 청크 단위로 계산하는 즉시 보내고 요청마다
+    응답 전체를 메모리에 만들지 않는다. 부트스트랩과 columnar/points 축약은 지원하지 않는다.
+    """
+    if payload.bootstrap is not None:
+        raise HTTPException(status_code=400, detail="bootstrap is not supported when streaming")
+    start_time = time.perf_counter()
+    data = await fetch_ohlcv(payload.symbol, _requested_count(payload))
+    backtest_phase_latency.observe(time.perf_counter() - start_time, "fetch")
+    if len(data) < 6:
+        raise HTTPException(status_code=400, detail="Not enough OHLCV data")
+    if payload.startDate is not None:
+        first = bisect_left(
+            data, payload.startDate.isoformat(), key=lambda day: _format_date(day["timestamp"])
+        )
+        data = data[max(0, first - 5) :]
+    # 시세 조회 실패는 응답을 시작하기 전에 일반 오류 응답으로 돌려준다.
+    ticker = await fetch_ticker(payload.symbol, payload.k)
+    return StreamingResponse(
+        _stream_backtest(payload, data, ticker, start_time), media_type="application/x-ndjson"
+    )
+
+
+def _response_cache_key(
+    payload: BacktestRequest, response_format: str, points: Optional[int], last_candle: str
+) -> Optional[str]:
+    # 시드 없는 부트스트랩은 매번 다른 결과를 내야 하므로 캐시하지 않는다.
+    if payload.bootstrap is not None and payload.bootstrap.seed is None:
+        return None
+    params = payload.model_dump(mode="json")
+    params.update(format=response_format, points=points, lastCandle=_format_date(last_candle))
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _validated_k_values(k_min: float, k_max: float, k_step: float, settings: int) -> np.ndarray:
+    if k_max < k_min:
+        raise HTTPException(status_code=400, detail="kMax must be >= kMin")
+    ks = _sweep_k_values(k_min, k_max, k_step)
+    if len(ks) * settings > SWEEP_MAX_COMBINATIONS:
+        raise HTTPException(status_code=400, detail="Too many sweep combinations")
+    return ks
+
+
+@app.post("/api/backtest/sweep", response_model=BacktestSweepResponse)
+async def backtest_sweep(payload: BacktestSweepRequest):
+    ks = _validated_k_values(payload.kMin, payload.kMax, payload.kStep, 2)
+
+    start_time = time.perf_counter()
+    count = payload.days + 5
+    data = await fetch_ohlcv(payload.symbol, count)
+    if len(data) < 6:
+        raise HTTPException(status_code=400, detail="Not enough OHLCV data")
+    results = await asyncio.to_thread(evaluate_sweep, data, ks, payload.fee, payload.slippage)
+    best = max(results, key=lambda item: item.metrics.totalReturn, default=None)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        "Backtest sweep symbol=%s k=%.3f..%.3f step=%.3f days=%s combinations=%s duration_ms=%.1f",
+        payload.symbol,
+        payload.kMin,
+        payload.kMax,
+        payload.kStep,
+        payload.days,
+        len(results),
         elapsed_ms,
     )
-    return {
-        "results": results,
-        "trades": trades,
-        "tradeSummary": trade_summary,
-        "metrics": metrics,
-        "ticker": ticker,
-    }
+    return {"results": results, "best": best}
+
+
+@app.post("/api/backtest/walkforward", response_model=WalkForwardResponse)
+async def backtest_walkforward(payload: WalkForwardRequest):
+    if payload.useMaFilter is None:
+        ma_options: Tuple[bool, ...] = (False, True)
+    else:
+        ma_options = (payload.useMaFilter,)
+    ks = _validated_k_values(payload.kMin, payload.kMax, payload.kStep, len(ma_options))
+    if payload.inSampleDays + payload.outSampleDays > payload.days:
+        raise HTTPException(status_code=400, detail="Window is longer than days")
+
+    start_time = time.perf_counter()
+    data = await fetch_ohlcv(payload.symbol, payload.days + 5)
+    if len(data) < payload.inSampleDays + 6:
+        raise HTTPException(status_code=400, detail="Not enough OHLCV data")
+    result = await run_walkforward(data, payload, ks, ma_options)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        "Walk-forward symbol=%s days=%s in=%s out=%s windows=%s duration_ms=%.1f",
+        payload.symbol,
+        payload.days,
+        payload.inSampleDays,
+        payload.outSampleDays,
+        len(result["windows"]),
+        elapsed_ms,
+    )
+    return result
+
+
+@app.post("/api/backtest/portfolio", response_model=PortfolioResponse)
+async def backtest_portfolio(payload: PortfolioRequest):
+    symbols = list(dict.fromkeys(payload.symbols))
+    if len(symbols) > PORTFOLIO_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail="Too many symbols")
+    if payload.weights is None:
+        raw_weights = [1.0] * len(symbols)
+    elif len(payload.weights) != len(payload.symbols) or len(symbols) != len(payload.symbols):
+        raise HTTPException(status_code=400, detail="weights must match unique symbols")
+    else:
+        raw_weights = payload.weights
+    total_weight = sum(raw_weights)
+    if any(weight < 0 for weight in raw_weights) or total_weight <= 0:
+        raise HTTPException(status_code=400, detail="weights must be non-negative")
+    weights = {symbol: weight / total_weight for symbol, weight in zip(symbols, raw_weights)}
+
+    start_time = time.perf_counter()
+    count = payload.days + 5
+    fetched = await asyncio.gather(*[fetch_ohlcv(symbol, count) for symbol in symbols])
+    datasets = dict(zip(symbols, fetched))
+    short = [symbol for symbol, data in datasets.items() if len(data) < 6]
+    if short:
+        raise HTTPException(status_code=400, detail=f"Not enough OHLCV data: {','.join(short)}")
+    result = await asyncio.to_thread(
+        evaluate_portfolio,
+        datasets,
+        weights,
+        payload.k,
+        payload.fee,
+        payload.slippage,
+        payload.useMaFilter,
+    )
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        "Portfolio backtest symbols=%s k=%.3f days=%s ma=%s duration_ms=%.1f",
+        ",".join(symbols),
+        payload.k,
+        payload.days,
+        payload.useMaFilter,
+        elapsed_ms,
+    )
+    return result
+
+
+@app.post("/api/backtest/intraday", response_model=IntradayBacktestResponse)
+async def backtest_intraday(payload: IntradayBacktestRequest):
+    if payload.days > INTRADAY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be <= {INTRADAY_MAX_DAYS}")
+    step = payload.unit * 60
+    # 진행 중인 분봉은 제외하고, 앞에 준비 구간 5개를 더 받는다.
+    end = int(time.time()) // step * step
+    start = end - payload.days * 86400
+    start_time = time.perf_counter()
+    await sync_minute_candles(payload.symbol, payload.unit, start - 5 * step, end)
+    synced_at = time.perf_counter()
+    backtest_phase_latency.observe(synced_at - start_time, "intraday_sync")
+    result = await asyncio.to_thread(run_intraday_backtest, payload, start, end)
+    backtest_phase_latency.observe(time.perf_counter() - synced_at, "intraday_compute")
+    if result.performance.rows == 0:
+        raise HTTPException(status_code=400, detail="Not enough OHLCV data")
+    performance = result.performance
+    logger.info(
+        "Intraday backtest symbol=%s unit=%s k=%.3f days=%s ma=%s rows=%s chunks=%s "
+        "rows_per_sec=%.0f peak_chunk_bytes=%s max_rss_bytes=%s duration_ms=%.1f",
+        payload.symbol,
+        payload.unit,
+        payload.k,
+        payload.days,
+        payload.useMaFilter,
+        performance.rows,
+        performance.chunks,
+        performance.rowsPerSec,
+        performance.peakChunkBytes,
+        performance.maxRssBytes,
+        (time.perf_counter() - start_time) * 1000,
+    )
+    return result
 
 
 @app.post("/api/ai/report", response_model=AiReportResponse)
@@ -836,17 +4136,31 @@ async def ai_report(payload: AiReportRequest):
     return report
 
 
+def _parse_max_hz(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        max_hz = float(value)
+    except ValueError:
+        return None
+    if max_hz <= 0:
+        return None
+    return min(max_hz, WS_MAX_HZ)
+
+
 @app.websocket("/ws/ticker")
 async def ticker_stream(websocket: WebSocket):
     symbols_param = websocket.query_params.get("symbols")
     symbols = {s.strip() for s in symbols_param.split(",") if s.strip()} if symbols_param else set()
-    await broadcaster.connect(websocket, symbols)
+    await broadcaster.connect(
+        websocket, symbols, _parse_max_hz(websocket.query_params.get("maxHz"))
+    )
 
     async with live_lock:
         initial = [value for key, value in live_tickers.items() if not symbols or key in symbols]
 
     for payload in initial:
-        await websocket.send_json(payload)
+        broadcaster.send(websocket, payload)
 
     try:
         while True:
@@ -0,0 +1,122 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+# main은 import 시점에 환경 변수를 읽으므로 먼저 테스트용 값을 넣는다.
+os.environ["CANDLE_DB_PATH"] = ":memory:"
+os.environ["STREAM_MARKETS"] = " "
+os.environ["RATE_LIMIT_PER_MIN"] = "100000"
+os.environ["UPBIT_REQUESTS_PER_SEC"] = "100000"
+os.environ["UPBIT_RETRY_BASE"] = "0"
+os.environ.pop("SHARED_STATE_DIR", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def fake_day_candle(market: str, day: date) -> dict:
+    """날짜마다 같은 값을 돌려주는 Upbit 일봉. 어느 페이지로 받아도 겹치는 날은 일치한다."""
+    rng = random.Random(f"{market}:{day.isoformat()}")
+    open_price = 1000 + rng.random() * 100
+    close = open_price * (1 + rng.gauss(0, 0.03))
+    return {
+        "market": market,
+        "candle_date_time_utc": f"{day.isoformat()}T00:00:00",
+        "candle_date_time_kst": f"{day.isoformat()}T09:00:00",
+        "opening_price": open_price,
+        "high_price": max(open_price, close) * 1.01,
+        "low_price": min(open_price, close) * 0.99,
+        "trade_price": close,
+        "candle_acc_trade_volume": 1.0,
+    }
+
+
+class FakeUpbit:
+    """일봉과 티커만 흉내 내는 httpx MockTransport 핸들러. fail에 걸린 요청은 500으로 답한다."""
+
+    def __init__(self) -> None:
+        self.calls: list = []
+        self.fail = lambda request: False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        if self.fail(request):
+            return httpx.Response(500)
+        params = request.url.params
+        if request.url.path.endswith("/candles/days"):
+            to = params.get("to")
+            end = date.fromisoformat(to[:10]) - timedelta(days=1) if to else date.today()
+            count = int(params.get("count", "1"))
+            market = params["market"]
+            return httpx.Response(
+                200, json=[fake_day_candle(market, end - timedelta(days=i)) for i in range(count)]
+            )
+        if request.url.path.endswith("/ticker"):
+            return httpx.Response(
+                200,
+                json=[
+                    {
+                        "market": market,
+                        "trade_price": 1000.0,
+                        "opening_price": 990.0,
+                        "high_price": 1010.0,
+                        "low_price": 980.0,
+                        "signed_change_rate": 0.01,
+                    }
+                    for market in params["markets"].split(",")
+                ],
+            )
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def fake_upbit() -> FakeUpbit:
+    return FakeUpbit()
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """모듈 전역 캐시와 회로 차단기 상태가 테스트 사이에 새지 않게 한다."""
+    monkeypatch.setattr(main, "cache", main.TtlLruCache(main.CACHE_MAX_ENTRIES))
+    monkeypatch.setattr(
+        main, "backtest_states", main.TtlLruCache(main.BACKTEST_STATE_MAX_ENTRIES)
+    )
+    monkeypatch.setattr(
+        main, "response_cache", main.TtlLruCache(main.RESPONSE_CACHE_MAX_ENTRIES)
+    )
+    monkeypatch.setattr(
+        main,
+        "rate_limits",
+        main.SlidingWindowLimiter(
+            main.RATE_LIMIT_PER_MIN, main.RATE_LIMIT_WINDOW, 1, main.RATE_LIMIT_MAX_CLIENTS
+        ),
+    )
+    monkeypatch.setattr(main, "candle_cache", main.TtlLruCache(main.CANDLE_CACHE_MAX_ENTRIES))
+    monkeypatch.setattr(main, "circuit_states", {})
+
+
+@pytest.fixture
+def client(fake_upbit):
+    with TestClient(main.app) as test_client:
+        startup_client = main.http_client
+        main.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_upbit))
+        yield test_client
+        main.http_client = startup_client
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch, fake_upbit):
+    candle_store = main.CandleStore(str(tmp_path / "candles.db"))
+    monkeypatch.setattr(main, "candle_store", candle_store)
+    monkeypatch.setattr(main, "UPBIT_CIRCUIT_FAILURES", 1000)
+    monkeypatch.setattr(
+        main, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(fake_upbit))
+    )
+    yield candle_store
+    candle_store.close()
@@ -0,0 +1,99 @@
+import pytest
+
+import main
+from benchmarks.synthetic import REGIMES, synthetic_ohlcv
+
+
+def reference_backtest(data, k, fee, slippage, use_ma_filter):
+    """벡터화 이전의 행 단위 루프. NumPy 엔진은 이 결과와 비트 단위로 같아야 한다."""
+    cumulative_return = 1.0
+    results = []
+    effective_fee = min(1.0, fee + slippage)
+    fee_multiplier = max(0.0, 1 - effective_fee)
+    fee_factor = fee_multiplier * fee_multiplier
+    for i in range(5, len(data)):
+        prev = data[i - 1]
+        curr = data[i]
+        ma5 = sum(day["close"] for day in data[i - 5 : i]) / 5
+        target = curr["open"] + (prev["high"] - prev["low"]) * k
+        is_bought = curr["high"] > target
+        if use_ma_filter:
+            is_bought = is_bought and (curr["open"] > ma5)
+        ror = (curr["close"] / target) * fee_factor if is_bought else 1
+        cumulative_return *= ror
+        results.append(
+            {
+                "date": main._format_date(curr["timestamp"]),
+                "price": curr["close"],
+                "target": target,
+                "ma5": ma5,
+                "isBought": is_bought,
+                "ror": (ror - 1) * 100,
+                "hpr": cumulative_return,
+            }
+        )
+    return results
+
+
+def reference_metrics(results):
+    if not results:
+        return main.MetricSummary(
+            totalReturn=0.0, winRate=0.0, mdd=0.0, cagr=0.0, tradeCount=0, totalDays=0
+        )
+    final_hpr = results[-1]["hpr"]
+    max_hpr = results[0]["hpr"]
+    max_drawdown = 0.0
+    for result in results:
+        max_hpr = max(max_hpr, result["hpr"])
+        drawdown = (max_hpr - result["hpr"]) / max_hpr if max_hpr else 0.0
+        max_drawdown = max(max_drawdown, drawdown)
+    trades = [result["ror"] for result in results if result["isBought"]]
+    wins = sum(1 for value in trades if value > 0)
+    years = len(results) / 365
+    return main.MetricSummary(
+        totalReturn=(final_hpr - 1) * 100,
+        winRate=(wins / len(trades)) * 100 if trades else 0.0,
+        mdd=max_drawdown * 100,
+        cagr=(final_hpr ** (1 / years) - 1) * 100 if final_hpr > 0 else 0.0,
+        tradeCount=len(trades),
+        totalDays=len(results),
+    )
+
+
+CASES = [
+    (regime, days, k, use_ma_filter)
+    for regime in REGIMES
+    for days in (3, 6, 400)
+    for k in (0.0, 0.5, 1.2)
+    for use_ma_filter in (False, True)
+]
+
+
+@pytest.mark.parametrize("regime,days,k,use_ma_filter", CASES)
+def test_run_backtest_matches_reference(regime, days, k, use_ma_filter):
+    data = synthetic_ohlcv(days, regime, seed=11)
+    expected = reference_backtest(data, k, 0.0005, 0.001, use_ma_filter)
+
+    results = main.run_backtest(data, k, 0.0005, 0.001, use_ma_filter)
+    assert [result.model_dump() for result in results] == expected
+
+    trades = main.build_trades(results)
+    assert main.build_metrics(results, trades) == reference_metrics(expected)
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+@pytest.mark.parametrize("use_ma_filter", [False, True])
+def test_evaluate_backtest_matches_reference(regime, use_ma_filter):
+    data = synthetic_ohlcv(900, regime, seed=3)
+    expected = reference_backtest(data, 0.5, 0.0005, 0.0, use_ma_filter)
+
+    outcome = main.evaluate_backtest(data, 0.5, 0.0005, 0.0, use_ma_filter)
+    assert outcome.results == expected
+    assert outcome.metrics == reference_metrics(expected)
+    assert [trade.ror for trade in outcome.trades] == [
+        result["ror"] for result in expected if result["isBought"]
+    ]
+
+    columnar = main.evaluate_backtest(data, 0.5, 0.0005, 0.0, use_ma_filter, "columnar")
+    assert columnar.results["hpr"] == [result["hpr"] for result in expected]
+    assert columnar.metrics == outcome.metrics
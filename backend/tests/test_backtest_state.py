@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import main
+from benchmarks.synthetic import REGIMES, synthetic_ohlcv
+
+
+def _outcome(state, response_format="rows"):
+    return main._outcome_from_state(state, response_format, None, None)
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+@pytest.mark.parametrize("use_ma_filter", [False, True])
+def test_extensions_match_full_recompute(regime, use_ma_filter):
+    data = synthetic_ohlcv(900, regime, seed=3)
+    arrays = main.to_ohlcv_arrays(data)
+    rng = random.Random(regime)
+
+    state = main.extend_backtest_state(
+        None, main._slice_arrays(arrays, 0, 600), 0.5, 0.0005, 0.001, use_ma_filter
+    )
+    index = 600
+    while index < len(data):
+        end = min(len(data), index + rng.randint(1, 4))
+        state = main.extend_backtest_state(
+            state, main._slice_arrays(arrays, index, end), 0.5, 0.0005, 0.001, use_ma_filter
+        )
+        index = end
+
+    full = main.evaluate_backtest(data, 0.5, 0.0005, 0.001, use_ma_filter)
+    incremental = _outcome(state)
+    assert incremental.results == full.results
+    assert incremental.trades == full.trades
+    assert incremental.trade_summary == full.trade_summary
+    assert incremental.metrics == full.metrics
+
+
+def test_short_history_extends_past_warmup():
+    data = synthetic_ohlcv(8, "trending", seed=1)
+    arrays = main.to_ohlcv_arrays(data)
+    state = main.extend_backtest_state(None, main._slice_arrays(arrays, 0, 3), 0.5, 0, 0, False)
+    state = main.extend_backtest_state(state, main._slice_arrays(arrays, 3, 8), 0.5, 0, 0, False)
+
+    assert _outcome(state).metrics == main.evaluate_backtest(data, 0.5, 0, 0, False).metrics
+
+
+def test_extending_an_older_state_forks_the_buffer():
+    data = synthetic_ohlcv(400, "gappy", seed=5)
+    arrays = main.to_ohlcv_arrays(data)
+    base = main.extend_backtest_state(
+        None, main._slice_arrays(arrays, 0, 300), 0.5, 0.0005, 0, True
+    )
+    before = _outcome(base)
+
+    first = main.extend_backtest_state(
+        base, main._slice_arrays(arrays, 300, 350), 0.5, 0.0005, 0, True
+    )
+    second = main.extend_backtest_state(
+        base, main._slice_arrays(arrays, 300, 400), 0.5, 0.0005, 0, True
+    )
+
+    # 끝에 붙일 수 있는 첫 확장만 버퍼를 공유하고, 두 번째는 복사본에 이어 쓴다.
+    assert first.buffer is base.buffer
+    assert second.buffer is not base.buffer
+    assert _outcome(base).results == before.results
+    for state, end in ((first, 350), (second, 400)):
+        for response_format in ("rows", "columnar"):
+            expected = main.evaluate_backtest(data[:end], 0.5, 0.0005, 0, True, response_format)
+            assert _outcome(state, response_format).results == expected.results
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+BODIES = [
+    {"symbol": "KRW-BTC", "k": 0.5, "fee": 0.0005, "days": 1200, "useMaFilter": True},
+    {
+        "symbol": "KRW-ETH",
+        "k": 0.3,
+        "fee": 0.001,
+        "slippage": 0.001,
+        "startDate": "2024-03-01",
+        "useMaFilter": False,
+    },
+]
+
+
+def _read_stream(client, body):
+    with client.stream("POST", "/api/backtest/stream", json=body) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 250, 5000])
+def test_chunks_concatenate_to_full_computation(chunk_rows):
+    data = synthetic_ohlcv(700, "ranging", seed=2)
+    running = main.RunningMetrics()
+    chunks = list(main.iter_backtest_chunks(data, 0.5, 0.0005, 0.001, True, running, chunk_rows))
+    expected = main.evaluate_backtest(data, 0.5, 0.0005, 0.001, True)
+
+    rows = [row for chunk in chunks for row in chunk.to_records()]
+    assert rows == expected.results
+    assert running.trade_summary() == expected.trade_summary
+    assert running.metrics() == expected.metrics
+
+
+@pytest.mark.parametrize("body", BODIES)
+@pytest.mark.parametrize("chunk_rows", [1, 250])
+def test_stream_matches_backtest_endpoint(client, monkeypatch, body, chunk_rows):
+    monkeypatch.setattr(main, "BACKTEST_STREAM_CHUNK_ROWS", chunk_rows)
+    records = _read_stream(client, body)
+    full = client.post("/api/backtest", json=body).json()
+
+    types = [record["type"] for record in records]
+    assert types[0] == "start" and types[-1] == "end"
+    assert types[-5:-1] == ["trades", "tradeSummary", "metrics", "ticker"]
+    assert records[0]["rows"] == len(full["results"])
+    assert [row for record in records if record["type"] == "results" for row in record["rows"]] == (
+        full["results"]
+    )
+    for record in records[-5:-1]:
+        assert record[record["type"]] == full[record["type"]]
+
+
+def test_stream_failure_ends_with_error_record(client, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("boom")
+        yield
+
+    monkeypatch.setattr(main, "iter_backtest_chunks", broken)
+    records = _read_stream(client, BODIES[0])
+
+    assert records[0]["type"] == "start"
+    assert records[-1]["type"] == "error"
+    assert records[-1]["error"]["code"] == "INTERNAL_ERROR"
+
+
+def test_stream_rejects_bootstrap(client):
+    body = dict(BODIES[0], bootstrap={"paths": 100})
+    assert client.post("/api/backtest/stream", json=body).status_code == 400
@@ -0,0 +1,70 @@
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def _columns(days=500, regime="trending"):
+    data = synthetic_ohlcv(days, regime, seed=12)
+    return main.compute_backtest(main.to_ohlcv_arrays(data), 0.5, 0.0005, 0.0, True)
+
+
+def test_seeded_bootstrap_is_reproducible():
+    columns = _columns()
+    options = main.BootstrapOptions(paths=500, blockSize=10, seed=42)
+    assert main.bootstrap_confidence(columns, options) == main.bootstrap_confidence(
+        columns, options
+    )
+
+
+def test_chunking_does_not_change_the_bands(monkeypatch):
+    columns = _columns()
+    options = main.BootstrapOptions(paths=700, blockSize=7, seed=1)
+    whole = main.bootstrap_confidence(columns, options)
+    monkeypatch.setattr(main, "BOOTSTRAP_CHUNK_PATHS", 64)
+    assert main.bootstrap_confidence(columns, options) == whole
+
+
+def test_full_length_block_reproduces_the_backtest():
+    columns = _columns(200)
+    options = main.BootstrapOptions(paths=100, blockSize=250, seed=3)
+    confidence = main.bootstrap_confidence(columns, options)
+    metrics = main.build_metrics_from_columns(columns)
+
+    # 블록이 전체 길이면 모든 경로가 원래 수익률 순서 그대로다.
+    assert confidence.blockSize == len(columns)
+    for band in confidence.bands:
+        assert band.totalReturn == pytest.approx(metrics.totalReturn)
+        assert band.mdd == pytest.approx(metrics.mdd)
+        assert band.cagr == pytest.approx(metrics.cagr)
+
+
+def test_bands_are_ordered_by_percentile():
+    options = main.BootstrapOptions(paths=1000, seed=5, percentiles=[5, 25, 50, 75, 95])
+    bands = main.bootstrap_confidence(_columns(regime="gappy"), options).bands
+    for field in ("totalReturn", "mdd", "cagr"):
+        values = [getattr(band, field) for band in bands]
+        assert values == sorted(values)
+
+
+def test_empty_series_returns_zero_bands():
+    columns = main.compute_backtest(
+        main.to_ohlcv_arrays(synthetic_ohlcv(3, seed=1)), 0.5, 0, 0, False
+    )
+    bands = main.bootstrap_confidence(columns, main.BootstrapOptions(seed=1)).bands
+    assert [band.totalReturn for band in bands] == [0.0, 0.0, 0.0]
+
+
+def test_endpoint_returns_confidence(client):
+    body = {
+        "symbol": "KRW-BTC",
+        "k": 0.5,
+        "fee": 0.0005,
+        "days": 300,
+        "useMaFilter": True,
+        "bootstrap": {"paths": 200, "seed": 9},
+    }
+    first = client.post("/api/backtest", json=body).json()
+    second = client.post("/api/backtest", json=body).json()
+    assert first["confidence"]["paths"] == 200
+    assert first["confidence"] == second["confidence"]
@@ -0,0 +1,31 @@
+import asyncio
+
+import main
+
+
+def test_shorter_windows_reuse_the_cached_range(store, fake_upbit):
+    long_window = asyncio.run(main.fetch_ohlcv("KRW-BTC", 300))
+    fetched = len(fake_upbit.calls)
+
+    short_window = asyncio.run(main.fetch_ohlcv("KRW-BTC", 50))
+    assert len(fake_upbit.calls) == fetched
+    assert short_window == long_window[-50:]
+
+
+def test_longer_window_prepends_only_the_missing_days(store, fake_upbit):
+    short_window = asyncio.run(main.fetch_ohlcv("KRW-BTC", 50))
+    long_window = asyncio.run(main.fetch_ohlcv("KRW-BTC", 300))
+
+    assert len(long_window) == 300
+    assert long_window[-50:] == short_window
+
+
+def test_cache_is_bounded(store, monkeypatch):
+    monkeypatch.setattr(main, "candle_cache", main.TtlLruCache(max_entries=2))
+    for symbol in ("KRW-BTC", "KRW-ETH", "KRW-XRP"):
+        asyncio.run(main.fetch_ohlcv(symbol, 30))
+
+    assert len(main.candle_cache) == 2
+    assert main.candle_cache.stats.evictions == 1
+    # 내보낸 심볼도 저장소에서 다시 읽어 온다.
+    assert len(asyncio.run(main.fetch_ohlcv("KRW-BTC", 30))) == 30
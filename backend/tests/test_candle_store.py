@@ -0,0 +1,47 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+import main
+
+
+def _max_gap(candles):
+    days = [date.fromisoformat(candle["timestamp"][:10]) for candle in candles]
+    return max((b - a).days for a, b in zip(days, days[1:]))
+
+
+def test_failed_middle_page_does_not_leave_a_hole(store, fake_upbit):
+    # 최신 구간과 가장 오래된 구간 사이의 페이지 하나가 계속 실패하게 한다.
+    failing_month = (date.today() - timedelta(days=600)).isoformat()[:7]
+    fake_upbit.fail = lambda request: (
+        request.url.path.endswith("/candles/days")
+        and request.url.params.get("to", "").startswith(failing_month)
+    )
+
+    with pytest.raises(main.ApiException):
+        asyncio.run(main.fetch_ohlcv("KRW-BTC", 2000))
+
+    first_date, last_date, stored, complete = store.bounds("KRW-BTC")
+    span = (date.fromisoformat(last_date) - date.fromisoformat(first_date)).days + 1
+    assert stored == span
+    assert not complete
+    assert first_date[:7] >= failing_month
+    assert _max_gap(store.load("KRW-BTC", 5000, date.today().isoformat())) == 1
+
+    fake_upbit.fail = lambda request: False
+    candles = asyncio.run(main.fetch_ohlcv("KRW-BTC", 2000))
+    assert len(candles) == 2000
+    assert _max_gap(candles) == 1
+    assert store.bounds("KRW-BTC")[2] == 2000
+
+
+def test_stored_range_is_served_without_refetch(store, fake_upbit):
+    asyncio.run(main.fetch_ohlcv("KRW-BTC", 300))
+    fetched = len(fake_upbit.calls)
+    main.candle_cache.pop("KRW-BTC")
+
+    candles = asyncio.run(main.fetch_ohlcv("KRW-BTC", 300))
+    assert len(fake_upbit.calls) == fetched
+    assert len(candles) == 300
+    assert _max_gap(candles) == 1
@@ -0,0 +1,72 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def fresh_indicators(monkeypatch):
+    monkeypatch.setattr(main, "daily_indicators", {})
+    monkeypatch.setattr(main, "ROLLOVER_RETRY_BASE", 0)
+
+
+def test_indicators_come_from_the_last_completed_days(store):
+    indicators = asyncio.run(main._compute_daily_indicators("KRW-BTC"))
+    candles = asyncio.run(main.fetch_ohlcv("KRW-BTC", 20))
+
+    prev_day = candles[-1]
+    assert indicators.trading_day == main._trading_day()
+    assert indicators.prev_high == prev_day["high"]
+    assert indicators.prev_range == prev_day["high"] - prev_day["low"]
+    assert indicators.ma5 == sum(candle["close"] for candle in candles[-5:]) / 5
+    assert indicators.ma20 == sum(candle["close"] for candle in candles) / 20
+    assert main.daily_indicators["KRW-BTC"] is indicators
+
+
+def test_current_indicators_are_reused_until_the_day_changes(store, fake_upbit, monkeypatch):
+    first = asyncio.run(main.get_daily_indicators("KRW-BTC"))
+    assert asyncio.run(main.get_daily_indicators("KRW-BTC")) is first
+
+    tomorrow = main._trading_day() + timedelta(days=1)
+    monkeypatch.setattr(main, "_trading_day", lambda: tomorrow)
+    fake_upbit.fail = lambda request: True
+    with pytest.raises(main.ApiException):
+        asyncio.run(main.get_daily_indicators("KRW-BTC"))
+    # 새 거래일 계산에 실패하면 이전 값은 남기고 stale로 표시한다.
+    assert main.daily_indicators["KRW-BTC"] is first
+    assert first.stale
+
+
+def test_refresh_retries_only_failed_markets_and_marks_them_stale(store, fake_upbit, monkeypatch):
+    monkeypatch.setattr(main, "ROLLOVER_RETRIES", 3)
+    monkeypatch.setattr(main, "UPBIT_MAX_RETRIES", 1)
+    asyncio.run(main.refresh_daily_indicators(["KRW-BTC", "KRW-ETH"]))
+    previous = main.daily_indicators["KRW-ETH"]
+
+    tomorrow = main._trading_day() + timedelta(days=1)
+    monkeypatch.setattr(main, "_trading_day", lambda: tomorrow)
+    fake_upbit.fail = lambda request: request.url.params.get("market") == "KRW-ETH"
+    fake_upbit.calls.clear()
+    failed = asyncio.run(main.refresh_daily_indicators(["KRW-BTC", "KRW-ETH"]))
+
+    assert failed == ["KRW-ETH"]
+    assert main.daily_indicators["KRW-ETH"] is previous and previous.stale
+    assert main.daily_indicators["KRW-BTC"].trading_day == tomorrow
+    markets = [call.url.params.get("market") for call in fake_upbit.calls]
+    # 성공한 마켓은 한 번만 받고, 실패한 마켓만 ROLLOVER_RETRIES번 다시 시도한다.
+    assert markets.count("KRW-BTC") == 1
+    assert markets.count("KRW-ETH") == 3
+
+
+def test_ticker_target_uses_the_precomputed_range(client):
+    indicators = asyncio.run(main.get_daily_indicators("KRW-BTC"))
+    ticker = asyncio.run(main.fetch_ticker("KRW-BTC", 0.5))
+    assert ticker.targetPrice == ticker.openingPrice + indicators.prev_range * 0.5
+    assert ticker.ma5 == indicators.ma5
+
+
+def test_next_rollover_is_within_a_day():
+    wait = main._seconds_until_rollover()
+    assert main.ROLLOVER_DELAY < wait <= 86400 + main.ROLLOVER_DELAY
@@ -0,0 +1,101 @@
+import httpx
+import numpy as np
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+from loadtest.upbit_stub import StubConfig, create_app
+
+STEP = 3600
+
+
+def _minute_rows(count: int) -> np.ndarray:
+    """합성 일봉 값을 60분봉 행(시각, 시가, 고가, 저가, 종가, 거래량)으로 쓴다."""
+    data = synthetic_ohlcv(count, "gappy", seed=9)
+    start = 1_700_000_000 // STEP * STEP
+    return np.array(
+        [
+            (start + i * STEP, row["open"], row["high"], row["low"], row["close"], row["volume"])
+            for i, row in enumerate(data)
+        ],
+        dtype=np.float64,
+    )
+
+
+def _accumulate(rows: np.ndarray, chunk_rows: int) -> main.IntradayAccumulator:
+    start = int(rows[5, 0])
+    accumulator = main.IntradayAccumulator(0.5, 0.0005, 0.001, True, start, int(rows[-1, 0]), 50)
+    accumulator.tail = rows[:5]
+    for offset in range(5, len(rows), chunk_rows):
+        accumulator.feed(rows[offset : offset + chunk_rows])
+    return accumulator
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 333])
+def test_chunk_size_does_not_change_results(chunk_rows):
+    rows = _minute_rows(2000)
+    whole = _accumulate(rows, len(rows))
+    chunked = _accumulate(rows, chunk_rows)
+
+    assert chunked.metrics() == whole.metrics()
+    assert chunked.running.trade_summary() == whole.running.trade_summary()
+    assert chunked.equity_points() == whole.equity_points()
+    assert chunked.running.rows == len(rows) - 5
+
+
+def test_accumulator_matches_daily_engine():
+    rows = _minute_rows(1500)
+    accumulator = _accumulate(rows, 100)
+    arrays = main.OhlcvArrays(
+        dates=[], open=rows[:, 1], high=rows[:, 2], low=rows[:, 3], close=rows[:, 4]
+    )
+    _, _, is_bought, ror = main._backtest_rows(arrays, 0.5, 0.0005, 0.001, True)
+    hpr = np.cumprod(ror)
+
+    metrics = accumulator.metrics()
+    assert metrics.totalReturn == (hpr[-1] - 1) * 100
+    assert metrics.mdd == main._max_drawdown(hpr) * 100
+    assert metrics.tradeCount == int(is_bought.sum())
+    assert accumulator.equity_points()[-1].hpr == hpr[-1]
+
+
+@pytest.fixture
+def stub_client(client):
+    stub = create_app(StubConfig(requests_per_sec=0))
+    main.http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub))
+    return client
+
+
+def test_intraday_endpoint_ignores_chunk_size(stub_client, monkeypatch):
+    body = {
+        "symbol": "KRW-BTC",
+        "unit": 60,
+        "k": 0.5,
+        "fee": 0.0005,
+        "days": 10,
+        "useMaFilter": True,
+        "points": 20,
+    }
+    first = stub_client.post("/api/backtest/intraday", json=body)
+    assert first.status_code == 200
+    result = first.json()
+    assert result["performance"]["rows"] >= 10 * 24 - 1
+    assert 0 < len(result["equity"]) <= 20
+
+    monkeypatch.setattr(main, "INTRADAY_CHUNK_ROWS", 7)
+    second = stub_client.post("/api/backtest/intraday", json=body).json()
+    assert second["performance"]["chunks"] > result["performance"]["chunks"]
+    assert second["metrics"] == result["metrics"]
+    assert second["equity"] == result["equity"]
+
+
+def test_intraday_rejects_long_ranges(stub_client):
+    body = {
+        "symbol": "KRW-BTC",
+        "unit": 60,
+        "k": 0.5,
+        "fee": 0.0005,
+        "days": main.INTRADAY_MAX_DAYS + 1,
+        "useMaFilter": True,
+    }
+    assert stub_client.post("/api/backtest/intraday", json=body).status_code == 400
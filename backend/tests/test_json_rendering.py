@@ -0,0 +1,62 @@
+import json
+import random
+
+import numpy as np
+import orjson
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def _orjson(data):
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _fallback(data):
+    return main._dumps_fallback(data).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [0.0, -0.0, 1.0, 0.1, 1e-5, -1.234e-5, 9.99e-6, 1e-7, 1e15, 1e16, 1.5e300, 5e-324],
+)
+def test_float_format_matches_orjson(value):
+    assert _fallback(value) == _orjson(value)
+
+
+def test_random_floats_match_orjson():
+    rng = random.Random(7)
+    values = [rng.uniform(-1, 1) * 10 ** rng.uniform(-320, 308) for _ in range(20000)]
+    assert _fallback(values) == _orjson(values)
+
+
+def test_non_finite_values_render_as_null_on_both_paths():
+    payload = {
+        "nan": float("nan"),
+        "inf": float("inf"),
+        "negInf": np.float64("-inf"),
+        "array": np.array([1.0, np.nan]),
+    }
+    expected = b'{"nan":null,"inf":null,"negInf":null,"array":[1.0,null]}'
+    assert _fallback(payload) == _orjson(payload) == expected
+    json.loads(_fallback(payload))
+
+
+def test_backtest_response_renders_identically(monkeypatch):
+    data = synthetic_ohlcv(400, "trending", seed=1)
+    outcome = main.evaluate_backtest(data, 0.5, 0.0005, 0.0, True)
+    payload = {
+        "symbol": "KRW-BTC",
+        "results": outcome.results,
+        "trades": [trade.model_dump() for trade in outcome.trades],
+        "metrics": outcome.metrics.model_dump(),
+    }
+    with_orjson = main._json_dumps(payload)
+    monkeypatch.setattr(main, "orjson", None)
+    assert main._json_dumps(payload) == with_orjson
+
+
+def test_unsupported_type_raises_type_error():
+    with pytest.raises(TypeError):
+        main._dumps_fallback({"value": object()})
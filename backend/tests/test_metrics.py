@@ -0,0 +1,72 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(
+        main,
+        "upstream_latency",
+        main.Histogram(main.upstream_latency.name, "test", ("path", "status")),
+    )
+    monkeypatch.setattr(
+        main,
+        "backtest_phase_latency",
+        main.Histogram(main.backtest_phase_latency.name, "test", ("phase",)),
+    )
+    monkeypatch.setattr(
+        main,
+        "rate_limited_requests",
+        main.Counter(main.rate_limited_requests.name, "test", ("path",)),
+    )
+
+
+def _samples(text: str) -> dict:
+    """주석을 뺀 `이름{라벨} 값` 줄을 사전으로 바꾼다."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = main.Histogram("latency_seconds", "test", ("path",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/ticker")
+
+    samples = _samples("\n".join(histogram.render()))
+    assert samples['latency_seconds_bucket{path="/ticker",le="0.1"}'] == 1
+    assert samples['latency_seconds_bucket{path="/ticker",le="1.0"}'] == 2
+    assert samples['latency_seconds_bucket{path="/ticker",le="+Inf"}'] == 3
+    assert samples['latency_seconds_count{path="/ticker"}'] == 3
+    assert samples['latency_seconds_sum{path="/ticker"}'] == pytest.approx(5.55)
+
+
+def test_render_lists_every_cache():
+    samples = _samples(main.render_metrics())
+    for label in ("upbit", "ai", "candles", "rate_limits", "backtest_states", "responses"):
+        assert f'cache_entries{{cache="{label}"}}' in samples
+        assert f'cache_hits_total{{cache="{label}"}}' in samples
+
+
+def test_endpoint_counts_requests(client, fresh_metrics, monkeypatch):
+    body = {"symbol": "KRW-BTC", "k": 0.5, "fee": 0.0005, "days": 30, "useMaFilter": True}
+    assert client.post("/api/backtest", json=body).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    samples = _samples(response.text)
+    assert samples['backtest_phase_duration_seconds_count{phase="fetch"}'] == 1
+    assert samples['backtest_phase_duration_seconds_count{phase="compute"}'] == 1
+    assert samples['upbit_request_duration_seconds_count{path="/candles/days",status="200"}'] >= 1
+    assert samples['cache_entries{cache="candles"}'] == 1
+
+    monkeypatch.setattr(main, "rate_limits", main.SlidingWindowLimiter(1, 60, 1, 100))
+    client.post("/api/backtest", json=body)
+    assert client.post("/api/backtest", json=body).status_code == 429
+    samples = _samples(client.get("/metrics").text)
+    assert samples['http_rate_limited_total{path="/api/backtest"}'] == 1
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import date
+
+import httpx
+import numpy as np
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+BODY = {"k": 0.5, "fee": 0.0005, "days": 200, "useMaFilter": True}
+
+
+def test_single_symbol_portfolio_equals_its_backtest():
+    data = synthetic_ohlcv(300, "trending", seed=1)
+    result = main.evaluate_portfolio({"KRW-BTC": data}, {"KRW-BTC": 1.0}, 0.5, 0.0005, 0, True)
+    single = main.evaluate_backtest(data, 0.5, 0.0005, 0, True)
+
+    assert [point["hpr"] for point in result["equity"]] == pytest.approx(
+        [row["hpr"] for row in single.results], rel=1e-12
+    )
+    assert result["metrics"].tradeCount == single.metrics.tradeCount
+
+
+def test_missing_days_are_held_as_cash():
+    long = synthetic_ohlcv(300, "ranging", seed=2)
+    short = synthetic_ohlcv(60, "trending", seed=3, start=date(2019, 5, 1))
+    result = main.evaluate_portfolio(
+        {"A": long, "B": short}, {"A": 0.5, "B": 0.5}, 0.5, 0.0, 0, False
+    )
+
+    columns = {
+        name: main.compute_backtest(main.to_ohlcv_arrays(data), 0.5, 0.0, 0, False)
+        for name, data in (("A", long), ("B", short))
+    }
+    b_factors = dict(zip(columns["B"].dates, columns["B"].ror / 100 + 1))
+    expected = np.cumprod(
+        [
+            0.5 * (ror / 100 + 1) + 0.5 * b_factors.get(day, 1.0)
+            for day, ror in zip(columns["A"].dates, columns["A"].ror)
+        ]
+    )
+    assert [point["date"] for point in result["equity"]] == columns["A"].dates
+    assert [point["hpr"] for point in result["equity"]] == pytest.approx(expected.tolist())
+
+
+def test_symbols_are_fetched_concurrently(client, fake_upbit):
+    state = {"active": 0, "peak": 0}
+
+    async def slow_handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.02)
+        state["active"] -= 1
+        return fake_upbit(request)
+
+    main.http_client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+    symbols = ["KRW-BTC", "KRW-ETH", "KRW-XRP"]
+    response = client.post("/api/backtest/portfolio", json=dict(BODY, symbols=symbols))
+
+    assert response.status_code == 200
+    assert [row["symbol"] for row in response.json()["symbols"]] == symbols
+    assert state["peak"] >= len(symbols)
+
+
+def test_weights_are_normalized(client):
+    body = dict(BODY, symbols=["KRW-BTC", "KRW-ETH"], weights=[3, 1])
+    symbols = client.post("/api/backtest/portfolio", json=body).json()["symbols"]
+    assert [row["weight"] for row in symbols] == [0.75, 0.25]
+
+
+@pytest.mark.parametrize(
+    "symbols,weights",
+    [
+        (["KRW-BTC", "KRW-ETH"], [1.0]),
+        (["KRW-BTC", "KRW-BTC"], [1.0, 1.0]),
+        (["KRW-BTC", "KRW-ETH"], [-1.0, 2.0]),
+        (["KRW-BTC", "KRW-ETH"], [0.0, 0.0]),
+    ],
+)
+def test_invalid_weights_are_rejected(client, symbols, weights):
+    body = dict(BODY, symbols=symbols, weights=weights)
+    assert client.post("/api/backtest/portfolio", json=body).status_code == 400
@@ -0,0 +1,87 @@
+import pytest
+
+import main
+
+WINDOW = 60
+LIMIT = 30
+
+
+def test_limit_is_enforced_within_window():
+    limiter = main.SlidingWindowLimiter(LIMIT, WINDOW, 4, 100)
+    now = 1000 * WINDOW + 30.0
+    assert all(limiter.check("1.1.1.1", 1, now)[0] for _ in range(LIMIT))
+
+    allowed, retry_after = limiter.check("1.1.1.1", 1, now)
+    assert not allowed
+    assert retry_after >= 1
+    # 다른 IP는 따로 센다.
+    assert limiter.check("2.2.2.2", 1, now)[0]
+
+
+def test_previous_window_decays_instead_of_resetting():
+    now = 1000 * WINDOW + (WINDOW - 1.0)
+    state = None
+    for _ in range(LIMIT):
+        state, allowed, _ = main._slide_window(state, now, 1, LIMIT, WINDOW)
+        assert allowed
+
+    # 윈도 경계 직후에는 직전 윈도 몫이 거의 그대로 남아 한도를 두 배로 쓰지 못한다.
+    boundary = 1001 * WINDOW + 0.5
+    state, allowed, retry_after = main._slide_window(state, boundary, 1, LIMIT, WINDOW)
+    assert not allowed
+
+    state, allowed, _ = main._slide_window(state, boundary + retry_after, 1, LIMIT, WINDOW)
+    assert allowed
+
+
+def test_idle_client_starts_fresh():
+    state = None
+    for _ in range(LIMIT):
+        state, _, _ = main._slide_window(state, 1000 * WINDOW, 1, LIMIT, WINDOW)
+    state, allowed, _ = main._slide_window(state, 1002 * WINDOW, LIMIT, LIMIT, WINDOW)
+    assert allowed
+
+
+def test_request_cost_scales_with_days():
+    assert main._request_cost("/api/backtest", b'{"days":30}') == 1.0
+    assert main._request_cost("/api/backtest", b'{"days":2000}') > 1.0
+    assert main._request_cost("/api/backtest", b"not json") == 1.0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"[]", b"42", b'{"startDate":"2024-13-01"}', b'{"startDate":"2024-01-01T00:00:00+09:00"}'],
+)
+def test_request_cost_falls_back_for_odd_bodies(body):
+    assert main._request_cost("/api/backtest/walkforward", body) == 5.0
+
+
+def test_refund_returns_cost_to_the_window():
+    limiter = main.SlidingWindowLimiter(LIMIT, WINDOW, 1, 100)
+    now = 1000 * WINDOW
+    assert limiter.check("ip", LIMIT, now)[0]
+    assert not limiter.check("ip", 1, now)[0]
+    limiter.refund("ip", LIMIT - 1, now + 1)
+    assert limiter.check("ip", 1, now + 1)[0]
+
+
+def test_middleware_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(main, "rate_limits", main.SlidingWindowLimiter(3, WINDOW, 1, 100))
+    body = {"symbol": "KRW-BTC", "k": 0.5, "fee": 0.0005, "days": 30, "useMaFilter": True}
+
+    codes = [client.post("/api/backtest", json=body).status_code for _ in range(4)]
+    assert codes == [200, 200, 200, 429]
+    rejected = client.post("/api/backtest", json=body)
+    assert int(rejected.headers["retry-after"]) >= 1
+
+
+def test_not_modified_is_charged_base_cost(client, monkeypatch):
+    monkeypatch.setattr(main, "rate_limits", main.SlidingWindowLimiter(10, WINDOW, 1, 100))
+    body = {"symbol": "KRW-BTC", "k": 0.5, "fee": 0.0005, "days": 1460, "useMaFilter": True}
+    etag = client.post("/api/backtest", json=body).headers["etag"]
+
+    # 비용은 매번 4를 먼저 받지만 304 뒤에는 3을 돌려주므로 재검증은 1씩만 쌓인다.
+    # 돌려주지 않으면 두 번째 재검증에서 한도 10을 넘는다.
+    headers = {"If-None-Match": etag}
+    codes = [client.post("/api/backtest", json=body, headers=headers).status_code for _ in range(4)]
+    assert codes == [304, 304, 304, 429]
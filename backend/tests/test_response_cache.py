@@ -0,0 +1,44 @@
+import main
+
+BODY = {"symbol": "KRW-BTC", "k": 0.5, "fee": 0.0005, "days": 200, "useMaFilter": True}
+
+
+def test_repeat_request_reuses_cached_body(client):
+    first = client.post("/api/backtest", json=BODY)
+    second = client.post("/api/backtest", json=BODY)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.json() == second.json()
+    assert main.response_cache.stats.hits == 1
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.post("/api/backtest", json=BODY).headers["etag"]
+
+    for header in (etag, "W/" + etag, f'"other", {etag}'):
+        response = client.post("/api/backtest", json=BODY, headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_etag_depends_on_request(client):
+    etag = client.post("/api/backtest", json=BODY).headers["etag"]
+
+    columnar = client.post(
+        "/api/backtest?format=columnar", json=BODY, headers={"If-None-Match": etag}
+    )
+    other_k = client.post("/api/backtest", json=dict(BODY, k=0.6), headers={"If-None-Match": etag})
+    assert columnar.status_code == 200
+    assert other_k.status_code == 200
+    assert other_k.headers["etag"] != etag
+
+
+def test_cached_body_matches_fresh_computation(client):
+    cached = client.post("/api/backtest", json=BODY)
+    main.response_cache._entries.clear()
+    fresh = client.post("/api/backtest", json=BODY)
+
+    assert fresh.json() == cached.json()
+    assert fresh.headers["etag"] == cached.headers["etag"]
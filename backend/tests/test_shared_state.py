@@ -0,0 +1,127 @@
+import asyncio
+import os
+
+import pytest
+
+import main
+
+
+def test_candle_db_path_prefers_shared_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "CANDLE_DB_PATH", "")
+    monkeypatch.setattr(main, "SHARED_STATE_DIR", "")
+    assert main._candle_db_path() == "candles.db"
+
+    monkeypatch.setattr(main, "SHARED_STATE_DIR", str(tmp_path))
+    assert main._candle_db_path() == os.path.join(str(tmp_path), "candles.db")
+
+    monkeypatch.setattr(main, "CANDLE_DB_PATH", "/data/candles.db")
+    assert main._candle_db_path() == "/data/candles.db"
+
+
+def test_walkforward_pool_is_split_across_workers(monkeypatch):
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(main, "WALKFORWARD_WORKERS", 0)
+    monkeypatch.setattr(main, "WEB_CONCURRENCY", 4)
+    assert main._walkforward_pool_size() == 2
+
+    monkeypatch.setattr(main, "WEB_CONCURRENCY", 16)
+    assert main._walkforward_pool_size() == 1
+
+    monkeypatch.setattr(main, "WALKFORWARD_WORKERS", 3)
+    assert main._walkforward_pool_size() == 3
+
+
+def test_file_lock_admits_one_holder(tmp_path):
+    path = str(tmp_path / "ingest.lock")
+    first, second = main.FileLock(path), main.FileLock(path)
+
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
+
+
+@pytest.fixture
+def shared_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "SHARED_STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "LEADER_RETRY_INTERVAL", 0.01)
+    monkeypatch.setattr(main, "ingest_role", "standalone")
+    monkeypatch.setattr(main, "ingest_lock", None)
+    monkeypatch.setattr(main, "tick_relay", None)
+    return tmp_path
+
+
+def test_coordinators_elect_a_single_leader(shared_dir, monkeypatch):
+    leaders = []
+    followed = []
+
+    async def fake_ws(markets, relay):
+        leaders.append(relay)
+        await asyncio.sleep(3600)
+
+    async def fake_rollover(markets):
+        await asyncio.sleep(3600)
+
+    real_follow = main.follow_tick_relay
+
+    async def record_follow(path):
+        followed.append(path)
+        await real_follow(path)
+
+    monkeypatch.setattr(main, "run_upbit_ws", fake_ws)
+    monkeypatch.setattr(main, "run_daily_rollover", fake_rollover)
+    monkeypatch.setattr(main, "follow_tick_relay", record_follow)
+
+    async def scenario():
+        tasks = [asyncio.create_task(main.run_ingest_coordinator(["KRW-BTC"])) for _ in range(3)]
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if leaders and main.tick_relay and main.tick_relay.follower_count == 2:
+                break
+        follower_count = main.tick_relay.follower_count
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await main.tick_relay.close()
+        main.ingest_lock.release()
+        return follower_count
+
+    assert asyncio.run(scenario()) == 2
+    assert len(leaders) == 1
+    assert followed
+
+
+def test_relay_delivers_frames_and_survives_bad_ones(shared_dir, monkeypatch):
+    received = []
+
+    async def handle(message):
+        if message == b"bad":
+            raise ValueError("malformed")
+        received.append(message)
+
+    monkeypatch.setattr(main, "handle_upbit_message", handle)
+    path = str(shared_dir / "ticks.sock")
+
+    async def scenario():
+        relay = main.TickRelay(path)
+        await relay.start()
+        follower = asyncio.create_task(main.follow_tick_relay(path))
+        while relay.follower_count == 0:
+            await asyncio.sleep(0.01)
+
+        relay.publish("first")
+        relay.publish(b"bad")
+        relay.publish('{"type":"ticker"}')
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        alive = not follower.done()
+        follower.cancel()
+        await asyncio.gather(follower, return_exceptions=True)
+        await relay.close()
+        return alive
+
+    assert asyncio.run(scenario())
+    assert received == [b"first", b'{"type":"ticker"}']
@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+
+import main
+
+SYMBOL = "KRW-BTC"
+
+
+def _indicators(**overrides):
+    values = dict(
+        trading_day=main._trading_day(),
+        prev_open=100.0,
+        prev_high=110.0,
+        prev_low=90.0,
+        prev_close=100.0,
+        prev_volume=1.0,
+        prev_range=20.0,
+        ma5=95.0,
+        ma20=None,
+        computed_at=time.time(),
+    )
+    values.update(overrides)
+    return main.DailyIndicators(**values)
+
+
+def _tick(price, opening=100.0, **fields):
+    return {"code": SYMBOL, "trade_price": price, "opening_price": opening, **fields}
+
+
+@pytest.fixture
+def indicator_calls(monkeypatch):
+    """get_daily_indicators 대역. outcomes의 값을 차례로 돌려주거나 예외면 던진다."""
+    calls = []
+    outcomes = []
+
+    async def fake_get_daily_indicators(symbol):
+        calls.append(symbol)
+        outcome = outcomes.pop(0) if outcomes else _indicators()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(main, "get_daily_indicators", fake_get_daily_indicators)
+    return calls, outcomes
+
+
+async def _seeded_engine(k=0.5):
+    engine = main.SignalEngine(k)
+    assert engine.on_tick(_tick(100.0)) is None
+    await asyncio.sleep(0)
+    return engine
+
+
+def test_breakout_fires_once_per_day(indicator_calls):
+    async def go():
+        engine = await _seeded_engine()
+        events = [engine.on_tick(_tick(price)) for price in (105.0, 111.0, 115.0)]
+        return engine, events
+
+    engine, events = asyncio.run(go())
+    # 목표가 = 시가 100 + 전일 범위 20 * 0.5 = 110
+    assert events[0] is None
+    assert events[1]["targetPrice"] == 110.0
+    assert events[1]["maFilterPassed"] is True
+    assert events[2] is None
+    assert engine.ticker(SYMBOL, 0.5).highPrice == 115.0
+
+
+def test_missing_high_low_fields_keep_running_extremes(indicator_calls):
+    async def go():
+        engine = await _seeded_engine()
+        for price in (100.0, 97.0, 104.0, 99.0):
+            engine.on_tick(_tick(price))
+        return engine.ticker(SYMBOL, 0.5)
+
+    ticker = asyncio.run(go())
+    assert ticker.lowPrice == 97.0
+    assert ticker.highPrice == 104.0
+    assert ticker.currentPrice == 99.0
+
+
+def test_reported_high_low_fields_win(indicator_calls):
+    async def go():
+        engine = await _seeded_engine()
+        engine.on_tick(_tick(100.0, high_price=108.0, low_price=92.0))
+        return engine.ticker(SYMBOL, 0.5)
+
+    ticker = asyncio.run(go())
+    assert (ticker.highPrice, ticker.lowPrice) == (108.0, 92.0)
+
+
+def test_failed_seed_backs_off_instead_of_retrying_every_tick(indicator_calls, monkeypatch):
+    calls, outcomes = indicator_calls
+    outcomes.extend([main.ApiException(502, "UPBIT_SERVER_ERROR", "down", True)] * 2)
+    monkeypatch.setattr(main, "SIGNAL_SEED_RETRY_BASE", 0.1)
+
+    async def go():
+        engine = main.SignalEngine(0.5)
+        for _ in range(50):
+            engine.on_tick(_tick(100.0))
+            await asyncio.sleep(0)
+        first_burst = len(calls)
+        await asyncio.sleep(0.13)
+        for _ in range(50):
+            engine.on_tick(_tick(100.0))
+            await asyncio.sleep(0)
+        second_burst = len(calls)
+        # 두 번째 실패 뒤에는 간격이 두 배가 된다.
+        await asyncio.sleep(0.13)
+        engine.on_tick(_tick(100.0))
+        await asyncio.sleep(0)
+        third = len(calls)
+        await asyncio.sleep(0.13)
+        engine.on_tick(_tick(100.0))
+        await asyncio.sleep(0)
+        return engine, first_burst, second_burst, third, len(calls)
+
+    engine, first_burst, second_burst, third, final = asyncio.run(go())
+    assert (first_burst, second_burst, third, final) == (1, 2, 2, 3)
+    # 성공하면 실패 기록이 지워지고 틱이 다시 반영된다.
+    assert engine._seed_failures == {}
+    engine.on_tick(_tick(101.0))
+    assert engine.ticker(SYMBOL, 0.5).currentPrice == 101.0
+
+
+def test_new_trading_day_reseeds_and_rearms(indicator_calls, monkeypatch):
+    calls, outcomes = indicator_calls
+
+    async def go():
+        engine = await _seeded_engine()
+        assert engine.on_tick(_tick(111.0)) is not None
+        tomorrow = main._trading_day() + main.timedelta(days=1)
+        monkeypatch.setattr(main, "_trading_day", lambda: tomorrow)
+        outcomes.append(_indicators(trading_day=tomorrow))
+        assert engine.on_tick(_tick(111.0)) is None
+        await asyncio.sleep(0)
+        return engine.on_tick(_tick(111.0))
+
+    event = asyncio.run(go())
+    assert len(calls) == 2
+    assert event is not None
+
+
+def test_stale_ticker_is_not_served(indicator_calls, monkeypatch):
+    async def go():
+        engine = await _seeded_engine()
+        engine.on_tick(_tick(100.0))
+        return engine
+
+    engine = asyncio.run(go())
+    assert engine.ticker(SYMBOL, 0.5) is not None
+    monkeypatch.setattr(main, "SIGNAL_MAX_TICK_AGE", -1)
+    assert engine.ticker(SYMBOL, 0.5) is None
@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+class SlowUpbit:
+    """첫 응답을 release가 열릴 때까지 붙잡아 두어 동시 요청이 겹치게 한다."""
+
+    def __init__(self, status: int = 200) -> None:
+        self.status = status
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await self.release.wait()
+        if self.status != 200:
+            return httpx.Response(self.status)
+        return httpx.Response(200, json=[{"market": request.url.params["markets"]}])
+
+
+@pytest.fixture
+def single_flight(monkeypatch):
+    monkeypatch.setattr(main, "inflight_requests", {})
+    monkeypatch.setattr(main, "fetch_stats", main.FetchStats())
+    monkeypatch.setattr(main, "UPBIT_MAX_RETRIES", 1)
+    monkeypatch.setattr(main, "http_client", None)
+
+
+def _run(upbit, scenario):
+    async def go():
+        main.http_client = httpx.AsyncClient(transport=httpx.MockTransport(upbit))
+        try:
+            return await scenario()
+        finally:
+            await main.http_client.aclose()
+            main.http_client = None
+
+    return asyncio.run(go())
+
+
+def test_concurrent_callers_share_one_upstream_request(single_flight):
+    upbit = SlowUpbit()
+
+    async def scenario():
+        callers = [
+            asyncio.create_task(main._fetch_json("/ticker", {"markets": "KRW-BTC"}))
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0.01)
+        upbit.release.set()
+        return await asyncio.gather(*callers)
+
+    results = _run(upbit, scenario)
+    assert upbit.calls == 1
+    assert all(result == [{"market": "KRW-BTC"}] for result in results)
+    assert main.fetch_stats.upstream_calls == 1
+    assert main.fetch_stats.coalesced_calls == 9
+    assert main.inflight_requests == {}
+
+
+def test_failure_is_shared_and_not_kept(single_flight):
+    upbit = SlowUpbit(status=400)
+
+    async def scenario():
+        callers = [
+            asyncio.create_task(main._fetch_json("/ticker", {"markets": "KRW-ETH"}))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        upbit.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = _run(upbit, scenario)
+    assert upbit.calls == 1
+    assert all(isinstance(result, main.ApiException) for result in results)
+    # 실패한 요청은 남겨 두지 않으므로 다음 호출은 다시 업스트림으로 간다.
+    assert main.inflight_requests == {}
+
+
+def test_cancelled_caller_does_not_cancel_the_others(single_flight):
+    upbit = SlowUpbit()
+
+    async def scenario():
+        first = asyncio.create_task(main._fetch_json("/ticker", {"markets": "KRW-XRP"}))
+        second = asyncio.create_task(main._fetch_json("/ticker", {"markets": "KRW-XRP"}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0)
+        upbit.release.set()
+        return first, await second
+
+    first, result = _run(upbit, scenario)
+    assert first.cancelled()
+    assert result == [{"market": "KRW-XRP"}]
+    assert upbit.calls == 1
@@ -0,0 +1,23 @@
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_sweep_matches_single_backtests():
+    data = synthetic_ohlcv(500, "gappy", seed=5)
+    ks = main._sweep_k_values(0.0, 1.5, 0.1)
+    sweep = main.evaluate_sweep(data, ks, 0.0005, 0.0002)
+
+    assert len(sweep) == 2 * len(ks)
+    for item in sweep:
+        results = main.run_backtest(data, item.k, 0.0005, 0.0002, item.useMaFilter)
+        assert item.metrics == main.build_metrics(results, main.build_trades(results))
+
+
+def test_sweep_endpoint_limits_combinations(client):
+    body = {"symbol": "KRW-BTC", "kMin": 0.1, "kMax": 1.0, "kStep": 0.1, "fee": 0.0005, "days": 400}
+    response = client.post("/api/backtest/sweep", json=body)
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 20
+
+    too_many = client.post("/api/backtest/sweep", json=dict(body, kMin=0, kMax=100, kStep=0.01))
+    assert too_many.status_code == 400
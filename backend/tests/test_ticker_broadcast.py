@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import main
+
+
+class FakeSocket:
+    """send_text를 기록하는 WebSocket 대역. blocked가 set되지 않으면 송신이 멈춘다."""
+
+    def __init__(self, blocked: bool = False) -> None:
+        self.sent: list = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, message: str) -> None:
+        await self.unblocked.wait()
+        self.sent.append(json.loads(message))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+def _tick(symbol: str, price: float) -> dict:
+    return {"type": "ticker", "symbol": symbol, "currentPrice": price}
+
+
+def test_broadcast_reaches_only_matching_subscribers():
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        btc, eth, everything = FakeSocket(), FakeSocket(), FakeSocket()
+        await broadcaster.connect(btc, {"KRW-BTC"})
+        await broadcaster.connect(eth, {"KRW-ETH"})
+        await broadcaster.connect(everything, set())
+        await broadcaster.broadcast(_tick("KRW-BTC", 1.0))
+        await broadcaster.broadcast(_tick("KRW-ETH", 2.0))
+        await broadcaster.broadcast(_tick("KRW-SOL", 3.0))
+        await asyncio.sleep(0.01)
+        return btc, eth, everything
+
+    btc, eth, everything = asyncio.run(go())
+    assert [m["symbol"] for m in btc.sent] == ["KRW-BTC"]
+    assert [m["symbol"] for m in eth.sent] == ["KRW-ETH"]
+    assert [m["symbol"] for m in everything.sent] == ["KRW-BTC", "KRW-ETH", "KRW-SOL"]
+
+
+def test_slow_client_drops_oldest_without_blocking_others(monkeypatch):
+    monkeypatch.setattr(main, "WS_SEND_QUEUE_SIZE", 3)
+    monkeypatch.setattr(main, "WS_SLOW_CLIENT_POLICY", "drop_oldest")
+
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        slow, fast = FakeSocket(blocked=True), FakeSocket()
+        await broadcaster.connect(slow, {"KRW-BTC"})
+        await broadcaster.connect(fast, {"KRW-BTC"})
+        for price in range(10):
+            await broadcaster.broadcast(_tick("KRW-BTC", float(price)))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        fast_prices = [m["currentPrice"] for m in fast.sent]
+        slow.unblocked.set()
+        await asyncio.sleep(0.01)
+        return broadcaster, fast_prices, slow
+
+    broadcaster, fast_prices, slow = asyncio.run(go())
+    assert fast_prices == [float(price) for price in range(10)]
+    # 첫 메시지는 송신 중에 멈췄고, 큐에는 가장 최근 3개만 남는다.
+    assert [m["currentPrice"] for m in slow.sent] == [0.0, 7.0, 8.0, 9.0]
+    assert broadcaster.dropped_messages == 6
+
+
+def test_slow_client_is_disconnected_under_disconnect_policy(monkeypatch):
+    monkeypatch.setattr(main, "WS_SEND_QUEUE_SIZE", 2)
+    monkeypatch.setattr(main, "WS_SLOW_CLIENT_POLICY", "disconnect")
+
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        slow = FakeSocket(blocked=True)
+        await broadcaster.connect(slow, {"KRW-BTC"})
+        for price in range(5):
+            await broadcaster.broadcast(_tick("KRW-BTC", float(price)))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        return broadcaster, slow
+
+    broadcaster, slow = asyncio.run(go())
+    assert broadcaster.slow_disconnects == 1
+    assert broadcaster.connection_count == 0
+    assert slow.closed_with == 1013
+    assert broadcaster._by_symbol == {}
+
+
+def test_disconnect_cleans_up_the_symbol_index():
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        socket = FakeSocket()
+        await broadcaster.connect(socket, {"KRW-BTC", "KRW-ETH"})
+        writer = broadcaster._connections[socket].writer
+        await broadcaster.disconnect(socket)
+        await asyncio.sleep(0)
+        return broadcaster, writer
+
+    broadcaster, writer = asyncio.run(go())
+    assert broadcaster.connection_count == 0
+    assert broadcaster._by_symbol == {}
+    assert writer.cancelled()
+
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import httpx
+
+import main
+
+
+def test_bucket_paces_requests_after_the_burst():
+    async def go():
+        bucket = main.TokenBucket(50, 5)
+        started = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # 처음 5개는 바로 나가고 나머지 5개는 초당 50개 속도로 나간다.
+    assert 0.08 <= asyncio.run(go()) < 0.5
+
+
+def test_concurrent_429s_do_not_stack_the_penalty():
+    bucket = main.TokenBucket(10, 10)
+    for _ in range(5):
+        bucket.penalize(1.0)
+    # 다섯 번 벌점을 받아도 1초 분량의 빚만 남는다.
+    assert -10.01 < bucket._tokens <= -9.99
+
+
+def test_remaining_req_header_caps_the_bucket():
+    bucket = main.TokenBucket(10, 10)
+    response = httpx.Response(200, headers={"Remaining-Req": "group=candles; min=599; sec=2"})
+    main._sync_bucket(bucket, response)
+    assert bucket._tokens <= 2.01
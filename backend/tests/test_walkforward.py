@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import main
+from benchmarks.synthetic import synthetic_ohlcv
+
+PAYLOAD = main.WalkForwardRequest(
+    symbol="KRW-BTC",
+    days=400,
+    inSampleDays=120,
+    outSampleDays=40,
+    kMin=0.2,
+    kMax=1.0,
+    kStep=0.2,
+    fee=0.0005,
+)
+KS = main._sweep_k_values(PAYLOAD.kMin, PAYLOAD.kMax, PAYLOAD.kStep)
+MA_OPTIONS = (False, True)
+
+
+@pytest.fixture
+def created_segments(monkeypatch):
+    """run_walkforward가 만든 공유 메모리 이름을 기록한다."""
+    names = []
+    real = shared_memory.SharedMemory
+
+    def recording(*args, **kwargs):
+        segment = real(*args, **kwargs)
+        if kwargs.get("create"):
+            names.append(segment.name)
+        return segment
+
+    monkeypatch.setattr(main.shared_memory, "SharedMemory", recording)
+    return names
+
+
+def _run(data, pool, monkeypatch):
+    monkeypatch.setattr(main, "_get_process_pool", lambda: pool)
+    try:
+        return asyncio.run(main.run_walkforward(data, PAYLOAD, KS, MA_OPTIONS))
+    finally:
+        pool.shutdown()
+
+
+def test_windows_roll_forward_by_the_out_of_sample_length():
+    windows = main._walkforward_windows(305, 100, 50)
+    assert windows == [(5, 105, 155), (55, 155, 205), (105, 205, 255), (155, 255, 305)]
+    assert main._walkforward_windows(100, 100, 50) == []
+
+
+def test_window_picks_the_best_in_sample_k(created_segments, monkeypatch):
+    data = synthetic_ohlcv(400, "trending", seed=4)
+    result = _run(data, ThreadPoolExecutor(2), monkeypatch)
+
+    windows = main._walkforward_windows(len(data), PAYLOAD.inSampleDays, PAYLOAD.outSampleDays)
+    assert len(result["windows"]) == len(windows)
+    for (start, split, end), window in zip(windows, result["windows"]):
+        in_sample = data[start - 5 : split]
+        best = max(
+            main.evaluate_backtest(in_sample, k, PAYLOAD.fee, 0.0, ma).metrics.totalReturn
+            for ma in MA_OPTIONS
+            for k in KS.tolist()
+        )
+        assert window["inSampleMetrics"]["totalReturn"] == pytest.approx(best, rel=1e-12)
+        out_sample = main.evaluate_backtest(
+            data[split - 5 : end], window["k"], PAYLOAD.fee, 0.0, window["useMaFilter"]
+        )
+        assert window["outSampleMetrics"] == pytest.approx(out_sample.metrics.model_dump())
+    assert len(result["equity"]) == sum(end - split for _, split, end in windows)
+
+
+def test_process_pool_matches_in_process_result_and_frees_memory(created_segments, monkeypatch):
+    data = synthetic_ohlcv(400, "gappy", seed=8)
+    in_process = _run(data, ThreadPoolExecutor(2), monkeypatch)
+    pool = ProcessPoolExecutor(2, mp_context=main.multiprocessing.get_context("spawn"))
+    across_processes = _run(data, pool, monkeypatch)
+
+    assert across_processes["windows"] == in_process["windows"]
+    assert across_processes["equity"] == in_process["equity"]
+    assert across_processes["metrics"] == in_process["metrics"]
+    # 요청이 끝나면 공유 메모리 세그먼트는 모두 해제된다.
+    assert len(created_segments) == 2
+    for name in created_segments:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_walkforward_endpoint_validates_windows(client):
+    body = {"symbol": "KRW-BTC", "days": 100, "inSampleDays": 90, "outSampleDays": 30, "fee": 0}
+    assert client.post("/api/backtest/walkforward", json=body).status_code == 400
+    too_many = dict(body, inSampleDays=60, kMin=0, kMax=10, kStep=0.01)
+    assert client.post("/api/backtest/walkforward", json=too_many).status_code == 400
+
+
+def test_equity_is_chained_across_windows(created_segments, monkeypatch):
+    data = synthetic_ohlcv(400, "ranging", seed=6)
+    result = _run(data, ThreadPoolExecutor(2), monkeypatch)
+    hpr = np.array([point["hpr"] for point in result["equity"]])
+    assert result["metrics"].totalReturn == pytest.approx((hpr[-1] - 1) * 100)
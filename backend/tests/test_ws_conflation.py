@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+
+import main
+
+MAX_HZ = 20.0
+
+
+class RecordingSocket:
+    def __init__(self) -> None:
+        self.frames: list = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, message: str) -> None:
+        self.frames.append((time.monotonic(), json.loads(message)))
+
+
+def _tick(symbol: str, price: float) -> dict:
+    return {"type": "ticker", "symbol": symbol, "currentPrice": price}
+
+
+async def _connect(broadcaster):
+    socket = RecordingSocket()
+    await broadcaster.connect(socket, {"KRW-BTC", "KRW-ETH"}, max_hz=MAX_HZ)
+    return socket
+
+
+def test_updates_are_merged_to_the_latest_value_per_key():
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        socket = await _connect(broadcaster)
+        for price in range(50):
+            await broadcaster.broadcast(_tick("KRW-BTC", float(price)))
+            await broadcaster.broadcast(_tick("KRW-ETH", float(price) + 0.5))
+        await broadcaster.broadcast({"type": "breakout", "symbol": "KRW-BTC", "price": 49.0})
+        await asyncio.sleep(0.01)
+        return broadcaster, socket
+
+    broadcaster, socket = asyncio.run(go())
+    assert len(socket.frames) == 1
+    updates = socket.frames[0][1]["updates"]
+    # 종류가 다른 돌파 이벤트는 시세 갱신에 덮이지 않는다.
+    assert sorted((u["type"], u["symbol"]) for u in updates) == [
+        ("breakout", "KRW-BTC"),
+        ("ticker", "KRW-BTC"),
+        ("ticker", "KRW-ETH"),
+    ]
+    assert {u["symbol"]: u["currentPrice"] for u in updates if u["type"] == "ticker"} == {
+        "KRW-BTC": 49.0,
+        "KRW-ETH": 49.5,
+    }
+    assert broadcaster.conflated_messages == 98
+
+
+def test_frames_respect_max_hz():
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        socket = await _connect(broadcaster)
+        for price in range(30):
+            await broadcaster.broadcast(_tick("KRW-BTC", float(price)))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(2 / MAX_HZ)
+        return socket
+
+    socket = asyncio.run(go())
+    times = [sent_at for sent_at, _ in socket.frames]
+    assert 2 <= len(times) <= 0.3 * MAX_HZ + 2
+    assert all(b - a >= 1 / MAX_HZ * 0.9 for a, b in zip(times, times[1:]))
+    assert socket.frames[-1][1]["updates"][-1]["currentPrice"] == 29.0
+
+
+def test_idle_connection_sends_nothing_and_wakes_on_the_next_update(monkeypatch):
+    pacing_sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def counting_sleep(delay, *args):
+        if delay == 1 / MAX_HZ:
+            pacing_sleeps.append(delay)
+        return await real_sleep(delay, *args)
+
+    monkeypatch.setattr(main.asyncio, "sleep", counting_sleep)
+
+    async def go():
+        broadcaster = main.TickerBroadcaster()
+        socket = await _connect(broadcaster)
+        await asyncio.sleep(5 / MAX_HZ)
+        idle_frames = len(socket.frames)
+        idle_sleeps = len(pacing_sleeps)
+        sent_at = time.monotonic()
+        await broadcaster.broadcast(_tick("KRW-BTC", 1.0))
+        await asyncio.sleep(0.01)
+        return idle_frames, idle_sleeps, sent_at, socket
+
+    idle_frames, idle_sleeps, sent_at, socket = asyncio.run(go())
+    assert idle_frames == 0
+    # 보낸 뒤에만 간격을 두므로 한가한 동안에는 쉬었다 깨는 일도 없다.
+    assert idle_sleeps == 0
+    assert len(pacing_sleeps) == 1
+    assert len(socket.frames) == 1
+    # 한가한 뒤의 첫 갱신은 간격을 기다리지 않고 바로 나간다.
+    assert socket.frames[0][0] - sent_at < 1 / MAX_HZ / 2
@@ -1,13 +1,16 @@
 
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useQuery } from '@tanstack/react-query';
 import { 
   XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, AreaChart, Area, ReferenceLine, BarChart, Bar
 } from 'recharts';
 import { SUPPORTED_COINS, DEFAULT_K, DEFAULT_FEE } from '../constants';
-import { fetchBacktest } from '../services/backendService';
+import { fetchBacktest, streamBacktest } from '../services/backendService';
 import { analyzeStrategyPerformance } from '../services/geminiService';
-import { AiReport, MarketTicker } from '../types';
+import { AiReport, BacktestResult, MarketTicker } from '../types';
+
+// Long ranges stream rows so the equity curve draws before the whole backtest arrives.
+const STREAM_MIN_DAYS = 365;
 
 const Dashboard: React.FC = () => {
   const [symbol, setSymbol] = useState(SUPPORTED_COINS[0].symbol);
@@ -18,15 +21,40 @@ const Dashboard: React.FC = () => {
   const [aiReport, setAiReport] = useState<AiReport | null>(null);
   const [aiCached, setAiCached] = useState(false);
   const [isAnalyzing, setIsAnalyzing] = useState(false);
+  const [streamedResults, setStreamedResults] = useState<BacktestResult[]>([]);
+  // Only the latest query may write streamed rows; chunks from superseded queries are dropped.
+  const streamIdRef = useRef(0);
   const { data, isFetching, isError, refetch, dataUpdatedAt } = useQuery({
     queryKey: ['backtest', symbol, k, days, useMaFilter],
-    queryFn: () => fetchBacktest({ symbol, k, fee: DEFAULT_FEE, days, useMaFilter }),
+    queryFn: ({ signal }) => {
+      const params = { symbol, k, fee: DEFAULT_FEE, days, useMaFilter };
+      const streamId = ++streamIdRef.current;
+      setStreamedResults([]);
+      if (days < STREAM_MIN_DAYS) {
+        return fetchBacktest(params, signal);
+      }
+      // Chunks are appended here and copied into state at most once per frame.
+      const rows: BacktestResult[] = [];
+      let frame = 0;
+      const isCurrent = () => streamId === streamIdRef.current && !signal.aborted;
+      const onRows = (chunk: BacktestResult[]) => {
+        if (!isCurrent()) return;
+        for (const row of chunk) rows.push(row);
+        if (frame) return;
+        frame = requestAnimationFrame(() => {
+          frame = 0;
+          if (isCurrent()) setStreamedResults(rows.slice());
+        });
+      };
+      return streamBacktest(params, onRows, signal).finally(() => cancelAnimationFrame(frame));
+    },
     staleTime: 30000,
     retry: 2,
     placeholderData: (previous) => previous,
   });
 
-  const results = data?.results ?? [];
+  const isStreaming = isFetching && streamedResults.length > 0;
+  const results = isStreaming ? streamedResults : data?.results ?? [];
   const tradeSummary = data?.tradeSummary ?? null;
   const metrics = data?.metrics ?? null;
   const lastUpdated = dataUpdatedAt ? new Date(dataUpdatedAt).toLocaleTimeString() : null;
@@ -37,10 +65,12 @@ const Dashboard: React.FC = () => {
   const mddValue = metrics ? metrics.mdd : 0;
 
   useEffect(() => {
-    if (data?.ticker) {
-      setTicker(data.ticker);
-    }
-  }, [data?.ticker, dataUpdatedAt]);
+    const next = data?.ticker;
+    if (!next) return;
+    const notModified = data?.notModified ?? false;
+    // A 304 replays the ticker cached with the body; keep the WS-fed quote for the same symbol.
+    setTicker((prev) => (notModified && prev?.symbol === next.symbol ? prev : next));
+  }, [data?.ticker, data?.notModified, dataUpdatedAt]);
 
   useEffect(() => {
     setAiReport(null);
@@ -273,7 +303,7 @@ const Dashboard: React.FC = () => {
             </div>
             
             <div className="flex-1 w-full">
-              {isFetching ? (
+              {isFetching && !isStreaming ? (
                 <div className="h-full flex flex-col items-center justify-center space-y-4">
                   <div className="w-12 h-12 border-4 border-indigo-100 border-t-indigo-600 rounded-full animate-spin"></div>
                   <p className="text-xs font-black text-slate-400 animate-pulse">Analyzing Candle Patterns...</p>
@@ -296,7 +326,7 @@ const Dashboard: React.FC = () => {
                       labelStyle={{ display: 'none' }}
                     />
                     <ReferenceLine y={1} stroke="#E2E8F0" strokeWidth={2} strokeDasharray="5 5" />
-                    <Area type="monotone" dataKey="hpr" stroke="#6366f1" strokeWidth={4} fillOpacity={1} fill="url(#curveGradient)" animationDuration={2000} />
+                    <Area type="monotone" dataKey="hpr" stroke="#6366f1" strokeWidth={4} fillOpacity={1} fill="url(#curveGradient)" animationDuration={2000} isAnimationActive={!isStreaming} />
                   </AreaChart>
                 </ResponsiveContainer>
               )}
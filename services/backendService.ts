@@ -1,19 +1,156 @@
-import { BacktestResponse, StrategyParams } from '../types';
+import {
+  BacktestMetrics,
+  BacktestResponse,
+  BacktestResult,
+  MarketTicker,
+  StrategyParams,
+  Trade,
+  TradeSummary,
+} from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || '';
 
-export async function fetchBacktest(params: StrategyParams): Promise<BacktestResponse> {
+// notModified is true when the server answered 304 and the body came from backtestCache.
+// Its ticker is then the one captured with the cached body, not a fresh quote.
+export interface BacktestFetchResult extends BacktestResponse {
+  notModified: boolean;
+}
+
+// Responses keyed by request body; revalidated with If-None-Match on refetch.
+// Least recently used entries are evicted past BACKTEST_CACHE_SIZE.
+const BACKTEST_CACHE_SIZE = 20;
+const backtestCache = new Map<string, { etag: string; data: BacktestResponse }>();
+
+function rememberBacktest(body: string, entry: { etag: string; data: BacktestResponse }) {
+  backtestCache.delete(body);
+  backtestCache.set(body, entry);
+  while (backtestCache.size > BACKTEST_CACHE_SIZE) {
+    const oldest = backtestCache.keys().next().value;
+    if (oldest === undefined) break;
+    backtestCache.delete(oldest);
+  }
+}
+
+export async function fetchBacktest(
+  params: StrategyParams,
+  signal?: AbortSignal,
+): Promise<BacktestFetchResult> {
+  const body = JSON.stringify(params);
+  const cached = backtestCache.get(body);
   const response = await fetch(`${API_BASE_URL}/api/backtest`, {
     method: 'POST',
+    signal,
     headers: {
       'Content-Type': 'application/json',
+      ...(cached ? { 'If-None-Match': cached.etag } : {}),
     },
-    body: JSON.stringify(params),
+    body,
   });
 
+  if (response.status === 304 && cached) {
+    rememberBacktest(body, cached);
+    return { ...cached.data, notModified: true };
+  }
+
   if (!response.ok) {
     throw new Error(`Backtest request failed (${response.status})`);
   }
 
-  return response.json();
+  const data: BacktestResponse = await response.json();
+  const etag = response.headers.get('ETag');
+  if (etag) {
+    rememberBacktest(body, { etag, data });
+  }
+  return { ...data, notModified: false };
+}
+
+// NDJSON records from /api/backtest/stream, one per line.
+type BacktestStreamRecord =
+  | { type: 'start'; symbol: string; rows: number }
+  | { type: 'results'; rows: BacktestResult[] }
+  | { type: 'trades'; trades: Trade[] }
+  | { type: 'tradeSummary'; tradeSummary: TradeSummary }
+  | { type: 'metrics'; metrics: BacktestMetrics }
+  | { type: 'ticker'; ticker: MarketTicker | null }
+  | { type: 'error'; error: { code: string; message: string; retryable: boolean } }
+  | { type: 'end' };
+
+// Streams result rows as the backend computes them; onRows receives each new chunk of rows.
+// Aborting the signal cancels the request and the body reader, and no further chunks are delivered.
+export async function streamBacktest(
+  params: StrategyParams,
+  onRows: (chunk: BacktestResult[], totalRows: number) => void,
+  signal?: AbortSignal,
+): Promise<BacktestFetchResult> {
+  const response = await fetch(`${API_BASE_URL}/api/backtest/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(params),
+    signal,
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Backtest request failed (${response.status})`);
+  }
+
+  const result: Partial<BacktestResponse> & { results: BacktestResult[] } = { results: [] };
+  let totalRows = 0;
+  let ended = false;
+  const handle = (line: string) => {
+    if (!line.trim()) return;
+    const record = JSON.parse(line) as BacktestStreamRecord;
+    switch (record.type) {
+      case 'start':
+        totalRows = record.rows;
+        break;
+      case 'results':
+        for (const row of record.rows) result.results.push(row);
+        if (!signal?.aborted) onRows(record.rows, totalRows);
+        break;
+      case 'trades':
+        result.trades = record.trades;
+        break;
+      case 'tradeSummary':
+        result.tradeSummary = record.tradeSummary;
+        break;
+      case 'metrics':
+        result.metrics = record.metrics;
+        break;
+      case 'ticker':
+        result.ticker = record.ticker;
+        break;
+      case 'error':
+        throw new Error(`Backtest stream failed (${record.error.code})`);
+      case 'end':
+        ended = true;
+        break;
+    }
+  };
+
+  const reader = response.body.getReader();
+  const cancel = () => {
+    reader.cancel().catch(() => undefined);
+  };
+  signal?.addEventListener('abort', cancel, { once: true });
+  const decoder = new TextDecoder();
+  let buffer = '';
+  try {
+    for (;;) {
+      const { done, value } = await reader.read();
+      signal?.throwIfAborted();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() ?? '';
+      lines.forEach(handle);
+    }
+  } finally {
+    signal?.removeEventListener('abort', cancel);
+  }
+  handle(buffer + decoder.decode());
+
+  // Without the end record the connection was cut and the rows may be incomplete.
+  if (!ended || !result.trades || !result.tradeSummary || !result.metrics) {
+    throw new Error('Backtest stream ended early');
+  }
+  return { ticker: null, ...result, notModified: false } as BacktestFetchResult;
 }